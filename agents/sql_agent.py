@@ -0,0 +1,75 @@
+# agents/sql_agent.py
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import sys
+from core.base_agent import BaseAgent, AgentConfig
+from core.schemas import LLMConfig, ExecutionContext
+from providers.openrouter import OpenRouterProvider
+from executors.agent_runner import AgentRunner
+from executors.tool_pool import ToolPool
+from tools.domain.sql.pool import SQLConnectionPool
+from tools.domain.sql.schema_catalog import SchemaCatalog
+from tools.domain.sql.get_schema import GetSchemaTool
+from tools.domain.sql.validate_query import ValidateQueryTool
+from tools.domain.sql.execute_query import ExecuteQueryTool
+
+# 1. Provider
+provider = OpenRouterProvider(
+    LLMConfig(
+        provider="openrouter",
+        model="mistralai/devstral-2512:free"
+    )
+)
+
+# 2. Database: one connection pool and schema catalog shared by all SQL tools
+pool = SQLConnectionPool.sqlite(os.getenv("SQL_AGENT_DB", "data.db"), read_only=True, max_size=4)
+catalog = SchemaCatalog(pool)
+
+# 3. Tools (blocking_io: they run on the ToolPool's threads, off the event loop)
+tools = [
+    GetSchemaTool(catalog),
+    ValidateQueryTool(pool),
+    ExecuteQueryTool(pool, catalog, max_rows=200),
+]
+
+# 4. Agent config
+config = AgentConfig(
+    name="sql_agent",
+    system_prompt="""You are a data analyst answering questions from a SQL database.
+    Look up the tables you need with get_schema before writing a query.
+    Check non-trivial queries with validate_query; avoid full scans of large tables.
+    Run one read-only query at a time with execute_query, passing values as params.
+    If more_rows is true, aggregate or filter instead of paging through rows.""",
+    tools=tools,
+    max_iterations=10,
+)
+
+# 5. Agent
+agent = BaseAgent(config=config, provider=provider)
+
+# 6. Context
+context = ExecutionContext(
+    agent_state=agent.state,
+    session_id="sql-session-1",
+)
+
+# 7. Runner
+runner = AgentRunner(agent, context, tool_pool=ToolPool(max_threads=pool.max_size))
+
+
+# 8. Run
+async def main():
+    question = " ".join(sys.argv[1:]) or "Which tables are there, and how many rows does each have?"
+    try:
+        print(await runner.run(question))
+    finally:
+        pool.close()
+        await provider.aclose()
+
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(main())
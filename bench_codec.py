@@ -0,0 +1,61 @@
+# bench_codec.py
+#
+# Encode/decode time and size of an AgentState: Pydantic JSON vs StateCodec
+# (with and without compression).
+
+import time
+from core.schemas import AgentState, Attempt, LLMResponse, ToolCall, ToolResult
+from memory.state_store.codec import StateCodec
+
+TURNS = 500
+REPEAT = 20
+
+
+def make_state() -> AgentState:
+    state = AgentState(current_step="answer")
+    for i in range(TURNS):
+        state.chat_history.append({"role": "user", "content": f"Question {i}: what about topic {i % 17}? " * 5})
+        state.chat_history.append({"role": "assistant", "content": f"Answer {i} with some detail. " * 25})
+        state.attempts.append(Attempt(
+            step=f"iteration_{i}",
+            attempt_number=1,
+            llm_response=LLMResponse(
+                content=f"Answer {i}",
+                tool_calls=[ToolCall(tool_name="web_search", arguments={"query": f"topic {i}"})],
+                finish_reason="tool_use",
+                usage={"prompt_tokens": 1000 + i, "completion_tokens": 200},
+                raw={"id": f"resp_{i}", "model": "some-model", "choices": [{"index": 0, "finish_reason": "tool_calls"}]},
+            ),
+            tool_results=[ToolResult(success=True, data={"results": [{"title": f"r{j}", "url": f"https://example.com/{j}"} for j in range(5)]})],
+        ))
+    return state
+
+
+def measure(label: str, encode, decode) -> None:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        data = encode()
+    encode_ms = (time.perf_counter() - started) / REPEAT * 1000
+
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        decode(data)
+    decode_ms = (time.perf_counter() - started) / REPEAT * 1000
+
+    print(f"{label:<26} encode={encode_ms:7.2f} ms  decode={decode_ms:7.2f} ms  size={len(data) / 1024:8.1f} KiB")
+
+
+def main():
+    state = make_state()
+    print(f"{TURNS * 2} messages, {TURNS} attempts\n")
+    measure("pydantic model_dump_json", lambda: state.model_dump_json().encode(), AgentState.model_validate_json)
+    for label, codec in (
+        ("codec, no compression", StateCodec(compress_threshold=None)),
+        ("codec, zlib", StateCodec()),
+        ("codec, zlib, raw truncate", StateCodec(raw_policy="truncate", raw_max_chars=200)),
+    ):
+        measure(label, lambda: codec.encode_state(state), codec.decode_state)
+
+
+if __name__ == "__main__":
+    main()
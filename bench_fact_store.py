@@ -0,0 +1,82 @@
+# bench_fact_store.py
+#
+# Bulk ingest rate and query latency of FactStore at 1M facts: BM25 keyword search
+# (natural-language-like queries) and exact entity lookups.
+#
+#   python bench_fact_store.py            # 1M facts
+#   python bench_fact_store.py 100000
+
+import asyncio
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from memory.long_term.fact_store import Fact, FactStore
+
+FACTS = 1_000_000
+BATCH = 50_000
+QUERIES = 500
+ATTRIBUTES = [f"attribute_{i}" for i in range(50)]
+
+
+def vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+
+def percentile(values: list[float], p: float) -> float:
+    return sorted(values)[int(len(values) * p)] * 1000
+
+
+async def main(total: int):
+    rng = random.Random(7)
+    words = vocabulary(50_000, rng)
+    # Zipf-like word frequencies: a few common words, a long tail of rare ones
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = FactStore(os.path.join(directory, "facts.db"))
+
+        started = time.perf_counter()
+        for start in range(0, total, BATCH):
+            batch = [
+                Fact(
+                    entity=f"entity_{i // 10}",
+                    attribute=ATTRIBUTES[i % len(ATTRIBUTES)],
+                    value=" ".join(rng.choices(words, cum_weights=weights, k=rng.randint(3, 8))),
+                    source="bench",
+                )
+                for i in range(start, min(start + BATCH, total))
+            ]
+            await store.add_many(batch)
+        ingest = time.perf_counter() - started
+        await store.optimize()
+        print(f"ingest: {total:,} facts in {ingest:.1f} s ({total / ingest:,.0f} facts/s)")
+
+        for label, pool in (("rare words", words[1000:]), ("mixed words", words)):
+            latencies = []
+            for _ in range(QUERIES):
+                query = "what do we know about " + " ".join(rng.sample(pool, 3))
+                started = time.perf_counter()
+                await store.search(query, k=10)
+                latencies.append(time.perf_counter() - started)
+            print(
+                f"search ({label:<11}) p50={percentile(latencies, 0.5):6.2f} ms  "
+                f"p99={percentile(latencies, 0.99):6.2f} ms"
+            )
+
+        latencies = []
+        for _ in range(QUERIES):
+            entity = f"entity_{rng.randrange(total // 10)}"
+            started = time.perf_counter()
+            await store.get(entity)
+            latencies.append(time.perf_counter() - started)
+        print(f"get(entity)          p50={percentile(latencies, 0.5):6.2f} ms  p99={percentile(latencies, 0.99):6.2f} ms")
+        print(f"rows: {await store.count():,}")
+        store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else FACTS))
@@ -0,0 +1,123 @@
+# bench_pdf_reports.py
+#
+# Pages/sec and peak RSS of report generation: the original in-memory FPDF rendering,
+# the streaming engine in one process, PDFCreatorTool.render_batch() across all cores,
+# and one very large document. Each mode runs in its own subprocess so peak RSS is its own.
+#
+#   python bench_pdf_reports.py                 # 100 reports, 2,000-page document
+#   python bench_pdf_reports.py 400 10000
+
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+WORDS = (
+    "agent workflow report revenue quarter growth market analysis customer retention "
+    "pipeline forecast risk mitigation strategy operational efficiency benchmark latency "
+    "throughput margin segment regional outlook investment roadmap"
+).split()
+
+
+def make_report(seed: int, sections: int = 12) -> dict:
+    rng = random.Random(seed)
+    return {
+        "title": f"Report {seed}",
+        "sections": [
+            {
+                "heading": f"{i + 1}. {rng.choice(WORDS).title()} {rng.choice(WORDS)}",
+                "content": "\n".join(
+                    " ".join(rng.choices(WORDS, k=rng.randint(40, 120))) for _ in range(rng.randint(1, 4))
+                ),
+            }
+            for i in range(sections)
+        ],
+    }
+
+
+def render_fpdf(report: dict, path: str) -> int:
+    """The tool's original implementation."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 24)
+    pdf.cell(0, 20, report["title"], ln=True, align="C")
+    pdf.ln(10)
+    for section in report["sections"]:
+        pdf.set_font("Helvetica", "B", 16)
+        pdf.cell(0, 10, section["heading"], ln=True)
+        pdf.set_font("Helvetica", "", 12)
+        pdf.multi_cell(0, 7, section["content"])
+        pdf.ln(5)
+    pdf.output(path)
+    return pdf.page_no()
+
+
+def run_mode(mode: str, reports: int, large_sections: int, directory: str) -> dict:
+    from executors.tool_pool import ToolPool
+    from tools.domain.research.pdf_creator import PDFCreatorInput, PDFCreatorTool
+    from tools.domain.research.pdf_engine import renderer_for
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    started = time.perf_counter()
+    if mode == "fpdf":
+        pages = sum(render_fpdf(make_report(i), os.path.join(directory, f"{i}.pdf")) for i in range(reports))
+    elif mode == "engine":
+        renderer = renderer_for()
+        pages = sum(
+            renderer.render(**make_report(i), output_path=os.path.join(directory, f"{i}.pdf"))
+            for i in range(reports)
+        )
+    elif mode == "batch":
+        inputs = [
+            PDFCreatorInput(**make_report(i), output_path=os.path.join(directory, f"{i}.pdf"))
+            for i in range(reports)
+        ]
+        results = asyncio.run(PDFCreatorTool().render_batch(inputs))
+        pages = sum(result.data["pages"] for result in results)
+        ToolPool.shared().shutdown()  # workers must exit to show up in RUSAGE_CHILDREN
+    elif mode in ("large-fpdf", "large-engine"):
+        report = make_report(0, sections=large_sections)
+        path = os.path.join(directory, "large.pdf")
+        pages = render_fpdf(report, path) if mode == "large-fpdf" else renderer_for().render(**report, output_path=path)
+    seconds = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "pages": pages,
+        "seconds": seconds,
+        "rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "worker_rss_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def main(reports: int, large_pages: int) -> None:
+    large_sections = max(1, large_pages * 16 // 10)  # ~1.6 sections per page
+    modes = ["fpdf", "engine", "batch", "large-fpdf", "large-engine"]
+    print(f"{reports} reports of ~7 pages, one document of ~{large_pages:,} pages, {os.cpu_count()} CPUs")
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as directory:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, str(reports), str(large_sections), directory],
+                capture_output=True, text=True, check=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        workers = f"  workers peak={result['worker_rss_mib']:6.1f} MiB" if mode == "batch" else ""
+        print(
+            f"{mode:<13} {result['pages']:>7,} pages  {result['seconds']:7.2f} s  "
+            f"{result['pages'] / result['seconds']:9,.0f} pages/s  peak RSS={result['rss_mib']:6.1f} MiB{workers}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        print(json.dumps(run_mode(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), sys.argv[5])))
+    else:
+        args = [int(arg) for arg in sys.argv[1:]]
+        main(*(args + [100, 2000][len(args):]))
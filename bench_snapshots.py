@@ -0,0 +1,80 @@
+# bench_snapshots.py
+#
+# Memory and time for 100 snapshots of a session that grows to 2k messages:
+# full deep copies (the old SnapshotManager + InMemoryStateStore path) vs delta snapshots,
+# without a store and persisted through an InMemoryStateStore.
+
+import asyncio
+import time
+import tracemalloc
+from core.schemas import AgentState, Attempt, LLMResponse, ToolResult
+from memory.state_store.in_memory import InMemoryStateStore
+from memory.state_store.snapshot_manager import SnapshotManager
+
+MESSAGES = 2000
+SNAPSHOTS = 100
+
+
+def grow(state: AgentState, count: int) -> None:
+    for _ in range(count):
+        i = len(state.chat_history)
+        state.chat_history.append({"role": "user" if i % 2 else "assistant", "content": f"message {i} " * 20})
+        if i % 4 == 0:
+            state.attempts.append(Attempt(
+                step=f"iteration_{i}",
+                attempt_number=1,
+                llm_response=LLMResponse(content=f"answer {i}", finish_reason="stop"),
+                tool_results=[ToolResult(success=True, data={"i": i})],
+            ))
+            state.outputs[f"step_{i % 50}"] = {"i": i}
+
+
+async def measure(label: str, take) -> None:
+    state = AgentState()
+    per_snapshot = MESSAGES // SNAPSHOTS
+    kept = []
+
+    tracemalloc.start()
+    elapsed = 0.0
+    for n in range(SNAPSHOTS):
+        grow(state, per_snapshot)
+        started = time.perf_counter()
+        kept.append(await take(state, f"step_{n}"))
+        elapsed += time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<16} snapshots={SNAPSHOTS} messages={len(state.chat_history)} "
+          f"take_total={elapsed * 1000:8.1f} ms  traced={current / 1e6:7.2f} MB  peak={peak / 1e6:7.2f} MB")
+
+
+async def main():
+    full_store = InMemoryStateStore()
+
+    async def deep_copy(state: AgentState, name: str) -> None:
+        await full_store.save(f"bench:snapshot:{name}", state)
+
+    async def delta(state: AgentState, name: str) -> None:
+        await manager.save_snapshot("bench", name, state)
+
+    async def delta_stored(state: AgentState, name: str) -> None:
+        await stored.save_snapshot("bench", name, state)
+
+    manager = SnapshotManager()
+    stored = SnapshotManager(InMemoryStateStore())
+    await measure("deep copy", deep_copy)
+    await measure("delta", delta)
+    await measure("delta + store", delta_stored)
+
+    for label, restore in [
+        ("delta", manager.load_snapshot),
+        ("store", SnapshotManager(stored.store).load_snapshot),  # another process: replays the records
+    ]:
+        started = time.perf_counter()
+        for n in range(SNAPSHOTS):
+            await restore("bench", f"step_{n}")
+        print(f"{label + ' restore':<16} avg={(time.perf_counter() - started) / SNAPSHOTS * 1000:.3f} ms per snapshot")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
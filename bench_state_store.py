@@ -0,0 +1,76 @@
+# bench_state_store.py
+#
+# Saves/sec and load latency of InMemoryStateStore vs SQLiteStateStore, for
+# sessions saved one at a time and for concurrent bursts from many sessions.
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from core.schemas import AgentState
+from memory.state_store.base_store import BaseStateStore
+from memory.state_store.in_memory import InMemoryStateStore
+from memory.state_store.sqlite import SQLiteStateStore
+
+SESSIONS = 500
+MESSAGES = 50  # per session
+LOADS = 2000
+
+
+def make_state(session: int) -> AgentState:
+    return AgentState(
+        current_step="step_3",
+        outputs={f"step_{i}": {"value": i} for i in range(3)},
+        chat_history=[
+            {"role": "user" if i % 2 else "assistant", "content": f"session {session} message {i} " * 10}
+            for i in range(MESSAGES)
+        ],
+    )
+
+
+async def measure(label: str, store: BaseStateStore) -> None:
+    states = [make_state(i) for i in range(SESSIONS)]
+
+    started = time.perf_counter()
+    for i, state in enumerate(states):
+        await store.save(f"seq:{i}", state)
+    sequential = SESSIONS / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[store.save(f"burst:{i}", state) for i, state in enumerate(states)])
+    burst = SESSIONS / (time.perf_counter() - started)
+
+    latencies = []
+    for n in range(LOADS):
+        started = time.perf_counter()
+        await store.load(f"burst:{n % SESSIONS}")
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    started = time.perf_counter()
+    keys = await store.list_keys("burst:1")
+    list_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        f"{label:<10} saves/s sequential={sequential:9.0f}  concurrent={burst:9.0f}  "
+        f"load p50={statistics.median(latencies) * 1e6:7.0f} us  p99={latencies[int(LOADS * 0.99)] * 1e6:7.0f} us  "
+        f"list_keys({len(keys)})={list_ms:.2f} ms"
+    )
+
+
+async def main():
+    await measure("in-memory", InMemoryStateStore())
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStateStore(os.path.join(directory, "state.db"))
+        await measure("sqlite", store)
+        print(
+            f"           sqlite writes={store.stats.writes} transactions={store.stats.transactions} "
+            f"({store.stats.writes_per_transaction:.1f} writes/commit)"
+        )
+        await store.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
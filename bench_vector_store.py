@@ -0,0 +1,88 @@
+# bench_vector_store.py
+#
+# Query latency and recall@10 of VectorStore (float32 and int8) against a brute-force
+# full sort, plus save and mmap open times, at 10k / 100k / 1M vectors.
+#
+#   python bench_vector_store.py            # all sizes
+#   python bench_vector_store.py 10000      # just one
+
+import sys
+import tempfile
+import time
+import numpy as np
+from memory.long_term.vector_store import VectorStore
+
+DIM = 128
+K = 10
+QUERIES = 32
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def brute_force(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+def recall(results, expected: np.ndarray) -> float:
+    hits = sum(
+        len({int(r.id) for r in found} & set(truth.tolist()))
+        for found, truth in zip(results, expected)
+    )
+    return hits / expected.size
+
+
+def bench(size: int) -> None:
+    rng = np.random.default_rng(42)
+    # Clustered data, so neighbours are meaningful and int8 errors can reorder them
+    centers = rng.standard_normal((256, DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, 256, size)] + 0.3 * rng.standard_normal((size, DIM)).astype(np.float32)
+    queries = vectors[rng.integers(0, size, QUERIES)] + 0.1 * rng.standard_normal((QUERIES, DIM)).astype(np.float32)
+    ids = [str(i) for i in range(size)]
+
+    started = time.perf_counter()
+    expected = brute_force(vectors, queries, K)
+    brute_ms = (time.perf_counter() - started) * 1000 / QUERIES
+
+    for quantize in (False, True):
+        store = VectorStore(DIM, quantize=quantize)
+        store.add(ids, vectors)
+
+        started = time.perf_counter()
+        for query in queries:
+            store.search(query, k=K)
+        single_ms = (time.perf_counter() - started) * 1000 / QUERIES
+
+        started = time.perf_counter()
+        results = store.search_batch(queries, k=K)
+        batch_ms = (time.perf_counter() - started) * 1000 / QUERIES
+
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            store.save(directory)
+            save_s = time.perf_counter() - started
+            started = time.perf_counter()
+            opened = VectorStore.open(directory)
+            open_ms = (time.perf_counter() - started) * 1000
+            first_query_ms = _time_ms(lambda: opened.search(queries[0], k=K))
+            del opened
+
+        label = "int8" if quantize else "float32"
+        print(
+            f"{size:>9,} {label:<8} query={single_ms:7.2f} ms  batched={batch_ms:7.2f} ms/query  "
+            f"brute-force sort={brute_ms:7.2f} ms/query  recall@{K}={recall(results, expected):.3f}  "
+            f"save={save_s:5.2f} s  mmap open={open_ms:6.2f} ms  first query={first_query_ms:7.2f} ms"
+        )
+        del store
+
+
+def _time_ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    for size in sizes:
+        bench(size)
@@ -1,10 +1,17 @@
 # core/base_agent.py
 
+import asyncio
+import uuid
 from pydantic import BaseModel, Field
-from core.schemas import AgentState, ExecutionContext, LLMResponse
+from core.schemas import MESSAGE_SOURCE, AgentState, ExecutionContext, LLMResponse, StreamChunk
 from core.base_tool import BaseTool
 from providers.base_provider import BaseLLMProvider
-from typing import Literal
+from memory.context_window import BaseContextPolicy
+from memory.result_store import ToolResultStore
+from memory.retrieval import ContextRetrieval, RetrievalReport
+from memory.state_store.journal import JournalStateStore
+from tools.infrastructure.fetch_tool_result import FetchToolResultTool
+from typing import Any, AsyncIterator, Literal
 
 class AgentConfig(BaseModel):
     name: str
@@ -12,7 +19,10 @@ class AgentConfig(BaseModel):
     tools: list[BaseTool] = Field(default_factory=list)
     max_iterations: int = 10
     response_format: Literal["text", "json"] = "text"
-
+    context_policy: BaseContextPolicy | None = None  # None = send the whole history
+    result_store: ToolResultStore | None = None  # None = tool results go into the history in full
+    state_journal: JournalStateStore | None = None  # executors record state changes after every iteration/step
+    retrieval: ContextRetrieval | None = None  # None = no memory lookup before LLM calls
 
     class Config:
         arbitrary_types_allowed = True
@@ -23,6 +33,9 @@ class BaseAgent:
         self.config = config
         self.provider = provider
         self.state = AgentState()
+        self._fetch_tool = FetchToolResultTool(config.result_store) if config.result_store else None
+        self.last_retrieval: RetrievalReport | None = None  # from the latest prepare_context()
+        self._retrieval_scope = uuid.uuid4().hex  # one per session: a shared retrieval cache keeps them apart
 
     @property
     def name(self) -> str:
@@ -30,6 +43,8 @@ class BaseAgent:
 
     @property
     def tools(self) -> list[BaseTool]:
+        if self._fetch_tool is not None:
+            return [*self.config.tools, self._fetch_tool]
         return self.config.tools
 
     def get_tool(self, name: str) -> BaseTool | None:
@@ -38,18 +53,69 @@ class BaseAgent:
                 return tool
         return None
 
-    def build_messages(self) -> list[dict[str, str]]:
-        messages = [{"role": "system", "content": self.config.system_prompt}]
-        messages.extend(self.state.chat_history)
+    def build_messages(self, history: list[dict[str, str]] | None = None) -> list[dict[str, str]]:
+        history = self.state.chat_history if history is None else history
+        retrieval = self.config.retrieval
+        retrieved = retrieval.cached(history, self._retrieval_scope) if retrieval is not None else None
+        policy = self.config.context_policy
+        if policy is not None:
+            history = policy.select(history, self.context_budget() - (retrieved.tokens if retrieved else 0))
+
+        system_prompt = self.config.system_prompt
+        if retrieved is not None and retrieved.text:
+            system_prompt = f"{system_prompt}\n\n{retrieved.text}"
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(_for_provider(message) for message in history)
         return messages
 
+    def context_budget(self) -> int:
+        """Tokens available for chat history under the configured context policy."""
+        return self.config.context_policy.budget(
+            self.provider.config.model,
+            self.provider.config.max_tokens,
+            self.config.system_prompt,
+        )
+
+    async def prepare_context(self, history: list[dict[str, str]] | None = None) -> None:
+        """Async work before build_messages(): context policy (e.g. summarizing) and memory retrieval, concurrently."""
+        history = self.state.chat_history if history is None else history
+        work = []
+        if self.config.context_policy is not None:
+            work.append(self.config.context_policy.prepare(history, self.context_budget()))
+        if self.config.retrieval is not None:
+            work.append(self._retrieve(history))
+        await asyncio.gather(*work)
+
+    async def _retrieve(self, history: list[dict[str, str]]) -> None:
+        self.last_retrieval = await self.config.retrieval.prepare(history, self._retrieval_scope)
+
     async def call_llm(self) -> LLMResponse:
+        await self.prepare_context()
         messages = self.build_messages()
-        return await self.provider.call(
+        response = await self.provider.call(
             messages=messages,
             tools=self.tools if self.tools else None,
             response_format=self.config.response_format,
         )
+        self._report_retrieval(response)
+        return response
+
+    async def stream_llm(self) -> AsyncIterator[StreamChunk]:
+        await self.prepare_context()
+        messages = self.build_messages()
+        async for chunk in self.provider.stream(
+            messages=messages,
+            tools=self.tools if self.tools else None,
+            response_format=self.config.response_format,
+        ):
+            if chunk.type == "done" and chunk.response is not None:
+                self._report_retrieval(chunk.response)
+            yield chunk
+
+    def _report_retrieval(self, response: LLMResponse) -> None:
+        """Count the injected memory block in the response usage, next to the provider's numbers."""
+        if self.last_retrieval is not None:
+            response.usage["retrieved_tokens"] = self.last_retrieval.tokens
 
     def add_user_message(self, content: str):
         self.state.chat_history.append({"role": "user", "content": content})
@@ -57,11 +123,31 @@ class BaseAgent:
     def add_assistant_message(self, content: str):
         self.state.chat_history.append({"role": "assistant", "content": content})
 
+    def render_tool_data(self, tool_name: str, data: Any) -> tuple[str, str | None]:
+        """Text of a tool result for the chat history, and its store handle if it was too big to inline."""
+        if self.config.result_store is None or tool_name == FetchToolResultTool.name:
+            return str(data), None
+        return self.config.result_store.render(data, tool_name)
+
     def add_tool_result(self, tool_name: str, result: str):
         self.state.chat_history.append({
             "role": "user",  # tool results go back as user message
             "content": f"[Tool: {tool_name}] Result: {result}",
+            MESSAGE_SOURCE: "tool",
         })
 
+    async def record_state(self, session_id: str) -> None:
+        """Journal what changed in the state since the last record (no-op without a journal)."""
+        if self.config.state_journal is not None:
+            await self.config.state_journal.save(session_id, self.state)
+
     def reset(self):
-        self.state = AgentState()
\ No newline at end of file
+        self.state = AgentState()
+        self.last_retrieval = None
+        self._retrieval_scope = uuid.uuid4().hex
+
+
+def _for_provider(message: dict[str, str]) -> dict[str, str]:
+    if MESSAGE_SOURCE not in message:
+        return message
+    return {key: value for key, value in message.items() if key != MESSAGE_SOURCE}
@@ -1,12 +1,20 @@
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from core.schemas import ToolResult, ExecutionContext, LLMResponse
+from typing import AsyncIterator, Literal
 
 class BaseTool(ABC):
     name: str
     description: str
     input_model: type[BaseModel]
     output_model: type[BaseModel] | None = None  # optional, for validation/docs
+    max_concurrency: int | None = None  # concurrent calls across all sessions, None = unlimited
+    max_concurrency_per_session: int | None = None  # concurrent calls within one session
+    timeout: float | None = None  # seconds per call, None = executor default
+    execution: Literal["async", "blocking_io", "cpu_bound"] = "async"  # how executors run it; see SyncTool
 
     def get_input_schema(self) -> dict:
         return self.input_model.model_json_schema()
@@ -14,6 +22,64 @@ class BaseTool(ABC):
     def get_output_schema(self) -> dict | None:
         return self.output_model.model_json_schema() if self.output_model else None
 
+    @asynccontextmanager
+    async def limit(self, session_id: str | None = None) -> AsyncIterator[None]:
+        """Hold the tool's global and per-session concurrency slots for one call."""
+        slots = []
+        if self.max_concurrency:
+            if getattr(self, "_global_slots", None) is None:
+                self._global_slots = asyncio.Semaphore(self.max_concurrency)
+            slots.append(self._global_slots)
+        if self.max_concurrency_per_session and session_id is not None:
+            if getattr(self, "_session_slots", None) is None:
+                # Weak values: a session's semaphore goes away once no call holds it
+                self._session_slots = weakref.WeakValueDictionary()
+            session_slots = self._session_slots.get(session_id)
+            if session_slots is None:
+                session_slots = asyncio.Semaphore(self.max_concurrency_per_session)
+                self._session_slots[session_id] = session_slots
+            # Per-session first so one session can't hold global slots while queued on its own limit
+            slots.insert(0, session_slots)
+
+        for i, slot in enumerate(slots):
+            try:
+                await slot.acquire()
+            except BaseException:
+                for acquired in slots[:i]:
+                    acquired.release()
+                raise
+        try:
+            yield
+        finally:
+            for slot in slots:
+                slot.release()
+
+    @abstractmethod
+    async def execute(self, input: BaseModel, context: ExecutionContext) -> ToolResult:
+        pass
+
+
+class SyncTool(BaseTool):
+    """Tool whose work is a blocking `run()`: a sync library wrapper, file rendering, parsing.
+
+    Executors run it off the event loop through their ToolPool: `blocking_io` tools on a
+    thread pool, `cpu_bound` ones in worker processes. For a process, the tool, the input
+    and a stripped-down context are pickled, so `run()` must not rely on
+    `context.agent_state` or on non-primitive `context.metadata`.
+
+    The worker rebuilds a `cpu_bound` tool from its public attributes only, without
+    calling `__init__`: underscore-private attributes count as per-process runtime state
+    (locks, caches, clients) and are not sent. Keep anything `run()` needs, such as
+    configuration, in public attributes.
+
+    Called directly, `execute()` runs `run()` in a thread.
+    """
+
+    execution: Literal["blocking_io", "cpu_bound"] = "blocking_io"
+
     @abstractmethod
+    def run(self, input: BaseModel, context: ExecutionContext) -> ToolResult:
+        pass
+
     async def execute(self, input: BaseModel, context: ExecutionContext) -> ToolResult:
-        pass
\ No newline at end of file
+        return await asyncio.to_thread(self.run, input, context)
@@ -18,6 +18,17 @@ class LLMConfig(BaseModel):
     base_url: str | None = None  # for ollama/openrouter
     api_key: str | None = None   # loaded from env if None
 
+class EmbeddingConfig(BaseModel):
+    provider: Literal["openai", "ollama", "hashing"]
+    model: str
+    dimensions: int | None = None  # None = the model's native size
+    base_url: str | None = None  # for ollama
+    api_key: str | None = None   # loaded from env if None
+    max_batch_size: int = 256  # texts per upstream call
+    batch_window: float = 0.005  # seconds concurrent requests wait to share a call
+    max_concurrent_batches: int = 4
+    cache_path: str | None = None  # SQLite file keyed by content hash, None = no cache
+
 class ToolCall(BaseModel):
     tool_name: str
     arguments: dict[str, Any]
@@ -29,6 +40,20 @@ class LLMResponse(BaseModel):
     usage: dict[str, int] = Field(default_factory=dict)  # prompt_tokens, completion_tokens
     raw: Any | None = None  # original provider response for debugging
 
+class ToolCallDelta(BaseModel):
+    index: int  # position of the tool call within the response
+    tool_name: str | None = None  # set on the first delta of each call
+    arguments_delta: str = ""  # partial JSON, concatenate in order
+
+class StreamChunk(BaseModel):
+    type: Literal["text_delta", "tool_call_delta", "usage", "done", "tool_result", "final"]
+    text: str | None = None
+    tool_call: ToolCallDelta | None = None
+    usage: dict[str, int] = Field(default_factory=dict)
+    response: LLMResponse | None = None  # assembled response, on "done"
+    tool_result: ToolResult | None = None  # on "tool_result" (executors only)
+    step: str | None = None  # workflow step or runner iteration that produced it
+
 class CheckpointDecision(str, Enum):
     APPROVE = "approve"
     REVISE = "revise"
@@ -49,6 +74,10 @@ class Attempt(BaseModel):
     checkpoint_response: CheckpointResponse | None = None
     error: str | None = None
 
+# chat_history key marking messages the framework writes as the "user" that aren't user turns:
+# "tool" and "step" results. BaseAgent.build_messages() strips it before a provider sees them.
+MESSAGE_SOURCE = "source"
+
 class AgentState(BaseModel):
     current_step: str | None = None
     current_attempt: int = 1
@@ -56,7 +85,19 @@ class AgentState(BaseModel):
     attempts: list[Attempt] = Field(default_factory=list)       # full history
     chat_history: list[dict[str, str]] = Field(default_factory=list)  # role, content
     feedback: str | None = None  # current revision feedback
-    snapshots: dict[str, "AgentState"] = Field(default_factory=dict)  # for go_back
+    snapshots: dict[str, str] = Field(default_factory=dict)  # step name -> SnapshotManager key, for go_back
+    # Partial loads (PostgresStateStore's limits): chat_history[0] and attempts[0] are items
+    # number history_offset and attempts_offset of the stored session. Not serialized.
+    history_offset: int = Field(default=0, exclude=True)
+    attempts_offset: int = Field(default=0, exclude=True)
+
+class StepProgress(BaseModel):
+    """What a finished workflow step contributed, saved so a restarted run can skip it."""
+    step: str
+    result: ToolResult
+    attempts: list[Attempt] = Field(default_factory=list)
+    messages: list[dict[str, str]] = Field(default_factory=list)  # chat history the step appended
+    completed_at: datetime = Field(default_factory=datetime.now)
 
 class ExecutionContext(BaseModel):
     agent_state: AgentState
@@ -73,6 +114,7 @@ class WorkflowStep(BaseModel):
     prompt: str
     checkpoint: bool = False
     input_override: dict[str, Any] | None = None
+    depends_on: list[str] | None = None  # None = after the previous step; set on any step to run as a DAG
 
 
 class WorkflowDefinition(BaseModel):
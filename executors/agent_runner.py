@@ -1,15 +1,27 @@
 # executors/agent_runner.py
 
 from core.base_agent import BaseAgent
-from core.schemas import ExecutionContext, ToolResult, Attempt
+from core.schemas import MESSAGE_SOURCE, ExecutionContext, ToolResult, Attempt, LLMResponse, StreamChunk
+from executors.tool_pool import ToolPool
+from providers.base_provider import incomplete_stream_response
 from pydantic import ValidationError
 from datetime import datetime
+from typing import AsyncIterator
+import asyncio
 
 
 class AgentRunner:
-    def __init__(self, agent: BaseAgent, context: ExecutionContext):
+    def __init__(
+        self,
+        agent: BaseAgent,
+        context: ExecutionContext,
+        tool_timeout: float | None = None,  # default for tools that don't set their own
+        tool_pool: ToolPool | None = None,  # runs blocking/CPU-bound tools off the loop; None = shared pool
+    ):
         self.agent = agent
         self.context = context
+        self.tool_timeout = tool_timeout
+        self.tool_pool = tool_pool or ToolPool.shared()
 
     async def run(self, task: str) -> str:
         """Run agent until completion or max iterations."""
@@ -18,83 +30,136 @@ class AgentRunner:
         for iteration in range(self.agent.config.max_iterations):
             response = await self.agent.call_llm()
 
-            if response.finish_reason == "error":
-                error_msg = response.raw.get("error", {}).get("message", "Unknown error")
-                return f"API error: {error_msg}"
-            
-            # Log attempt
-            attempt = Attempt(
-                step=f"iteration_{iteration}",
-                attempt_number=iteration + 1,
-                timestamp=datetime.now(),
-                llm_response=response,
-            )
-            self.agent.state.attempts.append(attempt)
-            
-            # No tool calls = done
-            if not response.tool_calls:
-                if response.content:
-                    self.agent.add_assistant_message(response.content)
-                return response.content or ""
-            
-            # Execute each tool call
-            tool_results = await self._execute_tool_calls(response.tool_calls)
-            attempt.tool_results = tool_results
-            
-            # Feed results back to LLM
-            for tc, result in zip(response.tool_calls, tool_results):
-                self._add_tool_result_message(tc.tool_name, result)
+            output, _ = await self._handle_response(iteration, response)
+            await self.agent.record_state(self.context.session_id)
+            if output is not None:
+                return output
         
         return f"Max iterations ({self.agent.config.max_iterations}) reached"
 
+    async def run_stream(self, task: str) -> AsyncIterator[StreamChunk]:
+        """Same loop as run(), but forwards LLM deltas and tool results as they arrive.
+
+        The last chunk is always of type "final" and carries what run() would return.
+        """
+        self.agent.add_user_message(task)
+
+        for iteration in range(self.agent.config.max_iterations):
+            step = f"iteration_{iteration}"
+            response = None
+            async for chunk in self.agent.stream_llm():
+                chunk.step = step
+                if chunk.type == "done":
+                    response = chunk.response
+                yield chunk
+            if response is None:
+                response = incomplete_stream_response()
+
+            output, tool_results = await self._handle_response(iteration, response)
+            await self.agent.record_state(self.context.session_id)
+            for result in tool_results:
+                yield StreamChunk(type="tool_result", tool_result=result, step=step)
+            if output is not None:
+                yield StreamChunk(type="final", text=output, step=step)
+                return
+
+        yield StreamChunk(
+            type="final",
+            text=f"Max iterations ({self.agent.config.max_iterations}) reached",
+        )
+
+    async def _handle_response(
+        self, iteration: int, response: LLMResponse
+    ) -> tuple[str | None, list[ToolResult]]:
+        """Log the attempt and run tool calls. Returns (final output or None to continue, tool results)."""
+        if response.finish_reason == "error":
+            error_msg = response.raw.get("error", {}).get("message", "Unknown error")
+            return f"API error: {error_msg}", []
+        
+        # Log attempt
+        attempt = Attempt(
+            step=f"iteration_{iteration}",
+            attempt_number=iteration + 1,
+            timestamp=datetime.now(),
+            llm_response=response,
+        )
+        self.agent.state.attempts.append(attempt)
+        
+        # No tool calls = done
+        if not response.tool_calls:
+            if response.content:
+                self.agent.add_assistant_message(response.content)
+            return response.content or "", []
+        
+        # Execute tool calls (concurrently)
+        tool_results = await self._execute_tool_calls(response.tool_calls)
+        attempt.tool_results = tool_results
+        
+        # Feed results back to LLM
+        for tc, result in zip(response.tool_calls, tool_results):
+            self._add_tool_result_message(tc.tool_name, result)
+
+        return None, tool_results
+
     async def _execute_tool_calls(self, tool_calls: list) -> list[ToolResult]:
-        results = []
+        """Run all tool calls of one turn concurrently. Results keep the order of tool_calls."""
+        return list(await asyncio.gather(
+            *(self._execute_tool_call(tc) for tc in tool_calls)
+        ))
+
+    async def _execute_tool_call(self, tc) -> ToolResult:
+        tool = self.agent.get_tool(tc.tool_name)
         
-        for tc in tool_calls:
-            tool = self.agent.get_tool(tc.tool_name)
-            
-            if not tool:
-                results.append(ToolResult(
-                    success=False,
-                    tool_name=tc.tool_name,
-                    input=tc.arguments,
-                    error=f"Tool '{tc.tool_name}' not found",
-                ))
-                continue
-            
-            # Validate input
-            try:
-                validated_input = tool.input_model(**tc.arguments)
-            except ValidationError as e:
-                results.append(ToolResult(
-                    success=False,
-                    tool_name=tc.tool_name,
-                    input=tc.arguments,
-                    error=f"Invalid input: {e}",
-                ))
-                continue
-            
-            # Execute
-            try:
-                result = await tool.execute(validated_input, self.context)
-                results.append(result)
-            except Exception as e:
-                results.append(ToolResult(
-                    success=False,
-                    tool_name=tc.tool_name,
-                    input=tc.arguments,
-                    error=f"Execution error: {e}",
-                ))
+        if not tool:
+            return ToolResult(
+                success=False,
+                tool_name=tc.tool_name,
+                input=tc.arguments,
+                error=f"Tool '{tc.tool_name}' not found",
+            )
+        
+        # Validate input
+        try:
+            validated_input = tool.input_model(**tc.arguments)
+        except ValidationError as e:
+            return ToolResult(
+                success=False,
+                tool_name=tc.tool_name,
+                input=tc.arguments,
+                error=f"Invalid input: {e}",
+            )
         
-        return results
+        # Execute
+        timeout = tool.timeout or self.tool_timeout
+        try:
+            async with tool.limit(self.context.session_id):
+                return await asyncio.wait_for(self.tool_pool.execute(tool, validated_input, self.context), timeout)
+        except asyncio.TimeoutError:
+            return ToolResult(
+                success=False,
+                tool_name=tc.tool_name,
+                input=tc.arguments,
+                error=f"Execution error: timed out after {timeout}s",
+            )
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                tool_name=tc.tool_name,
+                input=tc.arguments,
+                error=f"Execution error: {e}",
+            )
 
     def _add_tool_result_message(self, tool_name: str, result: ToolResult):
         if result.success:
-            content = f"[Tool: {tool_name}] Result: {result.data}"
+            text, handle = self.agent.render_tool_data(tool_name, result.data)
+            if handle:
+                result.metadata["result_handle"] = handle
+            content = f"[Tool: {tool_name}] Result: {text}"
         else:
             content = f"[Tool: {tool_name}] Error: {result.error}"
         
         self.agent.state.chat_history.append({
             "role": "user",
             "content": content,
+            MESSAGE_SOURCE: "tool",
         })
\ No newline at end of file
@@ -0,0 +1,232 @@
+# executors/batch_runner.py
+
+import asyncio
+import re
+import time
+from pydantic import BaseModel, Field
+from core.base_agent import BaseAgent
+from core.schemas import AgentState, ExecutionContext, ToolResult, WorkflowDefinition
+from checkpoints.base_checkpoint import BaseCheckpointHandler
+from executors.tool_pool import ToolPool
+from executors.workflow_executor import WorkflowExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    input: Any
+    success: bool
+    results: dict[str, ToolResult] = Field(default_factory=dict)
+    state: AgentState | None = None
+    error: str | None = None
+    duration_seconds: float = 0.0
+
+
+class BatchMetrics(BaseModel):
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    started_at: float = Field(default_factory=time.monotonic)
+    total_item_seconds: float = 0.0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Finished items (ok or failed) per second."""
+        finished = self.completed + self.failed
+        return finished / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def avg_item_seconds(self) -> float:
+        finished = self.completed + self.failed
+        return self.total_item_seconds / finished if finished else 0.0
+
+
+class BatchWorkflowRunner:
+    """Runs one workflow over many inputs with bounded concurrency.
+
+    Every item gets its own BaseAgent (sharing config, provider and tools) and so its own
+    AgentState. Inputs are pulled lazily: a new item only starts when a slot frees up and
+    the consumer has taken the previous result, which gives natural backpressure.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        max_concurrency: int = 8,
+        checkpoint_handler: BaseCheckpointHandler | None = None,
+        item_timeout: float | None = None,
+        batch_id: str = "batch",
+        on_progress: Callable[[BatchMetrics], None] | None = None,
+        tool_pool: ToolPool | None = None,  # shared by every item's executor; None = shared pool
+    ):
+        self.agent = agent
+        self.max_concurrency = max_concurrency
+        self.checkpoint_handler = checkpoint_handler
+        self.item_timeout = item_timeout
+        self.batch_id = batch_id
+        self.on_progress = on_progress
+        self.tool_pool = tool_pool
+        self.metrics = BatchMetrics()
+        self.failed: list[BatchItemResult] = []
+
+    async def run(
+        self,
+        workflow: WorkflowDefinition | Callable[[Any], WorkflowDefinition],
+        inputs: Iterable[Any] | AsyncIterable[Any],
+    ) -> AsyncIterator[BatchItemResult]:
+        """Yield one BatchItemResult per input, in completion order.
+
+        `workflow` is either a factory called with each input, or a definition whose
+        prompts and string input overrides get `{key}` placeholders filled from dict inputs.
+        """
+        async for result in self._run(workflow, _aenumerate(inputs)):
+            yield result
+
+    async def retry_failed(
+        self,
+        workflow: WorkflowDefinition | Callable[[Any], WorkflowDefinition],
+    ) -> AsyncIterator[BatchItemResult]:
+        """Run the inputs of the previous run's failed items again, under their original indexes.
+
+        An item keeps its index and so its session id (`{batch_id}:{index}`), e.g. for
+        resuming from the step progress its first run saved.
+        """
+        items = [(result.index, result.input) for result in self.failed]
+        async for result in self._run(workflow, _aiter(items)):
+            yield result
+
+    async def _run(
+        self,
+        workflow: WorkflowDefinition | Callable[[Any], WorkflowDefinition],
+        items: AsyncIterator[tuple[int, Any]],
+    ) -> AsyncIterator[BatchItemResult]:
+        self.metrics = BatchMetrics()
+        self.failed = []
+        pending: set[asyncio.Task] = set()
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_concurrency:
+                    try:
+                        index, item = await anext(items)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.create_task(self._run_item(index, item, workflow)))
+                    self.metrics.submitted += 1
+                    self.metrics.in_flight += 1
+
+                if not pending:
+                    break
+
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(finished, key=lambda t: t.result().index):
+                    result = task.result()
+                    self.metrics.in_flight -= 1
+                    self.metrics.total_item_seconds += result.duration_seconds
+                    if result.success:
+                        self.metrics.completed += 1
+                    else:
+                        self.metrics.failed += 1
+                        self.failed.append(result)
+                    if self.on_progress:
+                        self.on_progress(self.metrics)
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _run_item(
+        self,
+        index: int,
+        item: Any,
+        workflow: WorkflowDefinition | Callable[[Any], WorkflowDefinition],
+    ) -> BatchItemResult:
+        started = time.monotonic()
+        agent = BaseAgent(config=self.agent.config, provider=self.agent.provider)
+        context = ExecutionContext(
+            agent_state=agent.state,
+            session_id=f"{self.batch_id}:{index}",
+        )
+        executor = WorkflowExecutor(agent, context, self.checkpoint_handler, tool_pool=self.tool_pool)
+
+        try:
+            definition = workflow(item) if callable(workflow) else _render_workflow(workflow, item)
+            results = await asyncio.wait_for(executor.run(definition), self.item_timeout)
+        except asyncio.TimeoutError:
+            return BatchItemResult(
+                index=index,
+                input=item,
+                success=False,
+                state=agent.state,
+                error=f"Timed out after {self.item_timeout}s",
+                duration_seconds=time.monotonic() - started,
+            )
+        except Exception as e:
+            return BatchItemResult(
+                index=index,
+                input=item,
+                success=False,
+                state=agent.state,
+                error=str(e),
+                duration_seconds=time.monotonic() - started,
+            )
+
+        failed_steps = [name for name, result in results.items() if not result.success]
+        return BatchItemResult(
+            index=index,
+            input=item,
+            success=not failed_steps,
+            results=results,
+            state=agent.state,
+            error=f"Failed steps: {failed_steps}" if failed_steps else None,
+            duration_seconds=time.monotonic() - started,
+        )
+
+
+def _render_workflow(workflow: WorkflowDefinition, item: Any) -> WorkflowDefinition:
+    """Fill `{key}` placeholders from a dict input. Other braces (e.g. JSON examples) are left alone."""
+    if not isinstance(item, dict) or not item:
+        return workflow
+
+    values = {str(key): value for key, value in item.items()}
+    pattern = re.compile(r"\{(" + "|".join(re.escape(key) for key in values) + r")\}")
+
+    def render(value):
+        if isinstance(value, str):
+            return pattern.sub(lambda m: str(values[m.group(1)]), value)
+        return value
+
+    steps = [
+        step.model_copy(update={
+            "prompt": render(step.prompt),
+            "input_override": (
+                {k: render(v) for k, v in step.input_override.items()}
+                if step.input_override else step.input_override
+            ),
+        })
+        for step in workflow.steps
+    ]
+    return workflow.model_copy(update={"steps": steps})
+
+
+async def _aenumerate(inputs: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[tuple[int, Any]]:
+    index = 0
+    async for item in _aiter(inputs):
+        yield index, item
+        index += 1
+
+
+async def _aiter(inputs: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+    if hasattr(inputs, "__aiter__"):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
@@ -0,0 +1,181 @@
+# executors/tool_pool.py
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import pickle
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pydantic import BaseModel
+from core.base_tool import BaseTool, SyncTool
+from core.schemas import AgentState, ExecutionContext, ToolResult
+
+PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class ToolPoolStats(BaseModel):
+    submitted: int = 0
+    queued: int = 0  # waiting for a free worker right now
+    running: int = 0
+    completed: int = 0
+    failed: int = 0  # raised, or returned success=False
+    max_queued: int = 0
+    fallbacks: int = 0  # cpu_bound calls run on a thread because they could not be pickled
+    total_queue_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+    max_latency_seconds: float = 0.0  # queue wait + run
+
+    @property
+    def avg_queue_seconds(self) -> float:
+        finished = self.completed + self.failed
+        return self.total_queue_seconds / finished if finished else 0.0
+
+    @property
+    def avg_run_seconds(self) -> float:
+        finished = self.completed + self.failed
+        return self.total_run_seconds / finished if finished else 0.0
+
+
+class ToolPool:
+    """Runs each tool according to its `execution` class.
+
+    `async` tools are awaited on the loop; `blocking_io` SyncTools run on a bounded thread
+    pool and `cpu_bound` ones in worker processes, so neither stalls other sessions. Calls
+    beyond the number of workers wait in a queue; its depth and the wait/run latencies
+    are tracked per class in `stats`.
+
+    The process pool is started on the first cpu_bound call (with `spawn`, so it is safe
+    next to the event loop's threads). Tools, inputs and results are pickled once each;
+    a cpu_bound call that can't be pickled falls back to the thread pool with a warning.
+    """
+
+    _shared: "ToolPool | None" = None
+
+    def __init__(
+        self,
+        max_threads: int = 16,
+        max_processes: int | None = None,  # None = CPU count
+        mp_context: str = "spawn",
+    ):
+        self.max_threads = max_threads
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.stats = {execution: ToolPoolStats() for execution in ("async", "blocking_io", "cpu_bound")}
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def shared(cls) -> "ToolPool":
+        """Process-wide default used by executors that are not given a pool."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    async def execute(self, tool: BaseTool, input: BaseModel, context: ExecutionContext) -> ToolResult:
+        execution = tool.execution if isinstance(tool, SyncTool) else "async"
+        if execution == "cpu_bound":
+            try:
+                payload = _pack(tool, input, context)
+            except Exception as e:
+                warnings.warn(f"Tool '{tool.name}' can't be sent to a worker process ({e}); running it on a thread")
+                self.stats["cpu_bound"].fallbacks += 1
+                execution = "blocking_io"
+
+        stats = self.stats[execution]
+        stats.submitted += 1
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        submitted_at = time.perf_counter()
+        started_at = None
+        result = None
+        try:
+            async with self._slot(execution):
+                stats.queued -= 1
+                stats.running += 1
+                started_at = time.perf_counter()
+                if execution == "async":
+                    result = await tool.execute(input, context)
+                elif execution == "blocking_io":
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self._thread_pool(), tool.run, input, context
+                    )
+                else:
+                    data = await asyncio.get_running_loop().run_in_executor(
+                        self._process_pool(), _run_packed, payload
+                    )
+                    result = pickle.loads(data)
+                return result
+        finally:
+            finished_at = time.perf_counter()
+            if started_at is None:  # cancelled while queued
+                stats.queued -= 1
+            else:
+                stats.running -= 1
+                stats.total_queue_seconds += started_at - submitted_at
+                stats.total_run_seconds += finished_at - started_at
+                stats.max_latency_seconds = max(stats.max_latency_seconds, finished_at - submitted_at)
+                if result is not None and result.success:
+                    stats.completed += 1
+                else:
+                    stats.failed += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._threads is not None:
+            self._threads.shutdown(wait=wait)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait, cancel_futures=not wait)
+            self._processes = None
+
+    def _slot(self, execution: str) -> asyncio.Semaphore | contextlib.nullcontext:
+        if execution == "async":
+            return contextlib.nullcontext()  # unbounded here; the tool's own limits apply
+        slot = self._slots.get(execution)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_threads if execution == "blocking_io" else self.max_processes)
+            self._slots[execution] = slot
+        return slot
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="tool")
+        return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.max_processes,
+                mp_context=multiprocessing.get_context(self.mp_context),
+            )
+        return self._processes
+
+
+def _pack(tool: BaseTool, input: BaseModel, context: ExecutionContext) -> bytes:
+    # Underscore attributes are runtime state (semaphores, caches) that belong to this process;
+    # SyncTool documents that configuration must be public to reach the worker
+    state = {key: value for key, value in vars(tool).items() if not key.startswith("_")}
+    portable_context = ExecutionContext(
+        agent_state=AgentState(),
+        user_id=context.user_id,
+        session_id=context.session_id,
+        metadata={key: value for key, value in context.metadata.items() if isinstance(value, PRIMITIVES)},
+    )
+    return pickle.dumps((type(tool), state, input, portable_context), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _run_packed(payload: bytes) -> bytes:
+    """Worker-process side: rebuild the tool, run it, send the pickled ToolResult back."""
+    tool_class, state, input, context = pickle.loads(payload)
+    tool = tool_class.__new__(tool_class)
+    vars(tool).update(state)
+    result = tool.run(input, context)
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        return pickle.dumps(ToolResult(
+            success=False,
+            error=f"Result of '{tool.name}' could not be sent back from the worker process: {e}",
+        ))
@@ -2,16 +2,25 @@
 
 from core.base_agent import BaseAgent
 from core.schemas import (
+    MESSAGE_SOURCE,
     ExecutionContext, 
     ToolResult, 
     Attempt,
     WorkflowDefinition,
+    WorkflowStep,
     CheckpointResponse,
     CheckpointDecision,
+    LLMResponse,
+    StreamChunk,
+    StepProgress,
 )
+from executors.tool_pool import ToolPool
+from providers.base_provider import incomplete_stream_response
+from memory.state_store.base_store import BaseStateStore
 from pydantic import ValidationError
 from datetime import datetime
-from typing import Callable, Awaitable
+from typing import AsyncIterator, Callable, Awaitable
+import asyncio
 import json
 import re
 
@@ -22,28 +31,51 @@ class WorkflowExecutor:
         agent: BaseAgent, 
         context: ExecutionContext,
         checkpoint_handler: Callable[[str, ToolResult], Awaitable[CheckpointResponse]] | None = None,
+        state_store: BaseStateStore | None = None,  # enables resuming by context.session_id
+        tool_pool: ToolPool | None = None,  # runs blocking/CPU-bound tools off the loop; None = shared pool
     ):
         self.agent = agent
         self.context = context
         self.checkpoint_handler = checkpoint_handler
+        self.state_store = state_store
+        self.tool_pool = tool_pool or ToolPool.shared()
+        self._stream_queue: asyncio.Queue[StreamChunk | None] | None = None
 
     async def run(self, workflow: WorkflowDefinition) -> dict[str, ToolResult]:
-        """Execute workflow steps in order, respecting checkpoints."""
+        """Execute workflow steps in order, respecting checkpoints.
+
+        With a state store, steps already completed for this session are restored
+        instead of re-run.
+        """
+        if any(step.depends_on is not None for step in workflow.steps):
+            return await self._run_dag(workflow)
+
         results: dict[str, ToolResult] = {}
         
         step_index = 0
+        progress = await self._load_progress()
+        for step in workflow.steps:
+            if step.name not in progress:
+                break
+            self._restore_step(progress[step.name])
+            results[step.name] = progress[step.name].result
+            step_index += 1
+
         while step_index < len(workflow.steps):
             step = workflow.steps[step_index]
             self.agent.state.current_step = step.name
+            history_start = len(self.agent.state.chat_history)
             
             # Execute step
             result = await self._execute_step(step)
             results[step.name] = result
+            self._emit(StreamChunk(type="tool_result", tool_result=result, step=step.name))
 
             if result.success and result.data:
                 self.agent.state.chat_history.append({
                     "role": "user",
-                    "content": f"[Step: {step.name}] Result:\n{result.data}"
+                    "content": f"[Step: {step.name}] Result:\n{self._render_result(step, result)}",
+                    MESSAGE_SOURCE: "step",
                 })
             
             # Log attempt
@@ -55,6 +87,7 @@ class WorkflowExecutor:
             )
             self.agent.state.attempts.append(attempt)
             self.agent.state.outputs[step.name] = result.data
+            await self.agent.record_state(self.context.session_id)
             
             # Handle checkpoint
             if step.checkpoint and self.checkpoint_handler:
@@ -69,14 +102,291 @@ class WorkflowExecutor:
                 
                 if next_index == -1:  # stop
                     break
+
+                if next_index > step_index:
+                    await self._save_progress(step.name, result, history_start)
+                else:  # revise / go back: this step and everything after it is stale
+                    await self._drop_progress([s.name for s in workflow.steps[next_index:]])
                     
                 step_index = next_index
                 continue
             
+            await self._save_progress(step.name, result, history_start)
             step_index += 1
         
+        # Checkpoint decisions of the last step
+        await self.agent.record_state(self.context.session_id)
         return results
 
+    async def _load_progress(self) -> dict[str, StepProgress]:
+        if self.state_store is None:
+            return {}
+        return await self.state_store.load_step_progress(self.context.session_id)
+
+    async def _save_progress(
+        self,
+        step_name: str,
+        result: ToolResult,
+        history_start: int,
+        messages: list[dict[str, str]] | None = None,
+    ) -> None:
+        """Persist just this step: its result, attempts and the messages it added."""
+        if self.state_store is None:
+            return
+        progress = StepProgress(
+            step=step_name,
+            result=result,
+            attempts=[a for a in self.agent.state.attempts if a.step == step_name],
+            messages=messages if messages is not None else self.agent.state.chat_history[history_start:],
+        )
+        await self.state_store.save_step_progress(self.context.session_id, progress)
+
+    async def _drop_progress(self, step_names: list[str]) -> None:
+        if self.state_store is None or not step_names:
+            return
+        await self.state_store.delete_step_progress(self.context.session_id, step_names)
+
+    def _restore_step(self, progress: StepProgress, restore_history: bool = True) -> None:
+        self.agent.state.outputs[progress.step] = progress.result.data
+        self.agent.state.attempts.extend(progress.attempts)
+        if restore_history:
+            self.agent.state.chat_history.extend(progress.messages)
+
+    async def _run_dag(self, workflow: WorkflowDefinition) -> dict[str, ToolResult]:
+        """Run steps as soon as their dependencies are done, independent steps concurrently.
+
+        Each step sees the chat history from before the run plus the messages of its
+        (transitive) dependencies, in declaration order, so results don't depend on timing.
+        """
+        steps = {step.name: step for step in workflow.steps}
+        order = {step.name: i for i, step in enumerate(workflow.steps)}
+        dependencies = self._resolve_dependencies(workflow)
+        ancestors = {name: self._ancestors(name, dependencies) for name in steps}
+
+        base_history = list(self.agent.state.chat_history)
+        results: dict[str, ToolResult] = {}
+        step_messages: dict[str, list[dict[str, str]]] = {}
+        attempt_numbers = {name: 1 for name in steps}
+        done: set[str] = set()
+        running: dict[asyncio.Task, str] = {}
+        checkpoint_lock = asyncio.Lock()  # one review at a time
+
+        def commit_history() -> None:
+            self.agent.state.chat_history = base_history + [
+                message
+                for name in sorted(done, key=order.get)
+                for message in step_messages[name]
+            ]
+
+        def invalidate(names: set[str]) -> None:
+            for task, name in list(running.items()):
+                if name in names:
+                    task.cancel()
+                    del running[task]
+            for name in names:
+                done.discard(name)
+                results.pop(name, None)
+                step_messages.pop(name, None)
+                self.agent.state.outputs.pop(name, None)
+            commit_history()
+
+        # Restore finished steps; a step only counts once all of its dependencies have been restored
+        progress = await self._load_progress()
+        restored = True
+        while restored:
+            restored = False
+            for name in sorted(steps, key=order.get):
+                if name in done or name not in progress or not dependencies[name] <= done:
+                    continue
+                self._restore_step(progress[name], restore_history=False)
+                results[name] = progress[name].result
+                step_messages[name] = progress[name].messages
+                done.add(name)
+                restored = True
+        commit_history()
+
+        try:
+            while True:
+                for name in sorted(steps, key=order.get):
+                    if name in done or name in running.values():
+                        continue
+                    if not dependencies[name] <= done:
+                        continue
+                    history = base_history + [
+                        message
+                        for dep in sorted(ancestors[name], key=order.get)
+                        for message in step_messages[dep]
+                    ]
+                    self.agent.state.current_step = name
+                    task = asyncio.create_task(
+                        self._execute_dag_step(steps[name], history, checkpoint_lock)
+                    )
+                    running[task] = name
+
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                stop = False
+                for task in sorted(finished, key=lambda t: order[running[t]]):
+                    if task not in running:  # invalidated by an earlier checkpoint in this batch
+                        continue
+                    name = running.pop(task)
+                    result, new_messages, checkpoint_response = task.result()
+
+                    results[name] = result
+                    step_messages[name] = new_messages
+                    self.agent.state.outputs[name] = result.data
+                    self.agent.state.attempts.append(Attempt(
+                        step=name,
+                        attempt_number=attempt_numbers[name],
+                        timestamp=datetime.now(),
+                        tool_results=[result],
+                        checkpoint_response=checkpoint_response,
+                    ))
+
+                    decision = checkpoint_response.decision if checkpoint_response else CheckpointDecision.APPROVE
+                    if decision == CheckpointDecision.STOP:
+                        stop = True
+                        break
+                    elif decision == CheckpointDecision.REVISE:
+                        self.agent.state.feedback = checkpoint_response.feedback
+                        attempt_numbers[name] += 1
+                        invalidate({name})
+                        await self._drop_progress([name])
+                    elif decision == CheckpointDecision.GO_BACK and checkpoint_response.go_back_to in steps:
+                        target = checkpoint_response.go_back_to
+                        # Only the target and what runs after it are redone; sibling branches are kept
+                        stale = {target, name} | {
+                            other for other in steps if target in ancestors[other]
+                        }
+                        for other in stale:
+                            attempt_numbers[other] = 1
+                        invalidate(stale)
+                        await self._drop_progress(sorted(stale, key=order.get))
+                    else:  # approve, or go_back to an unknown step
+                        done.add(name)
+                        commit_history()
+                        await self._save_progress(name, result, 0, new_messages)
+
+                await self.agent.record_state(self.context.session_id)
+                if stop:
+                    break
+        finally:
+            for task in running:
+                task.cancel()
+
+        return {step.name: results[step.name] for step in workflow.steps if step.name in results}
+
+    async def _execute_dag_step(
+        self,
+        step,
+        history: list[dict[str, str]],
+        checkpoint_lock: asyncio.Lock,
+    ) -> tuple[ToolResult, list[dict[str, str]], CheckpointResponse | None]:
+        """Run one step against its own history. Returns (result, messages it added, checkpoint response)."""
+        start = len(history)
+        result = await self._execute_step(step, history)
+        self._emit(StreamChunk(type="tool_result", tool_result=result, step=step.name))
+
+        if result.success and result.data:
+            history.append({
+                "role": "user",
+                "content": f"[Step: {step.name}] Result:\n{self._render_result(step, result)}",
+                MESSAGE_SOURCE: "step",
+            })
+
+        checkpoint_response = None
+        if step.checkpoint and self.checkpoint_handler:
+            async with checkpoint_lock:
+                checkpoint_response = await self.checkpoint_handler.handle(step.name, result)
+
+        return result, history[start:], checkpoint_response
+
+    def _render_result(self, step: WorkflowStep, result: ToolResult) -> str:
+        text, handle = self.agent.render_tool_data(step.tool_name or "llm_response", result.data)
+        if handle:
+            result.metadata["result_handle"] = handle
+        return text
+
+    def _resolve_dependencies(self, workflow: WorkflowDefinition) -> dict[str, set[str]]:
+        """Map each step to the steps it waits for. Raises ValueError on unknown names or cycles."""
+        names = [step.name for step in workflow.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Workflow '{workflow.name}' has duplicate step names")
+
+        dependencies: dict[str, set[str]] = {}
+        for i, step in enumerate(workflow.steps):
+            if step.depends_on is None:
+                dependencies[step.name] = {names[i - 1]} if i > 0 else set()
+            else:
+                unknown = set(step.depends_on) - set(names)
+                if unknown:
+                    raise ValueError(f"Step '{step.name}' depends on unknown steps: {sorted(unknown)}")
+                dependencies[step.name] = set(step.depends_on)
+
+        # Kahn's algorithm, just to detect cycles
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Workflow '{workflow.name}' has a dependency cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return dependencies
+
+    def _ancestors(self, name: str, dependencies: dict[str, set[str]]) -> set[str]:
+        seen: set[str] = set()
+        stack = list(dependencies[name])
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(dependencies[dep])
+        return seen
+
+    async def run_stream(self, workflow: WorkflowDefinition) -> AsyncIterator[StreamChunk]:
+        """Run the workflow, yielding LLM deltas and a "tool_result" chunk per finished step."""
+        self._stream_queue = asyncio.Queue()
+        task = asyncio.create_task(self._run_into_queue(workflow, self._stream_queue))
+        try:
+            while True:
+                chunk = await self._stream_queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+            await task  # re-raise anything the run failed with
+        finally:
+            if not task.done():
+                task.cancel()
+            self._stream_queue = None
+
+    async def _run_into_queue(self, workflow: WorkflowDefinition, queue: asyncio.Queue) -> None:
+        try:
+            await self.run(workflow)
+        finally:
+            queue.put_nowait(None)
+
+    def _emit(self, chunk: StreamChunk) -> None:
+        if self._stream_queue is not None:
+            self._stream_queue.put_nowait(chunk)
+
+    async def _call_llm(self, messages: list[dict], step_name: str, **kwargs) -> LLMResponse:
+        """Provider call that streams deltas to run_stream() consumers when there are any."""
+        if self._stream_queue is None:
+            return await self.agent.provider.call(messages=messages, **kwargs)
+
+        response = None
+        async for chunk in self.agent.provider.stream(messages=messages, **kwargs):
+            chunk.step = step_name
+            if chunk.type == "done":
+                response = chunk.response
+            self._emit(chunk)
+        return response if response is not None else incomplete_stream_response()
+
     def _extract_json(self, text: str) -> dict | None:
         """Extract JSON from LLM response, handling markdown code blocks."""
         if not text:
@@ -94,22 +404,27 @@ class WorkflowExecutor:
         except json.JSONDecodeError:
             return None
 
-    async def _execute_llm_step(self, step) -> ToolResult:
+    async def _execute_llm_step(self, step, history: list[dict[str, str]] | None = None) -> ToolResult:
         """Step where LLM thinks and responds, no tool."""
-        messages = self.agent.build_messages()
+        await self.agent.prepare_context(history)
+        messages = self.agent.build_messages(history)
         messages.append({
             "role": "user",
             "content": step.prompt,
         })
         
-        response = await self.agent.provider.call(
-            messages=messages,
+        response = await self._call_llm(
+            messages,
+            step.name,
             tools=None,
             response_format="json",  # Ask for JSON
         )
         
         if response.content:
-            self.agent.add_assistant_message(response.content)
+            if history is None:
+                self.agent.add_assistant_message(response.content)
+            else:
+                history.append({"role": "assistant", "content": response.content})
 
         parsed = self._extract_json(response.content)
 
@@ -122,10 +437,10 @@ class WorkflowExecutor:
             data=parsed or {"response": response.content},
         )
 
-    async def _execute_step(self, step) -> ToolResult:
-
+    async def _execute_step(self, step, history: list[dict[str, str]] | None = None) -> ToolResult:
+        """Run one step. `history` replaces the agent's chat history (DAG mode) when given."""
         if step.tool_name is None:
-            return await self._execute_llm_step(step)
+            return await self._execute_llm_step(step, history)
         
         tool = self.agent.get_tool(step.tool_name)
         
@@ -141,7 +456,7 @@ class WorkflowExecutor:
         if step.input_override:
             tool_input = step.input_override
         else:
-            tool_input = await self._get_input_from_llm(step, tool)
+            tool_input = await self._get_input_from_llm(step, tool, history)
         
         # Validate
         try:
@@ -156,7 +471,15 @@ class WorkflowExecutor:
         
         # Execute
         try:
-            return await tool.execute(validated_input, self.context)
+            async with tool.limit(self.context.session_id):
+                return await asyncio.wait_for(self.tool_pool.execute(tool, validated_input, self.context), tool.timeout)
+        except asyncio.TimeoutError:
+            return ToolResult(
+                success=False,
+                tool_name=step.tool_name,
+                input=tool_input,
+                error=f"Execution error: timed out after {tool.timeout}s",
+            )
         except Exception as e:
             return ToolResult(
                 success=False,
@@ -165,16 +488,18 @@ class WorkflowExecutor:
                 error=f"Execution error: {e}",
             )
 
-    async def _get_input_from_llm(self, step, tool) -> dict:
+    async def _get_input_from_llm(self, step, tool, history: list[dict[str, str]] | None = None) -> dict:
         """Ask LLM to provide tool input based on step prompt."""
-        messages = self.agent.build_messages()
+        await self.agent.prepare_context(history)
+        messages = self.agent.build_messages(history)
         messages.append({
             "role": "user",
             "content": f"{step.prompt}\n\nUse the {tool.name} tool to complete this.",
         })
         
-        response = await self.agent.provider.call(
-            messages=messages,
+        response = await self._call_llm(
+            messages,
+            step.name,
             tools=[tool],
         )
         
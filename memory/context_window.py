@@ -0,0 +1,203 @@
+# memory/context_window.py
+
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from providers.base_provider import BaseLLMProvider
+
+# Context window sizes by model-name prefix; the longest matching prefix wins.
+MODEL_CONTEXT_WINDOWS: dict[str, int] = {
+    "claude": 200_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_000_000,
+    "gpt-4": 8_192,
+    "gpt-3.5": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "google/gemma-3": 128_000,
+    "google/gemini": 1_000_000,
+    "mistralai/devstral": 128_000,
+    "mistralai": 32_000,
+    "llama3": 8_192,
+    "llama3.1": 128_000,
+}
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+
+def context_window_for(model: str) -> int:
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+class TokenEstimator:
+    """Cheap local token count (~4 chars per token): O(1) per message, nothing to cache."""
+
+    TRUNCATED = " …[truncated]"
+
+    def __init__(self, chars_per_token: float = 4.0, per_message_overhead: int = 4):
+        self.chars_per_token = chars_per_token
+        self.per_message_overhead = per_message_overhead
+
+    def count_text(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate_message(self, message: dict[str, str], budget: int) -> dict[str, str]:
+        """Copy of message with its content cut (and marked) to fit budget tokens, if it can."""
+        room = int((budget - self.per_message_overhead) * self.chars_per_token) - len(self.TRUNCATED)
+        return {**message, "content": (message.get("content") or "")[: max(0, room)] + self.TRUNCATED}
+
+    def count_message(self, message: dict[str, str]) -> int:
+        return self.count_text(message.get("content") or "") + self.per_message_overhead
+
+    def count_messages(self, messages: list[dict[str, str]]) -> int:
+        return sum(self.count_message(m) for m in messages)
+
+
+class BaseContextPolicy(ABC):
+    """Decides which part of the chat history is sent to the LLM.
+
+    The agent's `chat_history` is never modified; policies only shape the request.
+    """
+
+    def __init__(self, max_context_tokens: int | None = None, estimator: TokenEstimator | None = None):
+        self.max_context_tokens = max_context_tokens  # None = from the model's context window
+        self.estimator = estimator or TokenEstimator()
+
+    def budget(self, model: str, max_output_tokens: int, system_prompt: str) -> int:
+        """Tokens left for history after the system prompt and the reserved completion."""
+        window = self.max_context_tokens or context_window_for(model)
+        return max(0, window - max_output_tokens - self.estimator.count_text(system_prompt))
+
+    async def prepare(self, history: list[dict[str, str]], budget: int) -> None:
+        """Async work before select() (e.g. summarizing). Default: nothing."""
+        pass
+
+    @abstractmethod
+    def select(self, history: list[dict[str, str]], budget: int) -> list[dict[str, str]]:
+        pass
+
+    def _fit_recent(self, history: list[dict[str, str]], budget: int) -> list[dict[str, str]]:
+        """Longest suffix of history that fits in budget. Only touches messages that fit.
+
+        The latest message is always kept: if it alone is over budget, it is truncated.
+        """
+        used = 0
+        start = len(history)
+        while start > 0:
+            cost = self.estimator.count_message(history[start - 1])
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 1
+        if start == len(history) and history:
+            return [self.estimator.truncate_message(history[-1], budget)]
+        return history[start:]
+
+
+class KeepLastNPolicy(BaseContextPolicy):
+    """The last N messages, trimmed further if they don't fit the budget."""
+
+    def __init__(self, n: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+
+    def select(self, history: list[dict[str, str]], budget: int) -> list[dict[str, str]]:
+        return self._fit_recent(history[-self.n:] if self.n else [], budget)
+
+
+class SlidingWindowPolicy(BaseContextPolicy):
+    """The first `pinned` messages (usually the task) plus as many recent ones as fit."""
+
+    def __init__(self, pinned: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.pinned = pinned
+
+    def select(self, history: list[dict[str, str]], budget: int) -> list[dict[str, str]]:
+        pinned = history[:self.pinned]
+        remaining = budget - self.estimator.count_messages(pinned)
+        return pinned + self._fit_recent(history[self.pinned:], remaining)
+
+
+class SummarizeOldestPolicy(SlidingWindowPolicy):
+    """Sliding window where messages that fall out of it are replaced by a running summary.
+
+    Summaries come from a (cheap) provider in prepare(), in batches of at least
+    `min_batch` messages, and are folded into the previous summary.
+    """
+
+    SUMMARY_PROMPT = (
+        "Summarize the conversation below for an assistant that will continue it. "
+        "Keep facts, decisions, tool results and open tasks. Be concise."
+    )
+
+    def __init__(
+        self,
+        provider: BaseLLMProvider,
+        pinned: int = 1,
+        min_batch: int = 8,
+        summary_budget_ratio: float = 0.2,
+        **kwargs,
+    ):
+        super().__init__(pinned=pinned, **kwargs)
+        self.provider = provider
+        self.min_batch = min_batch
+        self.summary_budget_ratio = summary_budget_ratio
+        # (messages covered, _prefix_keys() of the covered prefix) -> summary text
+        self._summaries: OrderedDict[tuple[int, int], str] = OrderedDict()
+
+    async def prepare(self, history: list[dict[str, str]], budget: int) -> None:
+        body = history[self.pinned:]
+        covered, summary = self._latest_summary(body)
+        window_budget = self._window_budget(history, budget)
+        recent = self._fit_recent(body[covered:], window_budget)
+        dropped = body[covered:len(body) - len(recent)]
+        if len(dropped) < self.min_batch:
+            return
+
+        transcript = "\n".join(f"{m['role']}: {m.get('content') or ''}" for m in dropped)
+        if summary:
+            transcript = f"Earlier summary:\n{summary}\n\nNew messages:\n{transcript}"
+        response = await self.provider.call(
+            messages=[
+                {"role": "system", "content": self.SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+        )
+        if response.content:
+            new_covered = covered + len(dropped)
+            self._summaries[(new_covered, self._prefix_keys(body, new_covered)[-1])] = response.content
+            if len(self._summaries) > 256:
+                self._summaries.popitem(last=False)
+
+    def select(self, history: list[dict[str, str]], budget: int) -> list[dict[str, str]]:
+        pinned = history[:self.pinned]
+        body = history[self.pinned:]
+        covered, summary = self._latest_summary(body)
+        if not summary:
+            return super().select(history, budget)
+
+        summary_message = {"role": "user", "content": f"[Summary of earlier conversation]\n{summary}"}
+        remaining = budget - self.estimator.count_messages(pinned) - self.estimator.count_message(summary_message)
+        return pinned + [summary_message] + self._fit_recent(body[covered:], remaining)
+
+    def _window_budget(self, history: list[dict[str, str]], budget: int) -> int:
+        pinned_cost = self.estimator.count_messages(history[:self.pinned])
+        return int((budget - pinned_cost) * (1 - self.summary_budget_ratio))
+
+    def _latest_summary(self, body: list[dict[str, str]]) -> tuple[int, str | None]:
+        """Summary covering the longest prefix of this history, if any. One pass over the history."""
+        candidates = sorted((entry for entry in self._summaries if entry[0] <= len(body)), reverse=True)
+        if not candidates:
+            return 0, None
+        keys = self._prefix_keys(body, candidates[0][0])
+        for covered, key in candidates:
+            if keys[covered] == key:
+                return covered, self._summaries[(covered, key)]
+        return 0, None
+
+    def _prefix_keys(self, body: list[dict[str, str]], count: int) -> list[int]:
+        """keys[i] identifies body[:i]; each is built from the previous one in O(1)."""
+        keys = [0]
+        for message in body[:count]:
+            keys.append(hash((keys[-1], message["role"], message.get("content") or "")))
+        return keys
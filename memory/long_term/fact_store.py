@@ -0,0 +1,211 @@
+# memory/long_term/fact_store.py
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    id INTEGER PRIMARY KEY,
+    entity TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    value TEXT NOT NULL,
+    source TEXT,
+    timestamp REAL NOT NULL,
+    expires_at REAL,
+    UNIQUE (entity, attribute)
+);
+CREATE INDEX IF NOT EXISTS facts_expires_at ON facts (expires_at) WHERE expires_at IS NOT NULL;
+CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
+    entity, attribute, value,
+    content='facts', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS facts_ai AFTER INSERT ON facts BEGIN
+    INSERT INTO facts_fts (rowid, entity, attribute, value) VALUES (new.id, new.entity, new.attribute, new.value);
+END;
+CREATE TRIGGER IF NOT EXISTS facts_ad AFTER DELETE ON facts BEGIN
+    INSERT INTO facts_fts (facts_fts, rowid, entity, attribute, value)
+    VALUES ('delete', old.id, old.entity, old.attribute, old.value);
+END;
+CREATE TRIGGER IF NOT EXISTS facts_au AFTER UPDATE OF entity, attribute, value ON facts BEGIN
+    INSERT INTO facts_fts (facts_fts, rowid, entity, attribute, value)
+    VALUES ('delete', old.id, old.entity, old.attribute, old.value);
+    INSERT INTO facts_fts (rowid, entity, attribute, value) VALUES (new.id, new.entity, new.attribute, new.value);
+END;
+"""
+
+UPSERT = """
+INSERT INTO facts (entity, attribute, value, source, timestamp, expires_at) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (entity, attribute) DO UPDATE SET
+    value = excluded.value,
+    source = excluded.source,
+    timestamp = excluded.timestamp,
+    expires_at = excluded.expires_at
+"""
+
+# Dropped from search queries: they match most facts and add nothing to the ranking
+STOPWORDS = frozenset(
+    "a an and are as at be but by do does for from has have how i in is it its me my of on or "
+    "our so than that the their them then there these they this to was we were what when where "
+    "which who why will with you your".split()
+)
+
+COLUMNS = "f.id, f.entity, f.attribute, f.value, f.source, f.timestamp, f.expires_at"
+
+
+class Fact(BaseModel):
+    entity: str
+    attribute: str
+    value: str
+    source: str | None = None
+    timestamp: datetime = Field(default_factory=datetime.now)
+    expires_at: datetime | None = None
+    id: int | None = None  # set when read from the store
+    score: float | None = None  # BM25 relevance from search(); higher is better
+
+
+class FactStore:
+    """Entity/attribute/value facts in SQLite with an FTS5 index for BM25 keyword recall.
+
+    A fact is identified by (entity, attribute): adding it again updates the value,
+    source and timestamp in place, so re-recording a known fact never duplicates it.
+    Facts with a TTL stop matching once expired and are deleted by `purge_expired()`.
+
+    Calls run in a worker thread over one connection (WAL mode), one at a time.
+    """
+
+    def __init__(self, path: str = ":memory:", default_ttl: float | None = None):
+        self.path = path
+        self.default_ttl = default_ttl  # seconds; None = facts never expire
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    async def add(self, fact: Fact, ttl: float | None = None) -> None:
+        await self.add_many([fact], ttl)
+
+    async def add_many(self, facts: Iterable[Fact], ttl: float | None = None) -> int:
+        """Bulk upsert in one transaction. Returns the number of facts written."""
+        rows = [self._row(fact, ttl) for fact in facts]
+        await self._run(self._write_many, UPSERT, rows)
+        return len(rows)
+
+    async def search(self, query: str, k: int = 10, entity: str | None = None) -> list[Fact]:
+        """BM25-ranked keyword search over entity, attribute and value.
+
+        `query` is plain text; its words are matched with OR (prefix match on the last
+        one), so natural-language turns can be passed as they are.
+        """
+        match = _match_expression(query)
+        if not match:
+            return []
+        sql = (
+            f"SELECT {COLUMNS}, bm25(facts_fts, 2.0, 1.0, 1.0) AS rank "
+            "FROM facts_fts JOIN facts f ON f.id = facts_fts.rowid "
+            "WHERE facts_fts MATCH ? AND (f.expires_at IS NULL OR f.expires_at > ?)"
+        )
+        params: list = [match, time.time()]
+        if entity is not None:
+            sql += " AND f.entity = ?"
+            params.append(entity)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(k)
+        rows = await self._run(self._read, sql, params)
+        # bm25() is lower-is-better; flip it so callers sort the usual way
+        return [self._fact(row[:7], score=-row[7]) for row in rows]
+
+    async def get(self, entity: str, attribute: str | None = None) -> list[Fact]:
+        """Exact lookup: every live fact about `entity`, or just one attribute."""
+        sql = f"SELECT {COLUMNS} FROM facts f WHERE f.entity = ? AND (f.expires_at IS NULL OR f.expires_at > ?)"
+        params: list = [entity, time.time()]
+        if attribute is not None:
+            sql += " AND f.attribute = ?"
+            params.append(attribute)
+        rows = await self._run(self._read, sql + " ORDER BY f.attribute", params)
+        return [self._fact(row) for row in rows]
+
+    async def delete(self, entity: str, attribute: str | None = None) -> int:
+        if attribute is None:
+            return await self._run(self._write, "DELETE FROM facts WHERE entity = ?", (entity,))
+        return await self._run(
+            self._write, "DELETE FROM facts WHERE entity = ? AND attribute = ?", (entity, attribute)
+        )
+
+    async def purge_expired(self) -> int:
+        return await self._run(
+            self._write,
+            "DELETE FROM facts WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+
+    async def count(self) -> int:
+        rows = await self._run(self._read, "SELECT count(*) FROM facts", ())
+        return rows[0][0]
+
+    async def optimize(self) -> None:
+        """Merge FTS index segments; worth running after large bulk loads."""
+        await self._run(self._write, "INSERT INTO facts_fts (facts_fts) VALUES ('optimize')", ())
+
+    def close(self) -> None:
+        self._db.close()
+
+    # Internals
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    def _read(self, sql: str, params) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params) -> int:
+        with self._lock:
+            return self._db.execute(sql, params).rowcount
+
+    def _write_many(self, sql: str, rows: list[tuple]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(sql, rows)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _row(self, fact: Fact, ttl: float | None) -> tuple:
+        ttl = ttl if ttl is not None else self.default_ttl
+        if fact.expires_at is not None:
+            expires_at = fact.expires_at.timestamp()
+        else:
+            expires_at = time.time() + ttl if ttl is not None else None
+        return (fact.entity, fact.attribute, fact.value, fact.source, fact.timestamp.timestamp(), expires_at)
+
+    def _fact(self, row: tuple, score: float | None = None) -> Fact:
+        id, entity, attribute, value, source, timestamp, expires_at = row
+        return Fact(
+            id=id,
+            entity=entity,
+            attribute=attribute,
+            value=value,
+            source=source,
+            timestamp=datetime.fromtimestamp(timestamp),
+            expires_at=datetime.fromtimestamp(expires_at) if expires_at is not None else None,
+            score=score,
+        )
+
+
+def _match_expression(text: str) -> str:
+    """Plain text to an FTS5 query: quoted non-stopwords joined with OR, last one as a prefix."""
+    words = [word for word in re.findall(r"\w+", text.lower()) if word not in STOPWORDS]
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*']
+    return " OR ".join(terms)
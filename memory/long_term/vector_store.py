@@ -0,0 +1,386 @@
+# memory/long_term/vector_store.py
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+from pydantic import BaseModel, Field
+from typing import Any, BinaryIO, Iterable, Iterator, Literal
+
+FORMAT_VERSION = 1
+
+
+class VectorSearchResult(BaseModel):
+    id: str
+    score: float
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class _Segment:
+    """A block of rows: float32 vectors, or int8 vectors with a per-row float32 scale."""
+
+    __slots__ = ("vectors", "scales", "length")
+
+    def __init__(self, vectors: np.ndarray, scales: np.ndarray | None, length: int):
+        self.vectors = vectors
+        self.scales = scales
+        self.length = length  # rows in use; growable segments are over-allocated
+
+
+class VectorStore:
+    """In-process vector index with exact top-k search in NumPy.
+
+    Rows are scored block by block (`block_rows` at a time) with one matrix product per
+    block and `argpartition` for the top-k, so memory stays bounded and nothing is fully
+    sorted. With `quantize=True` vectors are stored as int8 with a per-row scale (4x
+    smaller, scores are approximate).
+
+    Deletes and upserts leave tombstones that search skips; `save(compact=True)` drops
+    them. `VectorStore.open()` memory-maps a saved index, so even millions of vectors
+    open instantly; new rows go to an in-memory segment after the mapped one.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        metric: Literal["cosine", "ip"] = "cosine",
+        quantize: bool = False,
+        block_rows: int = 65536,
+    ):
+        self.dim = dim
+        self.metric = metric
+        self.quantize = quantize
+        self.block_rows = block_rows
+        self._base: _Segment | None = None  # memory-mapped rows from open()
+        self._base_ids: np.ndarray | None = None
+        self._base_meta: tuple[np.ndarray, np.ndarray] | None = None  # (jsonl bytes, row offsets)
+        self._tail = self._empty_segment(1024)
+        self._tail_ids: list[str] = []
+        self._tail_meta: list[dict[str, Any]] = []
+        self._deleted = np.zeros(1024, dtype=bool)
+        self._live = 0
+        self._rows_by_id: dict[str, int] | None = None  # built on first need
+        self._filter_index: dict[str, dict[Any, list[int]]] = {}
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def rows(self) -> int:
+        """Rows including tombstones."""
+        return (self._base.length if self._base else 0) + self._tail.length
+
+    # Writes
+
+    def add(
+        self,
+        ids: Iterable[str],
+        vectors: np.ndarray,
+        metadata: Iterable[dict[str, Any]] | None = None,
+    ) -> None:
+        """Insert or replace vectors. An existing id is tombstoned and re-added."""
+        ids = list(ids)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        metadata = list(metadata) if metadata is not None else [{} for _ in ids]
+        if len(metadata) != len(ids):
+            raise ValueError("ids, vectors and metadata must have the same length")
+
+        rows_by_id = self._index()
+        self.delete(id for id in ids if id in rows_by_id)
+
+        if self.metric == "cosine":
+            vectors = _normalize(vectors)
+        start = self.rows
+        self._ensure_capacity(self._tail.length + len(ids))
+        stored, scales = self._encode(vectors)
+        end = self._tail.length + len(ids)
+        self._tail.vectors[self._tail.length:end] = stored
+        if scales is not None:
+            self._tail.scales[self._tail.length:end] = scales
+        self._tail.length = end
+
+        self._tail_ids.extend(ids)
+        self._tail_meta.extend(metadata)
+        repeated = 0
+        for offset, (id, meta) in enumerate(zip(ids, metadata)):
+            row = start + offset
+            earlier = rows_by_id.get(id)
+            if earlier is not None:  # same id twice in this batch: the last one wins
+                self._deleted[earlier] = True
+                repeated += 1
+            rows_by_id[id] = row
+            for key, values in self._filter_index.items():
+                if key in meta:
+                    values.setdefault(meta[key], []).append(row)
+        self._live += len(ids) - repeated
+
+    def delete(self, ids: Iterable[str]) -> int:
+        rows_by_id = self._index()
+        deleted = 0
+        for id in ids:
+            row = rows_by_id.pop(id, None)
+            if row is not None:
+                self._deleted[row] = True
+                deleted += 1
+        self._live -= deleted
+        return deleted
+
+    # Reads
+
+    def get(self, id: str) -> tuple[np.ndarray, dict[str, Any]] | None:
+        row = self._index().get(id)
+        if row is None:
+            return None
+        segment, index = self._locate(row)
+        vector = segment.vectors[index].astype(np.float32)
+        if segment.scales is not None:
+            vector *= segment.scales[index]
+        return vector, self._metadata(row)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        where: dict[str, Any] | None = None,
+    ) -> list[VectorSearchResult]:
+        return self.search_batch(np.asarray(query, dtype=np.float32).reshape(1, self.dim), k, where)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        where: dict[str, Any] | None = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Top-k for each query row. `where` keeps rows whose metadata equals every given value."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if self.metric == "cosine":
+            queries = _normalize(queries)
+        rows = self._filter_rows(where) if where else None
+        scores, found = self._top_k(queries, k, rows)
+        return [
+            [
+                VectorSearchResult(id=self._id(row), score=float(score), metadata=self._metadata(row))
+                for score, row in zip(query_scores, query_rows)
+                if row >= 0
+            ]
+            for query_scores, query_rows in zip(scores, found)
+        ]
+
+    def _top_k(self, queries: np.ndarray, k: int, rows: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+        """(scores, rows) of shape (queries, k), best first; missing hits have row -1."""
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for block_rows, vectors, scales in self._blocks(rows):
+            scores = queries @ vectors.T
+            if scales is not None:
+                scores *= scales
+            scores[:, self._deleted[block_rows]] = -np.inf
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                block_rows = block_rows[top]
+            else:
+                block_rows = np.broadcast_to(block_rows, scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, block_rows], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_rows[~np.isfinite(best_scores)] = -1
+        return best_scores, best_rows
+
+    def _blocks(self, rows: np.ndarray | None):
+        """Yield (global row numbers, float32 vectors, scales or None) in bounded blocks."""
+        offset = 0
+        for segment in (self._base, self._tail):
+            if segment is None or segment.length == 0:
+                continue
+            if rows is None:
+                for start in range(0, segment.length, self.block_rows):
+                    end = min(start + self.block_rows, segment.length)
+                    yield (
+                        np.arange(offset + start, offset + end),
+                        np.asarray(segment.vectors[start:end], dtype=np.float32),
+                        segment.scales[start:end] if segment.scales is not None else None,
+                    )
+            else:
+                local = rows[(rows >= offset) & (rows < offset + segment.length)] - offset
+                for start in range(0, len(local), self.block_rows):
+                    chunk = local[start:start + self.block_rows]
+                    yield (
+                        chunk + offset,
+                        np.asarray(segment.vectors[chunk], dtype=np.float32),
+                        segment.scales[chunk] if segment.scales is not None else None,
+                    )
+            offset += segment.length
+
+    def _filter_rows(self, where: dict[str, Any]) -> np.ndarray:
+        matches: set[int] | None = None
+        for key, value in where.items():
+            if key not in self._filter_index:
+                index: dict[Any, list[int]] = {}
+                for row in range(self.rows):
+                    meta = self._metadata(row)
+                    if key in meta:
+                        index.setdefault(meta[key], []).append(row)
+                self._filter_index[key] = index
+            rows = set(self._filter_index[key].get(value, ()))
+            matches = rows if matches is None else matches & rows
+        return np.array(sorted(matches or ()), dtype=np.int64)
+
+    # Persistence
+
+    def save(self, path: str, compact: bool = True) -> None:
+        """Write the index to a directory. With compact, tombstoned rows are dropped."""
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        keep = np.flatnonzero(~self._deleted[:self.rows]) if compact else np.arange(self.rows)
+
+        vectors = np.empty((len(keep), self.dim), dtype=np.int8 if self.quantize else np.float32)
+        scales = np.empty(len(keep), dtype=np.float32) if self.quantize else None
+        written = 0
+        for start in range(0, len(keep), self.block_rows):
+            for segment, local in self._by_segment(keep[start:start + self.block_rows]):
+                vectors[written:written + len(local)] = segment.vectors[local]
+                if scales is not None:
+                    scales[written:written + len(local)] = segment.scales[local]
+                written += len(local)
+
+        # Every file goes to a temporary name first: the index may have been opened from
+        # this directory, and truncating a memory-mapped file under it is a SIGBUS
+        _write_array(directory / "vectors.npy", vectors)
+        if scales is not None:
+            _write_array(directory / "scales.npy", scales)
+        _write_array(directory / "deleted.npy", self._deleted[keep])
+        _write_array(directory / "ids.npy", np.array([self._id(row) for row in keep], dtype=str))
+
+        offsets = np.zeros(len(keep) + 1, dtype=np.int64)
+        with _replacing(directory / "metadata.jsonl") as f:
+            for i, row in enumerate(keep):
+                line = json.dumps(self._metadata(row), separators=(",", ":")).encode() + b"\n"
+                f.write(line)
+                offsets[i + 1] = offsets[i] + len(line)
+        _write_array(directory / "metadata_offsets.npy", offsets)
+
+        with _replacing(directory / "index.json") as f:
+            f.write(json.dumps({
+                "version": FORMAT_VERSION,
+                "dim": self.dim,
+                "metric": self.metric,
+                "quantize": self.quantize,
+                "rows": int(len(keep)),
+            }).encode())
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True, block_rows: int = 65536) -> "VectorStore":
+        directory = Path(path)
+        info = json.loads((directory / "index.json").read_text())
+        if info["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format {info['version']}")
+        store = cls(info["dim"], info["metric"], info["quantize"], block_rows)
+        mode = "r" if mmap else None
+
+        vectors = np.load(directory / "vectors.npy", mmap_mode=mode)
+        scales = np.load(directory / "scales.npy", mmap_mode=mode) if info["quantize"] else None
+        store._base = _Segment(vectors, scales, len(vectors))
+        store._base_ids = np.load(directory / "ids.npy", mmap_mode=mode)
+        store._base_meta = (
+            np.memmap(directory / "metadata.jsonl", dtype=np.uint8, mode="r")
+            if (directory / "metadata.jsonl").stat().st_size else np.zeros(0, dtype=np.uint8),
+            np.load(directory / "metadata_offsets.npy", mmap_mode=mode),
+        )
+        deleted = np.load(directory / "deleted.npy")
+        store._deleted = np.zeros(max(1024, len(vectors) * 2), dtype=bool)
+        store._deleted[:len(vectors)] = deleted
+        store._live = int(len(vectors) - deleted.sum())
+        return store
+
+    # Internals
+
+    def _index(self) -> dict[str, int]:
+        if self._rows_by_id is None:
+            self._rows_by_id = {
+                self._id(row): row for row in range(self.rows) if not self._deleted[row]
+            }
+        return self._rows_by_id
+
+    def _id(self, row: int) -> str:
+        base = self._base.length if self._base else 0
+        return str(self._base_ids[row]) if row < base else self._tail_ids[row - base]
+
+    def _metadata(self, row: int) -> dict[str, Any]:
+        base = self._base.length if self._base else 0
+        if row >= base:
+            return self._tail_meta[row - base]
+        blob, offsets = self._base_meta
+        return json.loads(blob[offsets[row]:offsets[row + 1]].tobytes())
+
+    def _locate(self, row: int) -> tuple[_Segment, int]:
+        base = self._base.length if self._base else 0
+        return (self._base, row) if row < base else (self._tail, row - base)
+
+    def _by_segment(self, rows: np.ndarray):
+        base = self._base.length if self._base else 0
+        in_base = rows < base
+        if in_base.any():
+            yield self._base, rows[in_base]
+        if (~in_base).any():
+            yield self._tail, rows[~in_base] - base
+
+    def _encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if not self.quantize:
+            return vectors, None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def _empty_segment(self, capacity: int) -> _Segment:
+        dtype = np.int8 if self.quantize else np.float32
+        scales = np.empty(capacity, dtype=np.float32) if self.quantize else None
+        return _Segment(np.empty((capacity, self.dim), dtype=dtype), scales, 0)
+
+    def _ensure_capacity(self, tail_rows: int) -> None:
+        tail = self._tail
+        if tail_rows > len(tail.vectors):
+            grown = self._empty_segment(max(tail_rows, len(tail.vectors) * 2))
+            grown.vectors[:tail.length] = tail.vectors[:tail.length]
+            if tail.scales is not None:
+                grown.scales[:tail.length] = tail.scales[:tail.length]
+            grown.length = tail.length
+            self._tail = grown
+        total = (self._base.length if self._base else 0) + tail_rows
+        if total > len(self._deleted):
+            deleted = np.zeros(max(total, len(self._deleted) * 2), dtype=bool)
+            deleted[:len(self._deleted)] = self._deleted
+            self._deleted = deleted
+
+
+@contextmanager
+def _replacing(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temporary file next to `path`, then rename it over `path`."""
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporary, "wb") as f:
+            yield f
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def _write_array(path: Path, array: np.ndarray) -> None:
+    with _replacing(path) as f:
+        np.save(f, array)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
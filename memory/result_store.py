@@ -0,0 +1,127 @@
+# memory/result_store.py
+
+import json
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+
+class ToolResultStore:
+    """Keeps large tool outputs out of the chat history.
+
+    The conversation carries a handle plus a short preview; the model reads more
+    through FetchToolResultTool. Entries are evicted least-recently-used.
+    """
+
+    def __init__(self, inline_limit: int = 2000, preview_chars: int = 800, max_entries: int = 500):
+        self.inline_limit = inline_limit  # results whose text is at most this long stay inline
+        self.preview_chars = preview_chars
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def put(self, data: Any, prefix: str = "res") -> str:
+        handle = f"{prefix}_{uuid.uuid4().hex[:8]}"
+        self._entries[handle] = data
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Any:
+        """Raises KeyError for unknown or evicted handles."""
+        data = self._entries[handle]
+        self._entries.move_to_end(handle)
+        return data
+
+    def has(self, handle: str) -> bool:
+        return handle in self._entries
+
+    def render(self, data: Any, tool_name: str = "res") -> tuple[str, str | None]:
+        """Text for the chat history and the handle, if the data was stored out of band."""
+        text = str(data)
+        if len(text) <= self.inline_limit:
+            return text, None
+
+        handle = self.put(data, prefix=tool_name)
+        return (
+            f"(stored as {handle}, {describe(data)}, {len(text)} chars; "
+            f"call fetch_tool_result to read more)\n{preview(data, self.preview_chars)}",
+            handle,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def describe(data: Any) -> str:
+    if isinstance(data, list):
+        return f"list of {len(data)} items"
+    if isinstance(data, dict):
+        parts = [
+            f"{key}: {len(value)} items" if isinstance(value, list) else str(key)
+            for key, value in list(data.items())[:8]
+        ]
+        return "dict with " + ", ".join(parts)
+    if isinstance(data, str):
+        return "text"
+    return type(data).__name__
+
+
+def preview(data: Any, max_chars: int = 800, max_items: int = 5) -> str:
+    """Size-bounded, type-aware preview: first items of lists, keys of dicts, head of text."""
+    if isinstance(data, str):
+        return _truncate(data, max_chars)
+
+    if isinstance(data, list):
+        shown = data[:max_items]
+        per_item = max(40, max_chars // max(1, len(shown)))
+        lines = [f"[{i}] {_compact(item, per_item)}" for i, item in enumerate(shown)]
+        if len(data) > len(shown):
+            lines.append(f"... {len(data) - len(shown)} more items")
+        return _truncate("\n".join(lines), max_chars)
+
+    if isinstance(data, dict):
+        items = list(data.items())
+        per_key = max(40, max_chars // max(1, min(len(items), max_items)))
+        lines = []
+        for key, value in items[:max_items]:
+            if isinstance(value, (list, dict)) and len(str(value)) > per_key:
+                nested = preview(value, per_key, max_items)
+                lines.append(f"{key}:\n" + "\n".join(f"  {line}" for line in nested.splitlines()))
+            else:
+                lines.append(f"{key}: {_compact(value, per_key)}")
+        if len(items) > max_items:
+            lines.append(f"... {len(items) - max_items} more keys")
+        return _truncate("\n".join(lines), max_chars)
+
+    return _truncate(str(data), max_chars)
+
+
+def slice_data(data: Any, path: str | None = None, offset: int = 0, limit: int | None = None) -> Any:
+    """Navigate a dotted path of keys / list indexes, then slice lists and text."""
+    if path:
+        for part in path.split("."):
+            if isinstance(data, list):
+                data = data[int(part)]
+            elif isinstance(data, dict):
+                data = data[part]
+            else:
+                raise KeyError(f"Cannot index {type(data).__name__} with '{part}'")
+
+    if isinstance(data, (list, str)):
+        end = offset + limit if limit is not None else None
+        return data[offset:end]
+    return data
+
+
+def _compact(value: Any, max_chars: int) -> str:
+    try:
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        text = str(value)
+    return _truncate(text, max_chars)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
@@ -0,0 +1,222 @@
+# memory/retrieval.py
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import zip_longest
+import numpy as np
+from pydantic import BaseModel, Field
+from core.schemas import MESSAGE_SOURCE
+from memory.context_window import TokenEstimator
+from memory.long_term.fact_store import FactStore
+from memory.long_term.vector_store import VectorStore
+from typing import Any, Awaitable, Callable, Sequence
+
+# Tool results in histories saved without MESSAGE_SOURCE (older rows, or stores that keep
+# only role and content)
+TOOL_RESULT_PREFIX = "[Tool: "
+
+
+class RetrievedItem(BaseModel):
+    text: str
+    score: float
+    source: str  # retriever name
+
+
+class RetrievalReport(BaseModel):
+    """What was retrieved for one user turn and what it cost."""
+    query: str
+    items: list[RetrievedItem] = Field(default_factory=list)  # the ones injected
+    text: str = ""  # the context block; empty when nothing was found
+    tokens: int = 0  # estimated tokens of the block
+    latency_ms: float = 0.0
+    skipped: dict[str, str] = Field(default_factory=dict)  # retriever -> "timeout" or error
+    cached: bool = False  # served from the per-turn cache
+
+
+class BaseRetriever(ABC):
+    name: str = "memory"
+
+    @abstractmethod
+    async def retrieve(self, query: str, k: int) -> list[RetrievedItem]:
+        """Best first."""
+        pass
+
+
+class FactRetriever(BaseRetriever):
+    """BM25 keyword recall from a FactStore, optionally limited to one entity."""
+
+    name = "facts"
+
+    def __init__(self, store: FactStore, entity: str | None = None):
+        self.store = store
+        self.entity = entity
+
+    async def retrieve(self, query: str, k: int) -> list[RetrievedItem]:
+        facts = await self.store.search(query, k=k, entity=self.entity)
+        return [
+            RetrievedItem(text=f"{fact.entity} / {fact.attribute}: {fact.value}", score=fact.score, source=self.name)
+            for fact in facts
+        ]
+
+
+class VectorRetriever(BaseRetriever):
+    """Nearest neighbours from a VectorStore whose rows keep their text in metadata."""
+
+    name = "memories"
+
+    def __init__(
+        self,
+        store: VectorStore,
+        embed: Callable[[str], Awaitable[Sequence[float]]],
+        text_key: str = "text",
+        where: dict[str, Any] | None = None,
+    ):
+        self.store = store
+        self.embed = embed
+        self.text_key = text_key
+        self.where = where
+
+    async def retrieve(self, query: str, k: int) -> list[RetrievedItem]:
+        vector = np.asarray(await self.embed(query), dtype=np.float32)
+        # In a thread, so a large index can't block the loop past the latency budget
+        hits = await asyncio.to_thread(self.store.search, vector, k, self.where)
+        return [
+            RetrievedItem(text=str(hit.metadata[self.text_key]), score=hit.score, source=self.name)
+            for hit in hits
+            if self.text_key in hit.metadata
+        ]
+
+
+class ContextRetrieval:
+    """Looks up memories for the latest user turn and renders them as a context block.
+
+    Retrievers run concurrently under one `timeout` (seconds); any that miss it are
+    cancelled and skipped, so a slow store costs at most the budget, never the turn.
+    Results are interleaved by rank, de-duplicated and cut to `max_tokens`.
+
+    The result is cached per (scope, turn) for `ttl` seconds: tool-loop iterations that
+    follow the same user message reuse it instead of querying again. `scope` keeps
+    sessions apart when several share this object, so identical turns in different
+    sessions never see each other's memories. A partial result (a retriever timed out
+    or failed) is only served to build_messages() for the current call; the next
+    prepare() retrieves again.
+    """
+
+    HEADER = "Relevant memory (retrieved automatically; may be incomplete or outdated):"
+
+    def __init__(
+        self,
+        retrievers: list[BaseRetriever],
+        k: int = 5,
+        timeout: float = 0.25,
+        max_tokens: int = 512,
+        estimator: TokenEstimator | None = None,
+        cache_size: int = 64,
+        ttl: float = 300.0,
+    ):
+        self.retrievers = retrievers
+        self.k = k
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        self.estimator = estimator or TokenEstimator()
+        self.cache_size = cache_size
+        self.ttl = ttl
+        # (scope, turn index, turn content) -> (report, retrieved at, monotonic seconds)
+        self._cache: OrderedDict[tuple[str, int, str], tuple[RetrievalReport, float]] = OrderedDict()
+
+    async def prepare(self, history: list[dict[str, str]], scope: str = "") -> RetrievalReport | None:
+        """Retrieve for the latest user turn (or reuse its cached result). None if there is no turn."""
+        key = _cache_key(history, scope)
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is not None:
+            report, retrieved_at = entry
+            if not report.skipped and time.monotonic() - retrieved_at < self.ttl:
+                self._cache.move_to_end(key)
+                return report.model_copy(update={"cached": True})
+
+        report = await self._retrieve(key[2])
+        self._cache[key] = (report, time.monotonic())
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return report
+
+    def cached(self, history: list[dict[str, str]], scope: str = "") -> RetrievalReport | None:
+        """Result of the last prepare() for this history's latest user turn, if any."""
+        key = _cache_key(history, scope)
+        entry = self._cache.get(key) if key is not None else None
+        return entry[0] if entry is not None else None
+
+    async def _retrieve(self, query: str) -> RetrievalReport:
+        if not self.retrievers:
+            return RetrievalReport(query=query)  # asyncio.wait() rejects an empty set
+        started = time.perf_counter()
+        tasks = {
+            asyncio.create_task(retriever.retrieve(query, self.k)): retriever
+            for retriever in self.retrievers
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+
+        skipped = {tasks[task].name: "timeout" for task in pending}
+        ranked = []
+        for task, retriever in tasks.items():  # retriever order, for a stable interleave
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                skipped[retriever.name] = f"error: {task.exception()}"
+            else:
+                ranked.append(task.result())
+
+        items, text, tokens = self._render(ranked)
+        return RetrievalReport(
+            query=query,
+            items=items,
+            text=text,
+            tokens=tokens,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            skipped=skipped,
+        )
+
+    def _render(self, ranked: list[list[RetrievedItem]]) -> tuple[list[RetrievedItem], str, int]:
+        """Interleave retrievers rank by rank and keep what fits in max_tokens."""
+        used = self.estimator.count_text(self.HEADER)
+        seen = set()
+        items, lines = [], []
+        for rank in zip_longest(*ranked):
+            for item in rank:
+                if item is None or item.text in seen:
+                    continue
+                line = f"- {item.text}"
+                cost = self.estimator.count_text(line)
+                if used + cost > self.max_tokens:
+                    continue
+                seen.add(item.text)
+                items.append(item)
+                lines.append(line)
+                used += cost
+        if not items:
+            return [], "", 0
+        return items, "\n".join([self.HEADER, *lines]), used
+
+
+def _cache_key(history: list[dict[str, str]], scope: str) -> tuple[str, int, str] | None:
+    turn = _latest_user_turn(history)
+    return (scope, *turn) if turn is not None else None
+
+
+def _latest_user_turn(history: list[dict[str, str]]) -> tuple[int, str] | None:
+    """(index, content) of the last user message that isn't a tool or workflow step result."""
+    for index in range(len(history) - 1, -1, -1):
+        message = history[index]
+        content = message.get("content") or ""
+        if message["role"] != "user" or not content or MESSAGE_SOURCE in message:
+            continue
+        if not content.startswith(TOOL_RESULT_PREFIX):
+            return index, content
+    return None
@@ -1,7 +1,7 @@
 # memory/state_store/base_store.py
 
 from abc import ABC, abstractmethod
-from core.schemas import AgentState
+from core.schemas import AgentState, StepProgress
 
 
 class BaseStateStore(ABC):
@@ -19,4 +19,25 @@ class BaseStateStore(ABC):
     
     @abstractmethod
     async def exists(self, session_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def list_keys(self, prefix: str = "") -> list[str]:
+        """Keys starting with prefix, sorted."""
+        pass
+
+    # Per-step workflow progress. Saved one step at a time so checkpointing a long
+    # session never rewrites the whole AgentState.
+
+    @abstractmethod
+    async def save_step_progress(self, session_id: str, progress: StepProgress) -> None:
+        pass
+
+    @abstractmethod
+    async def load_step_progress(self, session_id: str) -> dict[str, StepProgress]:
+        pass
+
+    @abstractmethod
+    async def delete_step_progress(self, session_id: str, steps: list[str] | None = None) -> None:
+        """Drop progress for the given steps, or for the whole session when steps is None."""
         pass
\ No newline at end of file
@@ -0,0 +1,229 @@
+# memory/state_store/codec.py
+
+import hashlib
+import zlib
+import orjson
+from collections.abc import MutableMapping
+from pydantic import BaseModel
+from core.schemas import (
+    AgentState,
+    Attempt,
+    LLMResponse,
+)
+from typing import Any, Literal
+
+MAGIC = b"AGS"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+# Positional codes for the most common values; anything else is stored as is
+ROLES = ["user", "assistant", "system", "tool"]
+FINISH_REASONS = ["stop", "tool_use", "length", "error"]
+
+RawPolicy = Literal["drop", "truncate", "side_store"]
+
+
+class StateCodec:
+    """Versioned compact binary encoding of AgentState, Attempt and LLMResponse.
+
+    Layout: b"AGS" + version byte + flags byte + body. The body is orjson of positional
+    arrays (no field names, role and finish_reason as small ints), zlib-compressed
+    when it is longer than `compress_threshold` bytes.
+
+    `LLMResponse.raw` holds the provider's own response object and is handled by
+    `raw_policy`: "drop" it, "truncate" it to a JSON string of `raw_max_chars`, or
+    "side_store" it in `raw_store` under a handle kept in its place. Handles are content
+    hashes, so saving the same response again reuses its entry instead of adding one.
+
+    decode_state() also accepts plain Pydantic JSON, so stores can switch formats
+    without migrating old rows.
+    """
+
+    def __init__(
+        self,
+        raw_policy: RawPolicy = "drop",
+        raw_max_chars: int = 2000,
+        raw_store: MutableMapping[str, Any] | None = None,
+        compress_threshold: int | None = 1024,  # None = never compress
+        compression_level: int = 6,
+    ):
+        if raw_policy == "side_store" and raw_store is None:
+            raise ValueError("raw_policy='side_store' needs a raw_store")
+        self.raw_policy = raw_policy
+        self.raw_max_chars = raw_max_chars
+        self.raw_store = raw_store
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+
+    # Public API
+
+    def encode_state(self, state: AgentState) -> bytes:
+        return self._frame([
+            state.current_step,
+            state.current_attempt,
+            state.outputs,
+            [self._attempt(a) for a in state.attempts],
+            [_message(m) for m in state.chat_history],
+            state.feedback,
+            state.snapshots,
+        ])
+
+    def decode_state(self, data: str | bytes) -> AgentState:
+        # Rows written before a codec was enabled are Pydantic JSON, as text or bytes
+        if isinstance(data, str) or not data.startswith(MAGIC):
+            return AgentState.model_validate_json(data)
+        current_step, current_attempt, outputs, attempts, chat, feedback, snapshots = self._unframe(data)
+        # One validation call over plain dicts is much faster than building nested models one by one
+        return AgentState.model_validate({
+            "current_step": current_step,
+            "current_attempt": current_attempt,
+            "outputs": outputs,
+            "attempts": [self._attempt_dict(a) for a in attempts],
+            "chat_history": [_from_message(m) for m in chat],
+            "feedback": feedback,
+            "snapshots": snapshots,
+        })
+
+    def encode_attempt(self, attempt: Attempt) -> bytes:
+        return self._frame(self._attempt(attempt))
+
+    def decode_attempt(self, data: bytes) -> Attempt:
+        return self._from_attempt(self._unframe(data))
+
+    def encode_response(self, response: LLMResponse) -> bytes:
+        return self._frame(self._response(response))
+
+    def decode_response(self, data: bytes) -> LLMResponse:
+        return self._from_response(self._unframe(data))
+
+    # Framing
+
+    def _frame(self, body: Any) -> bytes:
+        payload = orjson.dumps(body, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        flags = 0
+        if self.compress_threshold is not None and len(payload) > self.compress_threshold:
+            compressed = zlib.compress(payload, self.compression_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_ZLIB
+        return MAGIC + bytes((VERSION, flags)) + payload
+
+    def _unframe(self, data: bytes) -> Any:
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a StateCodec payload")
+        version, flags = data[3], data[4]
+        if version != VERSION:
+            raise ValueError(f"Unsupported StateCodec version {version}")
+        payload = data[5:]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return orjson.loads(payload)
+
+    # Models <-> arrays
+
+    def _attempt(self, attempt: Attempt) -> list:
+        checkpoint = attempt.checkpoint_response
+        return [
+            attempt.step,
+            attempt.attempt_number,
+            attempt.timestamp,
+            self._response(attempt.llm_response) if attempt.llm_response else None,
+            [[r.success, r.data, r.error, r.metadata] for r in attempt.tool_results],
+            [checkpoint.decision.value, checkpoint.feedback, checkpoint.go_back_to] if checkpoint else None,
+            attempt.error,
+        ]
+
+    def _from_attempt(self, data: list) -> Attempt:
+        return Attempt.model_validate(self._attempt_dict(data))
+
+    def _attempt_dict(self, data: list) -> dict:
+        step, number, timestamp, response, tool_results, checkpoint, error = data
+        return {
+            "step": step,
+            "attempt_number": number,
+            "timestamp": timestamp,
+            "llm_response": self._response_dict(response) if response else None,
+            "tool_results": [
+                {"success": success, "data": result, "error": err, "metadata": metadata}
+                for success, result, err, metadata in tool_results
+            ],
+            "checkpoint_response": {
+                "decision": checkpoint[0],
+                "feedback": checkpoint[1],
+                "go_back_to": checkpoint[2],
+            } if checkpoint else None,
+            "error": error,
+        }
+
+    def _response(self, response: LLMResponse) -> list:
+        return [
+            response.content,
+            [[call.tool_name, call.arguments] for call in response.tool_calls],
+            _code(FINISH_REASONS, response.finish_reason),
+            response.usage,
+            self._raw(response.raw),
+        ]
+
+    def _from_response(self, data: list) -> LLMResponse:
+        return LLMResponse.model_validate(self._response_dict(data))
+
+    def _response_dict(self, data: list) -> dict:
+        content, tool_calls, finish_reason, usage, raw = data
+        return {
+            "content": content,
+            "tool_calls": [{"tool_name": name, "arguments": arguments} for name, arguments in tool_calls],
+            "finish_reason": _decode(FINISH_REASONS, finish_reason),
+            "usage": usage,
+            "raw": self._from_raw(raw),
+        }
+
+    def _raw(self, raw: Any) -> Any:
+        if raw is None or self.raw_policy == "drop":
+            return None
+        if self.raw_policy == "truncate":
+            text = orjson.dumps(raw, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+            return text if len(text) <= self.raw_max_chars else text[:self.raw_max_chars] + "...[truncated]"
+        canonical = orjson.dumps(raw, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        handle = f"raw_{hashlib.sha256(canonical).hexdigest()[:32]}"
+        if handle not in self.raw_store:
+            self.raw_store[handle] = raw
+        return {"$raw": handle}
+
+    def _from_raw(self, raw: Any) -> Any:
+        if isinstance(raw, dict) and set(raw) == {"$raw"}:
+            # Side-stored: resolve it if this codec's store still has it, else keep the handle
+            if self.raw_store is not None and raw["$raw"] in self.raw_store:
+                return self.raw_store[raw["$raw"]]
+        return raw
+
+
+def _message(message: dict[str, str]) -> list:
+    if message.keys() == {"role", "content"}:
+        return [_code(ROLES, message.get("role")), message.get("content")]
+    return [message]  # unusual keys: keep the whole dict
+
+
+def _from_message(data: list) -> dict[str, str]:
+    if len(data) == 1:
+        return data[0]
+    return {"role": _decode(ROLES, data[0]), "content": data[1]}
+
+
+def _code(table: list[str], value: str | None) -> int | str | None:
+    try:
+        return table.index(value)
+    except ValueError:
+        return value
+
+
+def _decode(table: list[str], value: int | str | None) -> str | None:
+    return table[value] if isinstance(value, int) else value
+
+
+def _default(value: Any) -> Any:
+    """Fallback for orjson: models as their JSON dump, anything else as str."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
@@ -0,0 +1,160 @@
+# memory/state_store/delta_snapshot.py
+
+from typing import Any, Callable
+from core.schemas import AgentState, Attempt
+
+
+class _Segment:
+    """Immutable piece of an append-only list: the first `keep` items of the parent, then `items`.
+
+    Every `keyframe_interval`-th segment in a chain stores the whole flattened list so
+    restoring never walks more than that many segments. Restored segments cache theirs too.
+    """
+
+    __slots__ = ("parent", "keep", "items", "length", "depth", "_flat")
+
+    def __init__(self, parent: "_Segment | None", keep: int, items: tuple, keyframe_interval: int):
+        self.parent = parent
+        self.keep = keep
+        self.items = items
+        self.length = keep + len(items)
+        self.depth = parent.depth + 1 if parent else 0
+        self._flat: tuple | None = items if parent is None else None
+        if parent is not None and self.depth % keyframe_interval == 0:
+            self._flat = self.flatten()
+            self.parent = None  # keyframes don't need the chain behind them
+            self.items = ()
+            self.keep = 0
+
+    def flatten(self) -> tuple:
+        if self._flat is not None:
+            return self._flat
+        # Walk up to the nearest keyframe, then apply the segments back down
+        chain = []
+        node = self
+        while node._flat is None:
+            chain.append(node)
+            node = node.parent
+        flat = list(node._flat)
+        for segment in reversed(chain):
+            del flat[segment.keep:]
+            flat.extend(segment.items)
+        # Cache it: restoring the same snapshot again is then just a list() of this tuple
+        self._flat = tuple(flat)
+        return self._flat
+
+
+class StateSnapshot:
+    """A point-in-time AgentState stored as (parent snapshot, delta)."""
+
+    __slots__ = ("chat_history", "attempts", "outputs", "current_step", "current_attempt", "feedback")
+
+    def __init__(
+        self,
+        chat_history: _Segment,
+        attempts: _Segment,
+        outputs: dict[str, Any],
+        current_step: str | None,
+        current_attempt: int,
+        feedback: str | None,
+    ):
+        self.chat_history = chat_history
+        self.attempts = attempts
+        self.outputs = outputs
+        self.current_step = current_step
+        self.current_attempt = current_attempt
+        self.feedback = feedback
+
+
+class DeltaSnapshotter:
+    """Takes and restores snapshots of one session's AgentState with structural sharing.
+
+    Chat messages are shared by reference and treated as immutable (the framework only
+    ever appends them). Attempts are mutated right after they're appended, so the delta
+    copies new attempts and re-copies the previous tail attempt.
+
+    Taking a snapshot costs O(delta) as long as the state's lists were only appended to
+    since the last take/restore; a replaced list falls back to an identity prefix scan.
+    Restoring costs one shallow list build, never a deep copy.
+    """
+
+    def __init__(self, keyframe_interval: int = 32):
+        self.keyframe_interval = keyframe_interval
+        self._head: StateSnapshot | None = None
+        self._live_chat: list | None = None  # list objects seen at the last take/restore
+        self._live_attempts: list | None = None
+
+    def take(self, state: AgentState) -> StateSnapshot:
+        head = self._head
+        chat = self._extend(
+            head.chat_history if head else None,
+            self._live_chat,
+            state.chat_history,
+            copy_item=None,
+            recopy_tail=False,
+        )
+        attempts = self._extend(
+            head.attempts if head else None,
+            self._live_attempts,
+            state.attempts,
+            copy_item=Attempt.model_copy,
+            recopy_tail=True,
+        )
+        # Outputs hold one entry per step, so a full shallow dict copy is already small
+        snapshot = StateSnapshot(
+            chat_history=chat,
+            attempts=attempts,
+            outputs=dict(state.outputs),
+            current_step=state.current_step,
+            current_attempt=state.current_attempt,
+            feedback=state.feedback,
+        )
+        self._head = snapshot
+        self._live_chat = state.chat_history
+        self._live_attempts = state.attempts
+        return snapshot
+
+    def restore(self, snapshot: StateSnapshot) -> AgentState:
+        state = AgentState.model_construct(
+            current_step=snapshot.current_step,
+            current_attempt=snapshot.current_attempt,
+            outputs=dict(snapshot.outputs),
+            attempts=[attempt.model_copy() for attempt in snapshot.attempts.flatten()],
+            chat_history=list(snapshot.chat_history.flatten()),
+            feedback=snapshot.feedback,
+            snapshots={},
+        )
+        # Later takes diff against the restored state
+        self._head = snapshot
+        self._live_chat = state.chat_history
+        self._live_attempts = state.attempts
+        return state
+
+    def _extend(
+        self,
+        parent: _Segment | None,
+        live: list | None,
+        current: list,
+        copy_item: Callable[[Any], Any] | None,
+        recopy_tail: bool,
+    ) -> _Segment:
+        copy = copy_item or (lambda item: item)
+
+        if parent is None:
+            keep = 0
+        elif current is live and len(current) >= parent.length:
+            # Same list object, only appended to
+            keep = parent.length - 1 if recopy_tail and parent.length else parent.length
+        elif copy_item is None:
+            # List was replaced (e.g. history rebuilt): share the longest identical prefix
+            flat = parent.flatten()
+            keep = 0
+            for ours, theirs in zip(flat, current):
+                if ours is not theirs:
+                    break
+                keep += 1
+        else:
+            keep = 0
+
+        items = tuple(copy(item) for item in current[keep:])
+        return _Segment(parent, keep, items, self.keyframe_interval)
@@ -1,22 +1,238 @@
 # memory/state_store/in_memory.py
 
-from core.schemas import AgentState
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import quote
+from pydantic import BaseModel
+from core.schemas import AgentState, StepProgress
 from memory.state_store.base_store import BaseStateStore
+from memory.state_store.codec import StateCodec
+from memory.state_store.read_only import FrozenModel, freeze
+from typing import Literal
 
 
-class InMemoryStateStore(BaseStateStore):
+class InMemoryStoreStats(BaseModel):
+    resident_sessions: int = 0
+    resident_bytes: int = 0  # serialized size estimate; 0 when the store is unbounded
+    spilled_sessions: int = 0
+    evictions: int = 0
+    spill_hits: int = 0  # loads served from the disk tier
+    hits: int = 0
+    misses: int = 0
+
+
+class _LRU:
     def __init__(self):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def touch(self, key: str) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self, exclude: str) -> str | None:
+        return next((key for key in self._order if key != exclude), None)
+
+
+class _LFU:
+    """Least frequently used, least recently used among equals. O(1) touch and remove."""
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min = 0
+
+    def touch(self, key: str) -> None:
+        count = self._counts.get(key, 0)
+        if count:
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+                if self._min == count:
+                    self._min = count + 1
+        else:
+            self._min = 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def remove(self, key: str) -> None:
+        count = self._counts.pop(key, 0)
+        if count:
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+                if self._min == count:
+                    self._min = min(self._buckets, default=0)
+
+    def victim(self, exclude: str) -> str | None:
+        for count in [self._min, *sorted(self._buckets)]:
+            for key in self._buckets.get(count, ()):
+                if key != exclude:
+                    return key
+        return None
+
+
+class InMemoryStateStore(BaseStateStore):
+    """Process-local store of deep-copied states.
+
+    Unbounded by default. With `max_bytes`, each state's size is estimated from its
+    serialized form and the least recently (or frequently) used sessions are evicted
+    once the total is over budget; with `spill_dir` they are written there instead of
+    dropped and load() brings them back transparently.
+
+    `load_view()` returns a read-only view of the stored state without copying it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+        spill_dir: str | None = None,
+        spill_codec: StateCodec | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        # Provider `raw` objects may not serialize; keep them as truncated JSON on disk
+        self.spill_codec = spill_codec or StateCodec(raw_policy="truncate")
+        self._size_codec = StateCodec(compress_threshold=None)
         self._store: dict[str, AgentState] = {}
-    
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self._usage = _LFU() if eviction == "lfu" else _LRU()
+        self._spilling: dict[str, AgentState] = {}  # evicted, disk write in flight
+        self._spilled: set[str] = set()
+        self._progress: dict[str, dict[str, StepProgress]] = {}
+        self._stats = InMemoryStoreStats()
+
+    @property
+    def stats(self) -> InMemoryStoreStats:
+        return self._stats.model_copy(update={
+            "resident_sessions": len(self._store),
+            "resident_bytes": self._total_bytes,
+            "spilled_sessions": len(self._spilled) + len(self._spilling),
+        })
+
     async def save(self, session_id: str, state: AgentState) -> None:
-        self._store[session_id] = state.model_copy(deep=True)
-    
+        await self._discard_spilled(session_id)
+        await self._admit(session_id, state.model_copy(deep=True))
+
     async def load(self, session_id: str) -> AgentState | None:
-        state = self._store.get(session_id)
+        state = await self._get(session_id)
         return state.model_copy(deep=True) if state else None
-    
+
+    async def load_view(self, session_id: str) -> FrozenModel | None:
+        """Read-only view of the stored state. No copy; mutating it raises ReadOnlyError."""
+        state = await self._get(session_id)
+        return freeze(state) if state else None
+
     async def delete(self, session_id: str) -> None:
-        self._store.pop(session_id, None)
-    
+        self._forget(session_id)
+        await self._discard_spilled(session_id)
+        self._progress.pop(session_id, None)
+
     async def exists(self, session_id: str) -> bool:
-        return session_id in self._store
\ No newline at end of file
+        return session_id in self._store or session_id in self._spilling or session_id in self._spilled
+
+    async def list_keys(self, prefix: str = "") -> list[str]:
+        keys = self._store.keys() | self._spilling.keys() | self._spilled
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    async def save_step_progress(self, session_id: str, progress: StepProgress) -> None:
+        self._progress.setdefault(session_id, {})[progress.step] = progress.model_copy(deep=True)
+
+    async def load_step_progress(self, session_id: str) -> dict[str, StepProgress]:
+        return {
+            step: progress.model_copy(deep=True)
+            for step, progress in self._progress.get(session_id, {}).items()
+        }
+
+    async def delete_step_progress(self, session_id: str, steps: list[str] | None = None) -> None:
+        if steps is None:
+            self._progress.pop(session_id, None)
+            return
+        session_progress = self._progress.get(session_id, {})
+        for step in steps:
+            session_progress.pop(step, None)
+
+    # Tiers
+
+    async def _get(self, session_id: str) -> AgentState | None:
+        state = self._store.get(session_id)
+        if state is not None:
+            self._stats.hits += 1
+            self._usage.touch(session_id)
+            return state
+
+        state = self._spilling.get(session_id)
+        if state is None and session_id in self._spilled:
+            data = await asyncio.to_thread(self._spill_path(session_id).read_bytes)
+            if session_id not in self._spilled:  # saved or deleted while we were reading
+                return await self._get(session_id)
+            state = self.spill_codec.decode_state(data)
+        if state is None:
+            self._stats.misses += 1
+            return None
+
+        # Bring it back into memory; the disk copy is no longer needed
+        self._stats.spill_hits += 1
+        await self._discard_spilled(session_id)
+        await self._admit(session_id, state)
+        return state
+
+    async def _admit(self, session_id: str, state: AgentState) -> None:
+        self._store[session_id] = state
+        self._usage.touch(session_id)
+        if self.max_bytes is None:
+            return
+
+        size = len(self._size_codec.encode_state(state))
+        self._total_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+        evicted = []
+        while self._total_bytes > self.max_bytes:
+            victim = self._usage.victim(exclude=session_id)  # never the state being admitted
+            if victim is None:
+                break
+            evicted.append((victim, self._store[victim]))
+            self._forget(victim)
+            self._stats.evictions += 1
+
+        if self.spill_dir is not None:
+            for victim, victim_state in evicted:
+                await self._spill(victim, victim_state)
+
+    async def _spill(self, session_id: str, state: AgentState) -> None:
+        self._spilling[session_id] = state
+        try:
+            data = self.spill_codec.encode_state(state)
+            await asyncio.to_thread(self._spill_path(session_id).write_bytes, data)
+        except BaseException:
+            self._spilling.pop(session_id, None)
+            raise
+        # Saved or deleted meanwhile: the file is stale
+        if self._spilling.get(session_id) is state:
+            del self._spilling[session_id]
+            self._spilled.add(session_id)
+        elif session_id not in self._spilled:
+            await asyncio.to_thread(self._spill_path(session_id).unlink, missing_ok=True)
+
+    async def _discard_spilled(self, session_id: str) -> None:
+        self._spilling.pop(session_id, None)
+        if session_id in self._spilled:
+            self._spilled.discard(session_id)
+            await asyncio.to_thread(self._spill_path(session_id).unlink, missing_ok=True)
+
+    def _forget(self, session_id: str) -> None:
+        self._store.pop(session_id, None)
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+        self._usage.remove(session_id)
+
+    def _spill_path(self, session_id: str) -> Path:
+        return self.spill_dir / f"{quote(session_id, safe='')}.state"
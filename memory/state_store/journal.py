@@ -0,0 +1,334 @@
+# memory/state_store/journal.py
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, unquote
+from pydantic import BaseModel, Field
+from core.schemas import AgentState, Attempt, StepProgress
+from memory.state_store.base_store import BaseStateStore
+from typing import Any, Literal
+
+EventType = Literal[
+    "message_appended",
+    "history_truncated",  # list rewound (e.g. GO_BACK restored a snapshot): keep the first `length`
+    "attempt_logged",
+    "attempt_updated",  # an already journaled attempt changed (checkpoint response, tool results)
+    "attempts_truncated",
+    "output_set",
+    "output_removed",
+    "feedback_set",
+    "position_set",  # current_step / current_attempt
+    "snapshots_set",
+]
+
+
+class StateEvent(BaseModel):
+    seq: int
+    type: EventType
+    data: dict[str, Any] = Field(default_factory=dict)
+    at: datetime = Field(default_factory=datetime.now)
+
+
+class _View:
+    """What the journal holds for one session, to diff the live state against.
+
+    Lists hold references to the live items (no copies); `live_*` are the list objects
+    seen at the last record, so appends to the same list are found in O(new items).
+    """
+
+    def __init__(self, state: AgentState):
+        self.messages = list(state.chat_history)
+        self.attempts = list(state.attempts)
+        self.tail_attempt = state.attempts[-1].model_copy(deep=True) if state.attempts else None
+        self.outputs = dict(state.outputs)
+        self.feedback = state.feedback
+        self.position = (state.current_step, state.current_attempt)
+        self.snapshots = dict(state.snapshots)
+        self.live_messages = state.chat_history
+        self.live_attempts = state.attempts
+
+
+class JournalStateStore(BaseStateStore):
+    """Event-sourced AgentState persistence.
+
+    save() diffs the state against what was journaled before and appends only the
+    changes as StateEvents, so its cost follows the size of the change, not of the
+    session. Every `compact_every` events the full state is written as a snapshot and
+    the journal restarts; load() reads the snapshot and replays the events after it.
+
+    Like the snapshot manager, it treats chat messages and output values as immutable
+    once added. The last attempt is compared on every save since executors fill it in
+    after appending it.
+
+    One directory holds `<session>.journal` (JSON lines) and `<session>.snapshot` per session.
+    """
+
+    def __init__(self, directory: str, compact_every: int = 500, fsync: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._views: dict[str, _View] = {}
+        self._seq: dict[str, int] = {}
+        self._since_compaction: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def save(self, session_id: str, state: AgentState) -> None:
+        async with self._lock(session_id):
+            if session_id not in self._views:
+                await self._load_locked(session_id)
+            events = self._diff(session_id, state)
+            if not events:
+                return
+            await asyncio.to_thread(self._append, session_id, events)
+            self._since_compaction[session_id] = self._since_compaction.get(session_id, 0) + len(events)
+            if self._since_compaction[session_id] >= self.compact_every:
+                await self._compact_locked(session_id, state)
+
+    async def load(self, session_id: str) -> AgentState | None:
+        async with self._lock(session_id):
+            return await self._load_locked(session_id)
+
+    async def delete(self, session_id: str) -> None:
+        async with self._lock(session_id):
+            self._views.pop(session_id, None)
+            self._seq.pop(session_id, None)
+            self._since_compaction.pop(session_id, None)
+            for path in (self._journal_path(session_id), self._snapshot_path(session_id), self._progress_path(session_id)):
+                path.unlink(missing_ok=True)
+
+    async def exists(self, session_id: str) -> bool:
+        return self._journal_path(session_id).exists() or self._snapshot_path(session_id).exists()
+
+    async def list_keys(self, prefix: str = "") -> list[str]:
+        keys = {
+            unquote(path.stem)
+            for path in self.directory.iterdir()
+            if path.suffix in (".journal", ".snapshot")
+        }
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    async def compact(self, session_id: str, state: AgentState) -> None:
+        """Write `state` as the session's snapshot and start a new, empty journal."""
+        async with self._lock(session_id):
+            if session_id not in self._views:
+                await self._load_locked(session_id)
+            events = self._diff(session_id, state)
+            if events:
+                await asyncio.to_thread(self._append, session_id, events)
+            await self._compact_locked(session_id, state)
+
+    async def read_events(self, session_id: str) -> list[StateEvent]:
+        """Events journaled since the last compaction."""
+        _, events = await asyncio.to_thread(self._read, session_id)
+        return events
+
+    # Workflow progress is small and rewritten per step, so it's one JSON file per session
+
+    async def save_step_progress(self, session_id: str, progress: StepProgress) -> None:
+        async with self._lock(session_id):
+            saved = await asyncio.to_thread(self._read_progress, session_id)
+            saved[progress.step] = progress.model_dump(mode="json")
+            await asyncio.to_thread(self._write_atomic, self._progress_path(session_id), json.dumps(saved))
+
+    async def load_step_progress(self, session_id: str) -> dict[str, StepProgress]:
+        saved = await asyncio.to_thread(self._read_progress, session_id)
+        return {step: StepProgress.model_validate(data) for step, data in saved.items()}
+
+    async def delete_step_progress(self, session_id: str, steps: list[str] | None = None) -> None:
+        async with self._lock(session_id):
+            if steps is None:
+                self._progress_path(session_id).unlink(missing_ok=True)
+                return
+            saved = await asyncio.to_thread(self._read_progress, session_id)
+            for step in steps:
+                saved.pop(step, None)
+            await asyncio.to_thread(self._write_atomic, self._progress_path(session_id), json.dumps(saved))
+
+    # Diffing
+
+    def _diff(self, session_id: str, state: AgentState) -> list[StateEvent]:
+        view = self._views[session_id]
+        seq = self._seq.get(session_id, 0)
+        events: list[StateEvent] = []
+
+        def emit(type: EventType, **data):
+            nonlocal seq
+            seq += 1
+            events.append(StateEvent(seq=seq, type=type, data=data))
+
+        # Chat history
+        keep = self._shared_prefix(view.messages, view.live_messages, state.chat_history)
+        if keep < len(view.messages):
+            emit("history_truncated", length=keep)
+            del view.messages[keep:]
+        for message in state.chat_history[keep:]:
+            emit("message_appended", message=message)
+            view.messages.append(message)
+        view.live_messages = state.chat_history
+
+        # Attempts
+        keep = self._shared_prefix(view.attempts, view.live_attempts, state.attempts)
+        if keep < len(view.attempts):
+            emit("attempts_truncated", length=keep)
+            del view.attempts[keep:]
+            view.tail_attempt = view.attempts[-1].model_copy(deep=True) if view.attempts else None
+        if view.attempts and view.tail_attempt != view.attempts[-1]:
+            emit("attempt_updated", index=len(view.attempts) - 1, attempt=view.attempts[-1])
+        for attempt in state.attempts[keep:]:
+            emit("attempt_logged", attempt=attempt)
+            view.attempts.append(attempt)
+        view.live_attempts = state.attempts
+        view.tail_attempt = view.attempts[-1].model_copy(deep=True) if view.attempts else None
+
+        # Scalars and dicts
+        for step, value in state.outputs.items():
+            if step not in view.outputs or (view.outputs[step] is not value and view.outputs[step] != value):
+                emit("output_set", step=step, value=value)
+        for step in view.outputs.keys() - state.outputs.keys():
+            emit("output_removed", step=step)
+        view.outputs = dict(state.outputs)
+
+        if state.feedback != view.feedback:
+            emit("feedback_set", feedback=state.feedback)
+            view.feedback = state.feedback
+        position = (state.current_step, state.current_attempt)
+        if position != view.position:
+            emit("position_set", current_step=state.current_step, current_attempt=state.current_attempt)
+            view.position = position
+        if state.snapshots != view.snapshots:
+            emit("snapshots_set", snapshots=dict(state.snapshots))
+            view.snapshots = dict(state.snapshots)
+
+        self._seq[session_id] = seq
+        return events
+
+    def _shared_prefix(self, journaled: list, live: list, current: list) -> int:
+        """How many journaled items the current list still starts with."""
+        if current is live and len(current) >= len(journaled):
+            return len(journaled)  # same list, only appended to
+        keep = 0
+        for ours, theirs in zip(journaled, current):
+            if ours is not theirs and ours != theirs:
+                break
+            keep += 1
+        return keep
+
+    # Replay
+
+    async def _load_locked(self, session_id: str) -> AgentState | None:
+        snapshot, events = await asyncio.to_thread(self._read, session_id, True)
+        if snapshot is None and not events:
+            self._views[session_id] = _View(AgentState())
+            self._seq[session_id] = 0
+            return None
+
+        seq, state = snapshot if snapshot else (0, AgentState())
+        for event in events:
+            if event.seq > seq:
+                apply_event(state, event)
+                seq = event.seq
+        self._views[session_id] = _View(state)
+        self._seq[session_id] = seq
+        self._since_compaction[session_id] = len(events)
+        return state
+
+    async def _compact_locked(self, session_id: str, state: AgentState) -> None:
+        payload = json.dumps({"seq": self._seq.get(session_id, 0), "state": state.model_dump(mode="json")})
+        await asyncio.to_thread(self._write_snapshot, session_id, payload)
+        self._since_compaction[session_id] = 0
+
+    # Files (run in a worker thread)
+
+    def _append(self, session_id: str, events: list[StateEvent]) -> None:
+        lines = "".join(event.model_dump_json() + "\n" for event in events)
+        with open(self._journal_path(session_id), "a", encoding="utf-8") as f:
+            f.write(lines)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write_snapshot(self, session_id: str, payload: str) -> None:
+        # Snapshot first, then truncate: events it already covers are skipped on replay
+        self._write_atomic(self._snapshot_path(session_id), payload)
+        with open(self._journal_path(session_id), "w", encoding="utf-8"):
+            pass
+
+    def _read(self, session_id: str, repair: bool = False) -> tuple[tuple[int, AgentState] | None, list[StateEvent]]:
+        snapshot = None
+        snapshot_path = self._snapshot_path(session_id)
+        if snapshot_path.exists():
+            raw = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            snapshot = (raw["seq"], AgentState.model_validate(raw["state"]))
+
+        events = []
+        journal_path = self._journal_path(session_id)
+        if journal_path.exists():
+            complete = 0
+            with open(journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn last write: skipped, and cut off before anything is appended after it
+                        if repair:
+                            os.truncate(journal_path, complete)
+                        break
+                    events.append(StateEvent.model_validate_json(line))
+                    complete += len(line)
+        return snapshot, events
+
+    def _read_progress(self, session_id: str) -> dict[str, Any]:
+        path = self._progress_path(session_id)
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    def _write_atomic(self, path: Path, payload: str) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _journal_path(self, session_id: str) -> Path:
+        return self.directory / f"{quote(session_id, safe='')}.journal"
+
+    def _snapshot_path(self, session_id: str) -> Path:
+        return self.directory / f"{quote(session_id, safe='')}.snapshot"
+
+    def _progress_path(self, session_id: str) -> Path:
+        return self.directory / f"{quote(session_id, safe='')}.progress"
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+
+def apply_event(state: AgentState, event: StateEvent) -> None:
+    """Apply one journaled change to `state` in place."""
+    data = event.data
+    if event.type == "message_appended":
+        state.chat_history.append(data["message"])
+    elif event.type == "history_truncated":
+        del state.chat_history[data["length"]:]
+    elif event.type == "attempt_logged":
+        state.attempts.append(Attempt.model_validate(data["attempt"]))
+    elif event.type == "attempt_updated":
+        state.attempts[data["index"]] = Attempt.model_validate(data["attempt"])
+    elif event.type == "attempts_truncated":
+        del state.attempts[data["length"]:]
+    elif event.type == "output_set":
+        state.outputs[data["step"]] = data["value"]
+    elif event.type == "output_removed":
+        state.outputs.pop(data["step"], None)
+    elif event.type == "feedback_set":
+        state.feedback = data["feedback"]
+    elif event.type == "position_set":
+        state.current_step = data["current_step"]
+        state.current_attempt = data["current_attempt"]
+    elif event.type == "snapshots_set":
+        state.snapshots = dict(data["snapshots"])
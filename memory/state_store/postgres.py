@@ -0,0 +1,296 @@
+# memory/state_store/postgres.py
+
+import asyncio
+import hashlib
+import json
+from core.schemas import AgentState, Attempt, StepProgress
+from memory.state_store.base_store import BaseStateStore
+from memory.state_store.row_diff import base_hash, chain_hashes, sync_rows
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncpg
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_sessions (
+    session_id TEXT PRIMARY KEY,
+    current_step TEXT,
+    current_attempt INTEGER NOT NULL DEFAULT 1,
+    feedback TEXT,
+    outputs JSONB NOT NULL DEFAULT '{}',
+    snapshots JSONB NOT NULL DEFAULT '{}',
+    message_count INTEGER NOT NULL DEFAULT 0,
+    attempt_count INTEGER NOT NULL DEFAULT 0,
+    history_tail TEXT,
+    attempts_tail TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS agent_sessions_prefix ON agent_sessions (session_id text_pattern_ops);
+CREATE TABLE IF NOT EXISTS agent_messages (
+    session_id TEXT NOT NULL REFERENCES agent_sessions ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT,
+    prefix_hash TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS agent_attempts (
+    session_id TEXT NOT NULL REFERENCES agent_sessions ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    data JSONB NOT NULL,
+    prefix_hash TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS workflow_step_progress (
+    session_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    data JSONB NOT NULL,
+    PRIMARY KEY (session_id, step)
+);
+"""
+
+
+class PostgresStateStore(BaseStateStore):
+    """AgentState store shared by every node of a deployment.
+
+    chat_history and attempts live in append-only tables, one row per item, each row
+    carrying a hash of the list up to and including it. A save compares those hashes
+    with the state's and rewrites from the first item that differs: normally only what
+    was appended, or the last attempt when executors mutated it after appending; after
+    a rewind (e.g. a GO_BACK restored a snapshot), everything past the common prefix.
+    Scalars and outputs live in one row per session, outputs as JSONB.
+
+    load() with limits returns a partial state, marked by its history_offset and
+    attempts_offset; saving it back only diffs the loaded part and leaves older rows alone.
+
+    Needs asyncpg (optional dependency, imported when the store is created).
+    """
+
+    def __init__(self, dsn: str, min_connections: int = 2, max_connections: int = 10, create_schema: bool = True):
+        import asyncpg
+
+        self._asyncpg = asyncpg
+        self.dsn = dsn
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.create_schema = create_schema
+        self._pool: "asyncpg.Pool | None" = None
+        self._pool_lock = asyncio.Lock()
+
+    async def pool(self) -> "asyncpg.Pool":
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = await self._asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_connections,
+                        max_size=self.max_connections,
+                        init=_init_connection,
+                    )
+                    if self.create_schema:
+                        async with pool.acquire() as conn:
+                            await conn.execute(SCHEMA)
+                    self._pool = pool
+        return self._pool
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def save(self, session_id: str, state: AgentState) -> None:
+        messages = list(state.chat_history)
+        attempts = list(state.attempts)
+        pool = await self.pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "INSERT INTO agent_sessions (session_id) VALUES ($1) ON CONFLICT DO NOTHING", session_id
+            )
+            row = await conn.fetchrow(
+                "SELECT message_count, attempt_count, history_tail, attempts_tail FROM agent_sessions "
+                "WHERE session_id = $1 FOR UPDATE",
+                session_id,
+            )
+            # A partial load only holds the lists from these positions on
+            message_offset, attempt_offset = state.history_offset, state.attempts_offset
+            message_base = await base_hash(conn, "agent_messages", session_id, message_offset)
+            attempt_base = await base_hash(conn, "agent_attempts", session_id, attempt_offset)
+            message_chain = chain_hashes((_message_hash(m) for m in messages), message_base)
+            attempt_chain = chain_hashes((_attempt_hash(a) for a in attempts), attempt_base)
+
+            async def insert_messages(start: int) -> None:
+                await conn.copy_records_to_table(
+                    "agent_messages",
+                    records=[
+                        (session_id, seq, message.get("role"), message.get("content"), message_chain[seq - message_offset])
+                        for seq, message in enumerate(messages[start - message_offset:], start=start)
+                    ],
+                    columns=["session_id", "seq", "role", "content", "prefix_hash"],
+                )
+
+            async def insert_attempts(start: int) -> None:
+                await conn.executemany(
+                    "INSERT INTO agent_attempts (session_id, seq, step, data, prefix_hash) "
+                    "VALUES ($1, $2, $3, $4, $5)",
+                    [
+                        (session_id, seq, attempt.step, attempt.model_dump(mode="json"), attempt_chain[seq - attempt_offset])
+                        for seq, attempt in enumerate(attempts[start - attempt_offset:], start=start)
+                    ],
+                )
+
+            await sync_rows(
+                conn, "agent_messages", session_id, message_chain,
+                row["message_count"], row["history_tail"], insert_messages, message_offset,
+            )
+            await sync_rows(
+                conn, "agent_attempts", session_id, attempt_chain,
+                row["attempt_count"], row["attempts_tail"], insert_attempts, attempt_offset,
+            )
+
+            await conn.execute(
+                "UPDATE agent_sessions SET current_step = $2, current_attempt = $3, feedback = $4, "
+                "outputs = $5, snapshots = $6, message_count = $7, attempt_count = $8, "
+                "history_tail = $9, attempts_tail = $10, updated_at = now() WHERE session_id = $1",
+                session_id,
+                state.current_step,
+                state.current_attempt,
+                state.feedback,
+                _jsonable(state.outputs),
+                state.snapshots,
+                message_offset + len(messages),
+                attempt_offset + len(attempts),
+                message_chain[-1] if message_chain else message_base or None,
+                attempt_chain[-1] if attempt_chain else attempt_base or None,
+            )
+
+    async def load(
+        self,
+        session_id: str,
+        history_limit: int | None = None,
+        attempts_limit: int | None = None,
+    ) -> AgentState | None:
+        """Load a session; with limits, only the most recent messages/attempts (a partial state)."""
+        pool = await self.pool()
+        async with pool.acquire() as conn, conn.transaction(readonly=True, isolation="repeatable_read"):
+            row = await conn.fetchrow("SELECT * FROM agent_sessions WHERE session_id = $1", session_id)
+            if row is None:
+                return None
+            message_start = _tail_start(row["message_count"], history_limit)
+            attempt_start = _tail_start(row["attempt_count"], attempts_limit)
+            messages = await conn.fetch(
+                "SELECT role, content FROM agent_messages WHERE session_id = $1 AND seq >= $2 ORDER BY seq",
+                session_id,
+                message_start,
+            )
+            attempts = await conn.fetch(
+                "SELECT data FROM agent_attempts WHERE session_id = $1 AND seq >= $2 ORDER BY seq",
+                session_id,
+                attempt_start,
+            )
+
+        return AgentState(
+            current_step=row["current_step"],
+            current_attempt=row["current_attempt"],
+            feedback=row["feedback"],
+            outputs=row["outputs"],
+            snapshots=row["snapshots"],
+            chat_history=[{"role": m["role"], "content": m["content"]} for m in messages],
+            attempts=[Attempt.model_validate(a["data"]) for a in attempts],
+            history_offset=message_start,
+            attempts_offset=attempt_start,
+        )
+
+    async def load_messages(self, session_id: str, offset: int = 0, limit: int | None = None) -> list[dict[str, str]]:
+        """A slice of the chat history without loading the rest of the session."""
+        pool = await self.pool()
+        rows = await pool.fetch(
+            "SELECT role, content FROM agent_messages WHERE session_id = $1 AND seq >= $2 "
+            "ORDER BY seq LIMIT $3",
+            session_id,
+            offset,
+            limit,
+        )
+        return [{"role": r["role"], "content": r["content"]} for r in rows]
+
+    async def delete(self, session_id: str) -> None:
+        pool = await self.pool()
+        async with pool.acquire() as conn, conn.transaction():
+            # Messages and attempts go with the session row (ON DELETE CASCADE)
+            await conn.execute("DELETE FROM agent_sessions WHERE session_id = $1", session_id)
+            await conn.execute("DELETE FROM workflow_step_progress WHERE session_id = $1", session_id)
+
+    async def exists(self, session_id: str) -> bool:
+        pool = await self.pool()
+        return await pool.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM agent_sessions WHERE session_id = $1)", session_id
+        )
+
+    async def list_keys(self, prefix: str = "") -> list[str]:
+        pool = await self.pool()
+        if not prefix:
+            rows = await pool.fetch("SELECT session_id FROM agent_sessions ORDER BY session_id")
+        else:
+            # Byte-wise range operators, so the text_pattern_ops index is used even in generic plans
+            rows = await pool.fetch(
+                "SELECT session_id FROM agent_sessions WHERE session_id ~>=~ $1 AND session_id ~<~ $2 "
+                "ORDER BY session_id",
+                prefix,
+                _prefix_upper_bound(prefix),
+            )
+        return [r["session_id"] for r in rows]
+
+    async def save_step_progress(self, session_id: str, progress: StepProgress) -> None:
+        pool = await self.pool()
+        await pool.execute(
+            "INSERT INTO workflow_step_progress (session_id, step, data) VALUES ($1, $2, $3) "
+            "ON CONFLICT (session_id, step) DO UPDATE SET data = excluded.data",
+            session_id,
+            progress.step,
+            progress.model_dump(mode="json"),
+        )
+
+    async def load_step_progress(self, session_id: str) -> dict[str, StepProgress]:
+        pool = await self.pool()
+        rows = await pool.fetch(
+            "SELECT step, data FROM workflow_step_progress WHERE session_id = $1", session_id
+        )
+        return {r["step"]: StepProgress.model_validate(r["data"]) for r in rows}
+
+    async def delete_step_progress(self, session_id: str, steps: list[str] | None = None) -> None:
+        pool = await self.pool()
+        if steps is None:
+            await pool.execute("DELETE FROM workflow_step_progress WHERE session_id = $1", session_id)
+        else:
+            await pool.execute(
+                "DELETE FROM workflow_step_progress WHERE session_id = $1 AND step = ANY($2::text[])",
+                session_id,
+                steps,
+            )
+
+
+async def _init_connection(conn: "asyncpg.Connection") -> None:
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+def _jsonable(value):
+    """Outputs may hold pydantic models or datetimes; store what json can represent."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _message_hash(message: dict[str, str]) -> str:
+    raw = f"{message.get('role')}\x00{message.get('content') or ''}".encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _attempt_hash(attempt: Attempt) -> str:
+    return hashlib.sha1(attempt.model_dump_json().encode()).hexdigest()
+
+
+def _tail_start(count: int, limit: int | None) -> int:
+    return 0 if limit is None else max(0, count - limit)
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
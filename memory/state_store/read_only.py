@@ -0,0 +1,94 @@
+# memory/state_store/read_only.py
+
+from collections.abc import Mapping, Sequence
+from pydantic import BaseModel
+from typing import Any
+
+
+class ReadOnlyError(TypeError):
+    pass
+
+
+def freeze(value: Any) -> Any:
+    """Read-only view of a model/dict/list, without copying it.
+
+    Containers are wrapped lazily on access, so viewing a large state costs nothing up
+    front. The view reflects the wrapped object; stores hand it out only for objects
+    they never mutate again.
+    """
+    if isinstance(value, BaseModel):
+        return FrozenModel(value)
+    if isinstance(value, dict):
+        return FrozenMapping(value)
+    if isinstance(value, (list, tuple)):
+        return FrozenSequence(value)
+    return value
+
+
+class FrozenModel:
+    __slots__ = ("_model",)
+
+    def __init__(self, model: BaseModel):
+        object.__setattr__(self, "_model", model)
+
+    def __getattr__(self, name: str) -> Any:
+        return freeze(getattr(self._model, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise ReadOnlyError(f"{type(self._model).__name__} view is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise ReadOnlyError(f"{type(self._model).__name__} view is read-only")
+
+    def __eq__(self, other: Any) -> bool:
+        return self._model == (other._model if isinstance(other, FrozenModel) else other)
+
+    def __repr__(self) -> str:
+        return f"FrozenModel({self._model!r})"
+
+    def thaw(self) -> BaseModel:
+        """A mutable deep copy."""
+        return self._model.model_copy(deep=True)
+
+
+class FrozenMapping(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key: Any) -> Any:
+        return freeze(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._data == (other._data if isinstance(other, FrozenMapping) else other)
+
+    def __repr__(self) -> str:
+        return f"FrozenMapping({self._data!r})"
+
+
+class FrozenSequence(Sequence):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list | tuple):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenSequence(self._data[index])
+        return freeze(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._data == (other._data if isinstance(other, FrozenSequence) else other)
+
+    def __repr__(self) -> str:
+        return f"FrozenSequence({self._data!r})"
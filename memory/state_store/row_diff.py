@@ -0,0 +1,82 @@
+# memory/state_store/row_diff.py
+
+import hashlib
+from typing import Awaitable, Callable, Iterable, Sequence
+
+
+def chain_hashes(item_hashes: Iterable[str], previous: str = "") -> list[str]:
+    """Hash of every prefix: chain[i] covers items 0..i, so equal chain[i] means equal prefixes.
+
+    `previous` is the stored prefix hash just before the first item, when they don't start at 0.
+    """
+    chain = []
+    for item in item_hashes:
+        previous = hashlib.sha1(f"{previous}\x00{item}".encode()).hexdigest()
+        chain.append(previous)
+    return chain
+
+
+async def base_hash(conn, table: str, session_id: str, start: int) -> str:
+    """The stored prefix hash before seq `start`, to continue a chain for items loaded from there."""
+    if start == 0:
+        return ""
+    previous = await conn.fetchval(
+        f"SELECT prefix_hash FROM {table} WHERE session_id = $1 AND seq = $2", session_id, start - 1
+    )
+    if previous is None:
+        raise ValueError(f"{table} has no row {start - 1} for {session_id!r}: the partial load is stale")
+    return previous
+
+
+async def sync_rows(
+    conn,
+    table: str,
+    session_id: str,
+    chain: Sequence[str],
+    stored_count: int,
+    stored_tail: str | None,
+    insert: Callable[[int], Awaitable[None]],
+    start: int = 0,
+) -> int:
+    """Bring a one-row-per-item table (columns session_id, seq, prefix_hash) in line with `chain`.
+
+    `chain[i]` is the prefix hash of seq `start + i`; rows before `start` (the part of a
+    partially loaded list that wasn't loaded) are never touched. From there, rows are kept
+    up to the first position where the stored prefix hash differs from the local one,
+    everything after is deleted, and `insert(seq)` writes items from `seq` on. An
+    append-only save costs no read: the stored tail hash is compared first. Returns the
+    number of rows kept.
+    """
+    keep = await _common_prefix(conn, table, session_id, chain, stored_count, stored_tail, start)
+    if keep < stored_count:
+        await conn.execute(f"DELETE FROM {table} WHERE session_id = $1 AND seq >= $2", session_id, keep)
+    if start + len(chain) > keep:
+        await insert(keep)
+    return keep
+
+
+async def _common_prefix(
+    conn,
+    table: str,
+    session_id: str,
+    chain: Sequence[str],
+    stored_count: int,
+    stored_tail: str | None,
+    start: int,
+) -> int:
+    if stored_count < start:
+        raise ValueError(f"{table} has {stored_count} rows for {session_id!r}, the partial load starts at {start}")
+    if stored_count == start:
+        return start
+    if stored_count <= start + len(chain) and chain[stored_count - 1 - start] == stored_tail:
+        return stored_count  # nothing stored has changed
+    rows = await conn.fetch(
+        f"SELECT prefix_hash FROM {table} WHERE session_id = $1 AND seq >= $2 AND seq < $3 ORDER BY seq",
+        session_id,
+        start,
+        min(stored_count, start + len(chain)),
+    )
+    for i, row in enumerate(rows):
+        if row["prefix_hash"] != chain[i]:
+            return start + i
+    return start + len(rows)
@@ -1,27 +1,132 @@
 # memory/state_store/snapshot_manager.py
 
+import uuid
 from core.schemas import AgentState
 from memory.state_store.base_store import BaseStateStore
+from memory.state_store.delta_snapshot import DeltaSnapshotter, StateSnapshot
+
+# Reserved `snapshots` entries of the records a SnapshotManager writes to its store
+DELTA = "$delta"  # snapshot key -> its delta record
+PARENT = "$parent"  # delta record -> the record it extends, absent on a full record
+CHAT_KEEP = "$chat_keep"  # messages of the parent's history to keep before this record's own
+ATTEMPTS_KEEP = "$attempts_keep"
 
 
 class SnapshotManager:
-    def __init__(self, store: BaseStateStore):
+    """Per-session snapshots, kept in process memory as deltas against the previous one.
+
+    With a `store`, every snapshot is also persisted there, as deltas too: an immutable
+    delta record (the messages and attempts added since the previous snapshot, the
+    outputs and scalar fields, and its parent's key) plus a small record under the
+    snapshot's key pointing at it. Keyframes are written as full records, so loading
+    reads at most `keyframe_interval` records. Snapshots then survive a restart and are
+    visible to other processes. Without a store, they live only as long as this manager.
+
+    Delta records may be shared by several snapshots, so delete_snapshot() only removes
+    the snapshot's own key.
+    """
+
+    def __init__(self, store: BaseStateStore | None = None, keyframe_interval: int = 32):
         self.store = store
+        self.keyframe_interval = keyframe_interval
+        self._snapshotters: dict[str, DeltaSnapshotter] = {}
+        self._snapshots: dict[str, dict[str, StateSnapshot]] = {}
+        self._records: dict[str, dict[str, str]] = {}  # session -> step -> delta record key
+        self._head_records: dict[str, str] = {}  # session -> record of the snapshotter's head
     
     async def save_snapshot(self, session_id: str, step_name: str, state: AgentState) -> None:
-        snapshot_key = f"{session_id}:snapshot:{step_name}"
-        await self.store.save(snapshot_key, state)
+        snapshotter = self._snapshotters.get(session_id)
+        if snapshotter is None:
+            snapshotter = self._snapshotters[session_id] = DeltaSnapshotter(self.keyframe_interval)
+        snapshot = snapshotter.take(state)
+        self._snapshots.setdefault(session_id, {})[step_name] = snapshot
+        state.snapshots[step_name] = self._key(session_id, step_name)
+        if self.store is not None:
+            record = f"{session_id}:delta:{uuid.uuid4().hex}"
+            await self.store.save(record, self._delta(session_id, snapshot, state.snapshots))
+            await self.store.save(self._key(session_id, step_name), AgentState(snapshots={DELTA: record}))
+            self._records.setdefault(session_id, {})[step_name] = record
+            self._head_records[session_id] = record
     
     async def load_snapshot(self, session_id: str, step_name: str) -> AgentState | None:
-        snapshot_key = f"{session_id}:snapshot:{step_name}"
-        return await self.store.load(snapshot_key)
+        snapshot = self._snapshots.get(session_id, {}).get(step_name)
+        if snapshot is not None:
+            state = self._snapshotters[session_id].restore(snapshot)
+            state.snapshots = {
+                name: self._key(session_id, name) for name in self._snapshots[session_id]
+            }
+            record = self._records.get(session_id, {}).get(step_name)
+            if record is not None:
+                self._head_records[session_id] = record
+            else:
+                self._head_records.pop(session_id, None)
+            return state
+        if self.store is None:
+            return None
+        # Saved by another process or before a restart
+        pointer = await self.store.load(self._key(session_id, step_name))
+        return await self._replay(pointer.snapshots[DELTA]) if pointer else None
     
     async def delete_snapshot(self, session_id: str, step_name: str) -> None:
-        snapshot_key = f"{session_id}:snapshot:{step_name}"
-        await self.store.delete(snapshot_key)
+        # Later snapshots may still share this one's segments; they stay alive through them
+        self._snapshots.get(session_id, {}).pop(step_name, None)
+        if self.store is not None:
+            await self.store.delete(self._key(session_id, step_name))
     
     async def list_snapshots(self, session_id: str) -> list[str]:
-        # For in-memory, we'd need to iterate
-        # This is a limitation - proper implementation needs store.list()
-        # For now, return empty - override in specific stores
-        return []
\ No newline at end of file
+        names = list(self._snapshots.get(session_id, {}))
+        if self.store is not None:
+            prefix = self._key(session_id, "")
+            keys = await self.store.list_keys(prefix)
+            names += [key[len(prefix):] for key in keys if key[len(prefix):] not in names]
+        return names
+
+    def clear_session(self, session_id: str) -> None:
+        self._snapshotters.pop(session_id, None)
+        self._snapshots.pop(session_id, None)
+        self._records.pop(session_id, None)
+        self._head_records.pop(session_id, None)
+
+    def _delta(self, session_id: str, snapshot: StateSnapshot, snapshots: dict[str, str]) -> AgentState:
+        """The store record for a snapshot just taken: its segments' own items, or everything at a keyframe."""
+        chat, attempts = snapshot.chat_history, snapshot.attempts
+        parent = self._head_records.get(session_id)
+        links = {}
+        if parent is not None and chat.parent is not None and attempts.parent is not None:
+            links = {PARENT: parent, CHAT_KEEP: str(chat.keep), ATTEMPTS_KEEP: str(attempts.keep)}
+            chat_items, attempt_items = chat.items, attempts.items
+        else:
+            chat_items, attempt_items = chat.flatten(), attempts.flatten()
+        return AgentState.model_construct(
+            current_step=snapshot.current_step,
+            current_attempt=snapshot.current_attempt,
+            outputs=snapshot.outputs,
+            attempts=list(attempt_items),
+            chat_history=list(chat_items),
+            feedback=snapshot.feedback,
+            snapshots={**snapshots, **links},
+        )
+
+    async def _replay(self, record: str) -> AgentState:
+        chain = []
+        while True:
+            delta = await self.store.load(record)
+            chain.append(delta)
+            if PARENT not in delta.snapshots:
+                break
+            record = delta.snapshots[PARENT]
+
+        state = chain.pop()
+        for delta in reversed(chain):
+            state.chat_history[int(delta.snapshots[CHAT_KEEP]):] = delta.chat_history
+            state.attempts[int(delta.snapshots[ATTEMPTS_KEEP]):] = delta.attempts
+        leaf = chain[0] if chain else state
+        state.current_step = leaf.current_step
+        state.current_attempt = leaf.current_attempt
+        state.outputs = leaf.outputs
+        state.feedback = leaf.feedback
+        state.snapshots = {name: key for name, key in leaf.snapshots.items() if not name.startswith("$")}
+        return state
+
+    def _key(self, session_id: str, step_name: str) -> str:
+        return f"{session_id}:snapshot:{step_name}"
\ No newline at end of file
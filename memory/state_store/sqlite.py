@@ -0,0 +1,273 @@
+# memory/state_store/sqlite.py
+
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from core.schemas import AgentState, StepProgress
+from memory.state_store.base_store import BaseStateStore
+from memory.state_store.codec import StateCodec
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_states (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS step_progress (
+    session_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, step)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteStoreStats(BaseModel):
+    writes: int = 0  # write operations submitted
+    transactions: int = 0  # commits; writes / transactions = coalescing factor
+    superseded: int = 0  # saves dropped because a later write to the same key was in the batch
+
+    @property
+    def writes_per_transaction(self) -> float:
+        return self.writes / self.transactions if self.transactions else 0.0
+
+
+class _Write:
+    __slots__ = ("kind", "key", "args", "future", "loop")
+
+    def __init__(self, kind: str, key: str, args: tuple, future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.kind = kind
+        self.key = key
+        self.args = args
+        self.future = future
+        self.loop = loop
+
+
+class SQLiteStateStore(BaseStateStore):
+    """AgentState store in one SQLite file, shareable across processes (WAL mode).
+
+    All writes go through a single writer thread. It drains everything queued while the
+    previous commit was running and applies it as one transaction, so a burst of save()
+    calls from many sessions costs one fsync. A write that fails (e.g. a constraint) is
+    rolled back to its own savepoint and fails only its caller. Reads run on a small
+    pool of reader connections, which WAL lets proceed while the writer commits.
+
+    Keys are ordinary session ids; `list_keys(prefix)` is a range scan on the primary key.
+    With a `codec`, states are stored in its compact binary format instead of JSON.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch: int = 512,
+        readers: int = 4,
+        busy_timeout: float = 5.0,
+        codec: StateCodec | None = None,
+    ):
+        self.path = path
+        self.codec = codec
+        self.max_batch = max_batch
+        self.busy_timeout = busy_timeout
+        self.stats = SQLiteStoreStats()
+        self._queue: queue.Queue[_Write | None] = queue.Queue()
+        self._local = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-store-read")
+        self._closed = False
+
+        # Create the schema before any reader can run
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-store-write", daemon=True)
+        self._writer.start()
+
+    async def save(self, session_id: str, state: AgentState) -> None:
+        # Serialize here: the state may change as soon as we yield to the loop
+        data = self.codec.encode_state(state) if self.codec else state.model_dump_json()
+        await self._submit("save", session_id, (data, time.time()))
+
+    async def load(self, session_id: str) -> AgentState | None:
+        row = await self._read(
+            "SELECT data FROM agent_states WHERE key = ?", (session_id,), one=True
+        )
+        if row is None:
+            return None
+        # Rows written without a codec are JSON text, which the codec also reads
+        return self.codec.decode_state(row[0]) if self.codec else AgentState.model_validate_json(row[0])
+
+    async def delete(self, session_id: str) -> None:
+        await self._submit("delete", session_id, ())
+
+    async def exists(self, session_id: str) -> bool:
+        row = await self._read("SELECT 1 FROM agent_states WHERE key = ?", (session_id,), one=True)
+        return row is not None
+
+    async def list_keys(self, prefix: str = "") -> list[str]:
+        if not prefix:
+            rows = await self._read("SELECT key FROM agent_states ORDER BY key", ())
+        else:
+            rows = await self._read(
+                "SELECT key FROM agent_states WHERE key >= ? AND key < ? ORDER BY key",
+                (prefix, _prefix_upper_bound(prefix)),
+            )
+        return [row[0] for row in rows]
+
+    async def save_step_progress(self, session_id: str, progress: StepProgress) -> None:
+        await self._submit("save_progress", session_id, (progress.step, progress.model_dump_json()))
+
+    async def load_step_progress(self, session_id: str) -> dict[str, StepProgress]:
+        rows = await self._read(
+            "SELECT step, data FROM step_progress WHERE session_id = ?", (session_id,)
+        )
+        return {step: StepProgress.model_validate_json(data) for step, data in rows}
+
+    async def delete_step_progress(self, session_id: str, steps: list[str] | None = None) -> None:
+        await self._submit("delete_progress", session_id, (tuple(steps) if steps is not None else None,))
+
+    async def aclose(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        await asyncio.to_thread(self._writer.join)
+        self._readers.shutdown(wait=True)
+        for conn in self._reader_conns:
+            conn.close()
+
+    # Writer thread
+
+    async def _submit(self, kind: str, key: str, args: tuple) -> None:
+        if self._closed:
+            raise RuntimeError("SQLiteStateStore is closed")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.stats.writes += 1
+        self._queue.put(_Write(kind, key, args, future, loop))
+        await future
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    return
+                batch = [first]
+                stopping = False
+                while len(batch) < self.max_batch:
+                    try:
+                        write = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if write is None:
+                        stopping = True
+                        break
+                    batch.append(write)
+
+                self._apply(conn, batch)
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, batch: list[_Write]) -> None:
+        # A save is redundant if a later save/delete of the same key is in the batch
+        last_state_write = {
+            write.key: i for i, write in enumerate(batch) if write.kind in ("save", "delete")
+        }
+        # Each write runs in its own savepoint: one that fails is rolled back and fails
+        # only its own caller, the rest of the batch still commits
+        errors: dict[int, Exception] = {}
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for i, write in enumerate(batch):
+                if write.kind == "save" and last_state_write[write.key] != i:
+                    self.stats.superseded += 1
+                    continue
+                conn.execute("SAVEPOINT write")
+                try:
+                    self._execute(conn, write)
+                except Exception as e:
+                    errors[i] = e
+                    conn.execute("ROLLBACK TO write")
+                conn.execute("RELEASE write")
+            conn.execute("COMMIT")
+            self.stats.transactions += 1
+        except Exception as e:
+            # BEGIN or COMMIT failed (e.g. the database stayed locked): nothing was written
+            errors = dict.fromkeys(range(len(batch)), e)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+        for i, write in enumerate(batch):
+            if write.kind == "save" and i not in errors:
+                i = last_state_write[write.key]  # a superseded save shares the outcome of the write that replaced it
+            write.loop.call_soon_threadsafe(_resolve, write.future, errors.get(i))
+
+    def _execute(self, conn: sqlite3.Connection, write: _Write) -> None:
+        if write.kind == "save":
+            data, updated_at = write.args
+            conn.execute(
+                "INSERT INTO agent_states (key, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (write.key, data, updated_at),
+            )
+        elif write.kind == "delete":
+            conn.execute("DELETE FROM agent_states WHERE key = ?", (write.key,))
+            conn.execute("DELETE FROM step_progress WHERE session_id = ?", (write.key,))
+        elif write.kind == "save_progress":
+            step, data = write.args
+            conn.execute(
+                "INSERT OR REPLACE INTO step_progress (session_id, step, data) VALUES (?, ?, ?)",
+                (write.key, step, data),
+            )
+        elif write.kind == "delete_progress":
+            (steps,) = write.args
+            if steps is None:
+                conn.execute("DELETE FROM step_progress WHERE session_id = ?", (write.key,))
+            else:
+                conn.executemany(
+                    "DELETE FROM step_progress WHERE session_id = ? AND step = ?",
+                    [(write.key, step) for step in steps],
+                )
+
+    # Readers
+
+    async def _read(self, sql: str, params: tuple, one: bool = False):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._read_sync, sql, params, one)
+
+    def _read_sync(self, sql: str, params: tuple, one: bool):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            self._reader_conns.append(conn)
+        cursor = conn.execute(sql, params)
+        return cursor.fetchone() if one else cursor.fetchall()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at WAL checkpoints; safe against corruption
+        return conn
+
+
+def _resolve(future: asyncio.Future, error: Exception | None) -> None:
+    if future.done():
+        return  # caller was cancelled; the write still happened
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(None)
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -1,9 +1,9 @@
 import os
 from anthropic import AsyncAnthropic
-from core.schemas import LLMConfig, LLMResponse, ToolCall
+from core.schemas import LLMConfig, LLMResponse, ToolCall, StreamChunk
 from core.base_tool import BaseTool
-from providers.base_provider import BaseLLMProvider
-from typing import Literal
+from providers.base_provider import BaseLLMProvider, StreamAccumulator
+from typing import AsyncIterator, Literal
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -19,6 +19,45 @@ class AnthropicProvider(BaseLLMProvider):
         tools: list[BaseTool] | None = None,
         response_format: Literal["text", "json"] | None = None,
     ) -> LLMResponse:
+        kwargs = self._build_kwargs(messages, tools)
+
+        response = await self.client.messages.create(**kwargs)
+
+        return self._parse_response(response)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        kwargs = self._build_kwargs(messages, tools)
+
+        acc = StreamAccumulator()
+        prompt_tokens = 0
+        stream = await self.client.messages.create(**kwargs, stream=True)
+        async for event in stream:
+            if event.type == "message_start":
+                prompt_tokens = event.message.usage.input_tokens
+            elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+                yield acc.add_tool_call(event.index, event.content_block.name, "")
+            elif event.type == "content_block_delta":
+                if event.delta.type == "text_delta":
+                    yield acc.add_text(event.delta.text)
+                elif event.delta.type == "input_json_delta":
+                    yield acc.add_tool_call(event.index, None, event.delta.partial_json)
+            elif event.type == "message_delta":
+                if event.delta.stop_reason == "max_tokens":
+                    acc.finish_reason = "length"
+                yield acc.set_usage(prompt_tokens, event.usage.output_tokens)
+
+        yield acc.done()
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+    ) -> dict:
         kwargs = {
             "model": self.config.model,
             "max_tokens": self.config.max_tokens,
@@ -29,9 +68,10 @@ class AnthropicProvider(BaseLLMProvider):
         if tools:
             kwargs["tools"] = self.format_tools(tools)
 
-        response = await self.client.messages.create(**kwargs)
+        return kwargs
 
-        return self._parse_response(response)
+    async def aclose(self) -> None:
+        await self.client.close()
 
     def format_tools(self, tools: list[BaseTool]) -> list[dict]:
         return [
@@ -0,0 +1,199 @@
+# providers/base_embedding.py
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+from pydantic import BaseModel
+from core.schemas import EmbeddingConfig
+from typing import Sequence
+
+
+class EmbeddingStats(BaseModel):
+    requested: int = 0  # texts asked for, duplicates included
+    cache_hits: int = 0
+    coalesced: int = 0  # joined an identical text already waiting or in flight
+    upstream_calls: int = 0
+    upstream_texts: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.upstream_texts / self.upstream_calls if self.upstream_calls else 0.0
+
+
+class EmbeddingCache:
+    """SQLite table of float32 vectors keyed by a hash of (namespace, text)."""
+
+    def __init__(self, path: str, namespace: str):
+        self.path = path
+        self.namespace = namespace  # provider/model/dimensions: vectors of different models never mix
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode()).digest()
+
+    async def get_many(self, texts: Sequence[str]) -> dict[str, np.ndarray]:
+        return await asyncio.to_thread(self._get_many, texts)
+
+    async def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        await asyncio.to_thread(self._put_many, texts, vectors)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _get_many(self, texts: Sequence[str]) -> dict[str, np.ndarray]:
+        keys = {self.key(text): text for text in texts}
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            for start in range(0, len(key_list), 500):  # stay under SQLite's bound-parameter limit
+                chunk = key_list[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, vector in rows:
+                    found[keys[key]] = np.frombuffer(vector, dtype=np.float32).copy()
+        return found
+
+    def _put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        rows = [(self.key(text), vector.astype(np.float32).tobytes()) for text, vector in zip(texts, vectors)]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+class BaseEmbeddingProvider(ABC):
+    """Turns texts into float32 vectors.
+
+    Concurrent `embed()`/`embed_many()` calls are micro-batched: texts wait up to
+    `batch_window` seconds (or until `max_batch_size` are queued) and go upstream in one
+    call. Identical texts waiting or in flight are embedded once, and with `cache_path`
+    every vector is kept on disk by content hash, so no text is embedded twice.
+
+    Subclasses implement `_embed_batch()`, a single upstream call.
+    """
+
+    def __init__(self, config: EmbeddingConfig):
+        self.config = config
+        self.stats = EmbeddingStats()
+        self.cache = (
+            EmbeddingCache(config.cache_path, f"{config.provider}/{config.model}/{config.dimensions}")
+            if config.cache_path else None
+        )
+        self._queue: list[str] = []
+        self._in_flight: dict[str, asyncio.Future] = {}  # text -> its vector, queued or being fetched
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+        self._semaphore: asyncio.Semaphore | None = None  # created on the running loop
+
+    @abstractmethod
+    async def _embed_batch(self, texts: list[str]) -> Sequence[Sequence[float]]:
+        """One upstream call; vectors in the order of `texts`."""
+        pass
+
+    async def embed(self, text: str) -> np.ndarray:
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Vectors for `texts`, shape (len(texts), dimensions)."""
+        if not texts:
+            return np.zeros((0, self.config.dimensions or 0), dtype=np.float32)
+        self.stats.requested += len(texts)
+        unique = list(dict.fromkeys(texts))
+
+        found = {}
+        if self.cache is not None:
+            found = await self.cache.get_many([text for text in unique if text not in self._in_flight])
+            self.stats.cache_hits += len(found)
+        futures = {text: self._submit(text) for text in unique if text not in found}
+        if futures:
+            # Shielded: one caller giving up must not cancel a vector others are waiting for
+            vectors = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+            found.update(zip(futures, vectors))
+        return np.stack([found[text] for text in texts])
+
+    async def aclose(self) -> None:
+        """Wait for batches in flight, then release resources."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # Micro-batching
+
+    def _submit(self, text: str) -> asyncio.Future:
+        future = self._in_flight.get(text)
+        if future is not None:
+            self.stats.coalesced += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[text] = future
+        self._queue.append(text)
+        if len(self._queue) >= self.config.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.config.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        size = self.config.max_batch_size
+        while self._queue:
+            batch, self._queue = self._queue[:size], self._queue[size:]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, texts: list[str]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrent_batches)
+        try:
+            async with self._semaphore:
+                self.stats.upstream_calls += 1
+                self.stats.upstream_texts += len(texts)
+                vectors = np.asarray(await self._embed_batch(texts), dtype=np.float32)
+                if vectors.shape[0] != len(texts):
+                    raise ValueError(f"Expected {len(texts)} embeddings, got {vectors.shape[0]}")
+                if self.cache is not None:
+                    # Before resolving, so a request arriving right after finds it on disk
+                    await self.cache.put_many(texts, vectors)
+        except BaseException as e:
+            for text in texts:
+                future = self._in_flight.pop(text, None)
+                if future is None or future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody was waiting
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+
+        for text, vector in zip(texts, vectors):
+            future = self._in_flight.pop(text, None)
+            if future is not None and not future.done():
+                future.set_result(vector)
@@ -1,8 +1,9 @@
+import json
 from abc import ABC, abstractmethod
 from pydantic import BaseModel
 from core.base_tool import BaseTool, ExecutionContext
-from core.schemas import LLMResponse, LLMConfig
-from typing import Literal
+from core.schemas import LLMResponse, LLMConfig, StreamChunk, ToolCall, ToolCallDelta
+from typing import AsyncIterator, Iterator, Literal
 
 class BaseLLMProvider(ABC):
     def __init__(self, config: LLMConfig):
@@ -17,6 +18,114 @@ class BaseLLMProvider(ABC):
     ) -> LLMResponse:
         pass
 
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Yield text/tool-call deltas, then usage, then a "done" chunk with the full response.
+
+        Default falls back to a single non-streaming call for providers without native streaming.
+        """
+        response = await self.call(messages, tools=tools, response_format=response_format)
+        for chunk in replay_response(response):
+            yield chunk
+
     @abstractmethod
     def format_tools(self, tools: list[BaseTool]) -> list[dict]:
-        pass
\ No newline at end of file
+        pass
+
+    async def warm_up(self) -> None:
+        """Pre-connect to the backend. No-op unless the provider pools connections."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release network resources held by the provider."""
+        pass
+
+    async def __aenter__(self):
+        await self.warm_up()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+def replay_response(response: LLMResponse) -> Iterator[StreamChunk]:
+    """Turn a complete response into the chunk sequence stream() would have produced."""
+    if response.content:
+        yield StreamChunk(type="text_delta", text=response.content)
+    for i, tc in enumerate(response.tool_calls):
+        yield StreamChunk(
+            type="tool_call_delta",
+            tool_call=ToolCallDelta(
+                index=i,
+                tool_name=tc.tool_name,
+                arguments_delta=json.dumps(tc.arguments),
+            ),
+        )
+    if response.usage:
+        yield StreamChunk(type="usage", usage=response.usage)
+    yield StreamChunk(type="done", response=response)
+
+
+def incomplete_stream_response() -> LLMResponse:
+    """Error response for a stream that ended without its "done" chunk (dropped connection, provider bug)."""
+    return LLMResponse(
+        finish_reason="error",
+        raw={"error": {"message": "Provider stream ended before the response was complete"}},
+    )
+
+
+class StreamAccumulator:
+    """Collects stream deltas and assembles the final LLMResponse."""
+
+    def __init__(self):
+        self.text_parts: list[str] = []
+        self.tool_names: dict[int, str] = {}
+        self.tool_args: dict[int, list[str]] = {}
+        self.usage: dict[str, int] = {}
+        self.finish_reason: str | None = None
+
+    def add_text(self, text: str) -> StreamChunk:
+        self.text_parts.append(text)
+        return StreamChunk(type="text_delta", text=text)
+
+    def add_tool_call(self, index: int, tool_name: str | None, arguments_delta: str) -> StreamChunk:
+        if tool_name:
+            self.tool_names[index] = tool_name
+        self.tool_args.setdefault(index, []).append(arguments_delta or "")
+        return StreamChunk(
+            type="tool_call_delta",
+            tool_call=ToolCallDelta(index=index, tool_name=tool_name, arguments_delta=arguments_delta or ""),
+        )
+
+    def set_usage(self, prompt_tokens: int, completion_tokens: int) -> StreamChunk:
+        self.usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+        return StreamChunk(type="usage", usage=self.usage)
+
+    def build(self, raw=None) -> LLMResponse:
+        tool_calls = []
+        for index in sorted(self.tool_names):
+            args = "".join(self.tool_args.get(index, []))
+            try:
+                arguments = json.loads(args) if args else {}
+            except json.JSONDecodeError:
+                arguments = {}
+            tool_calls.append(ToolCall(tool_name=self.tool_names[index], arguments=arguments))
+
+        finish_reason = self.finish_reason or "stop"
+        if finish_reason not in ("stop", "tool_use", "length", "error"):
+            finish_reason = "stop"
+
+        return LLMResponse(
+            content="".join(self.text_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason="tool_use" if tool_calls else finish_reason,
+            usage=self.usage,
+            raw=raw,
+        )
+
+    def done(self, raw=None) -> StreamChunk:
+        return StreamChunk(type="done", response=self.build(raw))
\ No newline at end of file
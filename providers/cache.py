@@ -0,0 +1,247 @@
+# providers/cache.py
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pydantic import BaseModel
+from core.schemas import LLMResponse, StreamChunk
+from core.base_tool import BaseTool
+from providers.base_provider import BaseLLMProvider, replay_response
+from typing import AsyncIterator, Literal
+
+
+class CacheConfig(BaseModel):
+    max_memory_entries: int = 1024
+    ttl_seconds: float | None = 24 * 3600  # None = never expires
+    db_path: str | None = None  # SQLite file for the persistent tier, None = memory only
+    force: bool = False  # cache even when temperature > 0
+
+
+class CacheStats(BaseModel):
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0  # temperature > 0 without force
+    coalesced: int = 0  # waited on an identical in-flight request
+    evictions: int = 0  # dropped from the memory LRU
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """Memory LRU in front of an optional SQLite tier. Entries are LLMResponses without `raw`."""
+
+    def __init__(self, config: CacheConfig | None = None):
+        self.config = config or CacheConfig()
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[LLMResponse, float | None]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        if self.config.db_path:
+            self._db = sqlite3.connect(self.config.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+
+    async def get(self, key: str) -> LLMResponse | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            response, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._memory[key]
+                self.stats.expirations += 1
+            else:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return response.model_copy(deep=True)
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key)
+            if row is not None:
+                payload, expires_at = row
+                if expires_at is not None and expires_at < time.time():
+                    await asyncio.to_thread(self._db_delete, key)
+                    self.stats.expirations += 1
+                else:
+                    response = LLMResponse.model_validate_json(payload)
+                    self._remember(key, response, expires_at)
+                    self.stats.disk_hits += 1
+                    return response.model_copy(deep=True)
+
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, response: LLMResponse) -> None:
+        # Deep: the caller keeps using its response (e.g. adds to usage); SDK objects don't serialize
+        response = response.model_copy(update={"raw": None}, deep=True)
+        expires_at = time.time() + self.config.ttl_seconds if self.config.ttl_seconds else None
+        self._remember(key, response, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_put, key, response.model_dump_json(), expires_at)
+
+    async def clear(self) -> None:
+        self._memory.clear()
+        if self._db is not None:
+            await asyncio.to_thread(self._db_clear)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, response: LLMResponse, expires_at: float | None) -> None:
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _db_get(self, key: str) -> tuple[str, float | None] | None:
+        return self._db.execute(
+            "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _db_put(self, key: str, payload: str, expires_at: float | None) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+            (key, payload, expires_at),
+        )
+        self._db.commit()
+
+    def _db_delete(self, key: str) -> None:
+        self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        self._db.commit()
+
+    def _db_clear(self) -> None:
+        self._db.execute("DELETE FROM llm_cache")
+        self._db.commit()
+
+
+class CachedProvider(BaseLLMProvider):
+    """Wraps any provider with a content-addressed response cache.
+
+    Keyed on provider, model, messages, tool schemas and sampling params. Concurrent
+    identical calls share a single upstream request.
+    """
+
+    def __init__(self, provider: BaseLLMProvider, cache: ResponseCache | None = None):
+        super().__init__(provider.config)
+        self.provider = provider
+        self.cache = cache or ResponseCache()
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    async def call(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> LLMResponse:
+        if not self._cacheable():
+            self.cache.stats.bypassed += 1
+            return await self.provider.call(messages, tools=tools, response_format=response_format)
+
+        key = self.cache_key(messages, tools, response_format)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.cache.stats.coalesced += 1
+        else:
+            # Detached and registered before the first await: identical concurrent calls
+            # share it, and cancelling the caller that started it doesn't cancel it for them
+            task = asyncio.ensure_future(self._fetch(key, messages, tools, response_format))
+            task.add_done_callback(_mark_retrieved)
+            self._in_flight[key] = task
+        return (await asyncio.shield(task)).model_copy(deep=True)
+
+    async def _fetch(
+        self,
+        key: str,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+        response_format: Literal["text", "json"] | None,
+    ) -> LLMResponse:
+        try:
+            response = await self.cache.get(key)
+            if response is None:
+                response = await self.provider.call(messages, tools=tools, response_format=response_format)
+                if response.finish_reason != "error":
+                    await self.cache.set(key, response)
+            return response
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        if not self._cacheable():
+            self.cache.stats.bypassed += 1
+            async for chunk in self.provider.stream(messages, tools=tools, response_format=response_format):
+                yield chunk
+            return
+
+        key = self.cache_key(messages, tools, response_format)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            for chunk in replay_response(cached):
+                yield chunk
+            return
+
+        async for chunk in self.provider.stream(messages, tools=tools, response_format=response_format):
+            if chunk.type == "done" and chunk.response.finish_reason != "error":
+                await self.cache.set(key, chunk.response)
+            yield chunk
+
+    def format_tools(self, tools: list[BaseTool]) -> list[dict]:
+        return self.provider.format_tools(tools)
+
+    async def warm_up(self) -> None:
+        await self.provider.warm_up()
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+        self.cache.close()
+
+    def cache_key(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+        response_format: Literal["text", "json"] | None,
+    ) -> str:
+        payload = {
+            "provider": self.config.provider,
+            "model": self.config.model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "response_format": response_format or self.config.response_format,
+            "messages": messages,
+            "tools": self.provider.format_tools(tools) if tools else None,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _cacheable(self) -> bool:
+        return self.config.temperature == 0 or self.cache.config.force
+
+
+def _mark_retrieved(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()  # no warning when every caller was cancelled before it failed
@@ -0,0 +1,45 @@
+# providers/hashing.py
+
+import hashlib
+import re
+import numpy as np
+from core.schemas import EmbeddingConfig
+from providers.base_embedding import BaseEmbeddingProvider
+from typing import Sequence
+
+DEFAULT_DIMENSIONS = 256
+
+
+class HashingEmbeddingProvider(BaseEmbeddingProvider):
+    """Local feature-hashing embedder: no model, no network, same vector for the same text
+    on every machine.
+
+    Words and word bigrams are hashed (blake2b, not Python's salted `hash()`) into
+    `dimensions` signed buckets and the result is L2-normalized, so texts sharing words
+    score high under cosine similarity. Meant for offline tests and as a fallback, not for
+    semantic quality.
+    """
+
+    def __init__(self, config: EmbeddingConfig | None = None):
+        config = config or EmbeddingConfig(provider="hashing", model="hashing")
+        if config.dimensions is None:
+            config = config.model_copy(update={"dimensions": DEFAULT_DIMENSIONS})
+        super().__init__(config)
+
+    async def _embed_batch(self, texts: list[str]) -> Sequence[Sequence[float]]:
+        return self.embed_sync(texts)
+
+    def embed_sync(self, texts: Sequence[str]) -> np.ndarray:
+        dimensions = self.config.dimensions
+        vectors = np.zeros((len(texts), dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in _features(text):
+                bucket = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[row, bucket % dimensions] += 1.0 if bucket >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def _features(text: str) -> list[str]:
+    words = re.findall(r"\w+", text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
@@ -0,0 +1,164 @@
+# providers/http_pool.py
+
+import asyncio
+import time
+import httpx
+from contextlib import asynccontextmanager
+from pydantic import BaseModel
+from typing import AsyncIterator
+
+
+class HTTPPoolConfig(BaseModel):
+    # Each provider talks to a single host, so these limits are per host.
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = False  # requires the `h2` package
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+    pool_timeout: float = 30.0  # max wait for a free connection
+    warm_up_connections: int = 0  # pre-opened on warm_up()
+
+
+class HTTPPoolStats(BaseModel):
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused_connections / self.requests if self.requests else 0.0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+class PooledHTTPClient:
+    """Long-lived httpx client shared by all calls of one provider."""
+
+    def __init__(
+        self,
+        base_url: str,
+        config: HTTPPoolConfig | None = None,
+        headers: dict[str, str] | None = None,
+    ):
+        self.base_url = base_url
+        self.config = config or HTTPPoolConfig()
+        self.headers = headers or {}
+        self.stats = HTTPPoolStats()
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so providers can be built outside a running loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                http2=self.config.http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(
+                    self.config.timeout,
+                    connect=self.config.connect_timeout,
+                    pool=self.config.pool_timeout,
+                ),
+            )
+        return self._client
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        client = self.client
+        trace = _RequestTrace()
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = trace
+        started = time.perf_counter()
+        try:
+            return await client.request(method, path, extensions=extensions, **kwargs)
+        finally:
+            self._record(started, trace)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, path: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Like request(), but the body is read incrementally by the caller."""
+        client = self.client
+        trace = _RequestTrace()
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = trace
+        started = time.perf_counter()
+        recorded = False
+        try:
+            async with client.stream(method, path, extensions=extensions, **kwargs) as response:
+                self._record(started, trace)
+                recorded = True
+                yield response
+        finally:
+            if not recorded:
+                self._record(started, trace)
+
+    async def warm_up(self, path: str = "/", connections: int | None = None) -> int:
+        """Pre-open connections so the first LLM turn skips the TCP/TLS handshake.
+
+        Returns the number of connections that were opened successfully.
+        """
+        count = connections if connections is not None else self.config.warm_up_connections
+        if count <= 0:
+            return 0
+        count = min(count, self.config.max_keepalive_connections)
+
+        async def _ping() -> bool:
+            try:
+                await self.request("GET", path)
+                return True
+            except httpx.HTTPError:
+                return False
+
+        opened = await asyncio.gather(*(_ping() for _ in range(count)))
+        return sum(opened)
+
+    def reset_stats(self) -> None:
+        self.stats = HTTPPoolStats()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "PooledHTTPClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _record(self, started: float, trace: "_RequestTrace") -> None:
+        # Time until httpcore first touches a connection = time spent waiting for the pool
+        wait = (trace.first_event_at or time.perf_counter()) - started
+        self.stats.requests += 1
+        if trace.connected:
+            self.stats.new_connections += 1
+        else:
+            self.stats.reused_connections += 1
+        self.stats.total_wait_seconds += wait
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+
+
+class _RequestTrace:
+    """httpcore trace hook: detects new connections and pool acquisition time."""
+
+    def __init__(self):
+        self.first_event_at: float | None = None
+        self.connected = False
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        if self.first_event_at is None:
+            self.first_event_at = time.perf_counter()
+        if event_name == "connection.connect_tcp.started":
+            self.connected = True
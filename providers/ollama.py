@@ -1,15 +1,28 @@
-import httpx
+import json
 import warnings
-from core.schemas import LLMConfig, LLMResponse, ToolCall
+from core.schemas import EmbeddingConfig, LLMConfig, LLMResponse, ToolCall, StreamChunk
 from core.base_tool import BaseTool
-from providers.base_provider import BaseLLMProvider
-from typing import Literal
+from providers.base_embedding import BaseEmbeddingProvider
+from providers.base_provider import BaseLLMProvider, StreamAccumulator
+from providers.http_pool import PooledHTTPClient, HTTPPoolConfig, HTTPPoolStats
+from typing import AsyncIterator, Literal, Sequence
 
 
 class OllamaProvider(BaseLLMProvider):
-    def __init__(self, config: LLMConfig):
+    def __init__(self, config: LLMConfig, pool_config: HTTPPoolConfig | None = None):
         super().__init__(config)
         self.base_url = config.base_url or "http://localhost:11434"
+        self.http = PooledHTTPClient(self.base_url, config=pool_config)
+
+    @property
+    def pool_stats(self) -> HTTPPoolStats:
+        return self.http.stats
+
+    async def warm_up(self) -> None:
+        await self.http.warm_up("/api/version")
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
 
     async def call(
         self,
@@ -17,10 +30,65 @@ class OllamaProvider(BaseLLMProvider):
         tools: list[BaseTool] | None = None,
         response_format: Literal["text", "json"] | None = None,
     ) -> LLMResponse:
+        payload = self._build_payload(messages, tools, response_format, stream=False)
+
+        response = await self.http.post("/api/chat", json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        return self._parse_response(data)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        payload = self._build_payload(messages, tools, response_format, stream=True)
+
+        acc = StreamAccumulator()
+        last = None
+        async with self.http.stream("POST", "/api/chat", json=payload) as response:
+            response.raise_for_status()
+            # NDJSON: one message chunk per line, the last one has done=true and the counters
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                message = data.get("message", {})
+
+                if message.get("content"):
+                    yield acc.add_text(message["content"])
+                # Ollama sends each tool call whole, never split across chunks
+                for tc in message.get("tool_calls") or []:
+                    yield acc.add_tool_call(
+                        len(acc.tool_names),
+                        tc["function"]["name"],
+                        json.dumps(tc["function"]["arguments"]),
+                    )
+
+                if data.get("done"):
+                    last = data
+                    if data.get("done_reason") == "length":
+                        acc.finish_reason = "length"
+                    yield acc.set_usage(
+                        data.get("prompt_eval_count", 0),
+                        data.get("eval_count", 0),
+                    )
+
+        yield acc.done(raw=last)
+
+    def _build_payload(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+        response_format: Literal["text", "json"] | None,
+        stream: bool,
+    ) -> dict:
         payload = {
             "model": self.config.model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": self.config.temperature,
                 "num_predict": self.config.max_tokens,
@@ -39,16 +107,7 @@ class OllamaProvider(BaseLLMProvider):
         if fmt == "json":
             payload["format"] = "json"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=120.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        return self._parse_response(data)
+        return payload
 
     def format_tools(self, tools: list[BaseTool]) -> list[dict]:
         return [
@@ -85,4 +144,29 @@ class OllamaProvider(BaseLLMProvider):
                 "completion_tokens": data.get("eval_count", 0),
             },
             raw=data,
-        )
\ No newline at end of file
+        )
+
+
+class OllamaEmbeddingProvider(BaseEmbeddingProvider):
+    """`/api/embed`, which takes a list of inputs per request (e.g. nomic-embed-text)."""
+
+    def __init__(self, config: EmbeddingConfig, pool_config: HTTPPoolConfig | None = None):
+        super().__init__(config)
+        self.base_url = config.base_url or "http://localhost:11434"
+        self.http = PooledHTTPClient(self.base_url, config=pool_config)
+
+    @property
+    def pool_stats(self) -> HTTPPoolStats:
+        return self.http.stats
+
+    async def _embed_batch(self, texts: list[str]) -> Sequence[Sequence[float]]:
+        payload = {"model": self.config.model, "input": texts}
+        if self.config.dimensions:
+            payload["dimensions"] = self.config.dimensions
+        response = await self.http.post("/api/embed", json=payload)
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        await self.http.aclose()
@@ -1,9 +1,10 @@
 import os
 from openai import AsyncOpenAI
-from core.schemas import LLMConfig, LLMResponse, ToolCall
+from core.schemas import EmbeddingConfig, LLMConfig, LLMResponse, ToolCall, StreamChunk
 from core.base_tool import BaseTool
-from providers.base_provider import BaseLLMProvider
-from typing import Literal
+from providers.base_embedding import BaseEmbeddingProvider
+from providers.base_provider import BaseLLMProvider, StreamAccumulator
+from typing import AsyncIterator, Literal, Sequence
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -19,6 +20,52 @@ class OpenAIProvider(BaseLLMProvider):
         tools: list[BaseTool] | None = None,
         response_format: Literal["text", "json"] | None = None,
     ) -> LLMResponse:
+        kwargs = self._build_kwargs(messages, tools, response_format)
+
+        response = await self.client.chat.completions.create(**kwargs)
+
+        return self._parse_response(response)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        kwargs = self._build_kwargs(messages, tools, response_format)
+
+        acc = StreamAccumulator()
+        stream = await self.client.chat.completions.create(
+            **kwargs,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            # The usage chunk comes last and has no choices
+            if chunk.usage:
+                yield acc.set_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
+            for choice in chunk.choices:
+                delta = choice.delta
+                if delta.content:
+                    yield acc.add_text(delta.content)
+                for tc in delta.tool_calls or []:
+                    yield acc.add_tool_call(
+                        tc.index,
+                        tc.function.name if tc.function else None,
+                        tc.function.arguments if tc.function else "",
+                    )
+                if choice.finish_reason:
+                    acc.finish_reason = choice.finish_reason
+
+        yield acc.done()
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+        response_format: Literal["text", "json"] | None,
+    ) -> dict:
         kwargs = {
             "model": self.config.model,
             "max_tokens": self.config.max_tokens,
@@ -33,9 +80,10 @@ class OpenAIProvider(BaseLLMProvider):
         if fmt == "json":
             kwargs["response_format"] = {"type": "json_object"}
 
-        response = await self.client.chat.completions.create(**kwargs)
+        return kwargs
 
-        return self._parse_response(response)
+    async def aclose(self) -> None:
+        await self.client.close()
 
     def format_tools(self, tools: list[BaseTool]) -> list[dict]:
         return [
@@ -72,4 +120,25 @@ class OpenAIProvider(BaseLLMProvider):
                 "completion_tokens": response.usage.completion_tokens,
             },
             raw=response,
-        )
\ No newline at end of file
+        )
+
+
+class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
+    """`/v1/embeddings`, e.g. text-embedding-3-small. Set `dimensions` to shorten v3 vectors."""
+
+    def __init__(self, config: EmbeddingConfig):
+        super().__init__(config)
+        self.client = AsyncOpenAI(
+            api_key=config.api_key or os.getenv("OPENAI_API_KEY")
+        )
+
+    async def _embed_batch(self, texts: list[str]) -> Sequence[Sequence[float]]:
+        kwargs = {"model": self.config.model, "input": texts}
+        if self.config.dimensions:
+            kwargs["dimensions"] = self.config.dimensions
+        response = await self.client.embeddings.create(**kwargs)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        await self.client.close()
@@ -1,16 +1,35 @@
 import os
-import httpx
-from core.schemas import LLMConfig, LLMResponse, ToolCall
+import json
+from core.schemas import LLMConfig, LLMResponse, ToolCall, StreamChunk
 from core.base_tool import BaseTool
-from providers.base_provider import BaseLLMProvider
-from typing import Literal
+from providers.base_provider import BaseLLMProvider, StreamAccumulator
+from providers.http_pool import PooledHTTPClient, HTTPPoolConfig, HTTPPoolStats
+from typing import AsyncIterator, Literal
 
 
 class OpenRouterProvider(BaseLLMProvider):
-    def __init__(self, config: LLMConfig):
+    def __init__(self, config: LLMConfig, pool_config: HTTPPoolConfig | None = None):
         super().__init__(config)
         self.base_url = config.base_url or "https://openrouter.ai/api/v1"
         self.api_key = config.api_key or os.getenv("OPENROUTER_API_KEY")
+        self.http = PooledHTTPClient(
+            self.base_url,
+            config=pool_config,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    @property
+    def pool_stats(self) -> HTTPPoolStats:
+        return self.http.stats
+
+    async def warm_up(self) -> None:
+        await self.http.warm_up("/models")
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
 
     async def call(
         self,
@@ -18,6 +37,69 @@ class OpenRouterProvider(BaseLLMProvider):
         tools: list[BaseTool] | None = None,
         response_format: Literal["text", "json"] | None = None,
     ) -> LLMResponse:
+        payload = self._build_payload(messages, tools, response_format)
+
+        response = await self.http.post("/chat/completions", json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        return self._parse_response(data)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None = None,
+        response_format: Literal["text", "json"] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        payload = self._build_payload(messages, tools, response_format)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+        acc = StreamAccumulator()
+        async with self.http.stream("POST", "/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # SSE: skip keep-alive comments (": OPENROUTER PROCESSING") and blank lines
+                if not line.startswith("data:"):
+                    continue
+                body = line[len("data:"):].strip()
+                if body == "[DONE]":
+                    break
+                data = json.loads(body)
+
+                if "error" in data:
+                    acc.finish_reason = "error"
+                    yield acc.done(raw=data)
+                    return
+
+                if data.get("usage"):
+                    yield acc.set_usage(
+                        data["usage"].get("prompt_tokens", 0),
+                        data["usage"].get("completion_tokens", 0),
+                    )
+
+                for choice in data.get("choices", []):
+                    delta = choice.get("delta", {})
+                    if delta.get("content"):
+                        yield acc.add_text(delta["content"])
+                    for tc in delta.get("tool_calls") or []:
+                        function = tc.get("function", {})
+                        yield acc.add_tool_call(
+                            tc.get("index", 0),
+                            function.get("name"),
+                            function.get("arguments", ""),
+                        )
+                    if choice.get("finish_reason"):
+                        acc.finish_reason = choice["finish_reason"]
+
+        yield acc.done()
+
+    def _build_payload(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[BaseTool] | None,
+        response_format: Literal["text", "json"] | None,
+    ) -> dict:
         payload = {
             "model": self.config.model,
             "max_tokens": self.config.max_tokens,
@@ -32,22 +114,7 @@ class OpenRouterProvider(BaseLLMProvider):
         if fmt == "json":
             payload["response_format"] = {"type": "json_object"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-                timeout=120.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-            # print("API response:", data)
-            return self._parse_response(data)
-
-        return self._parse_response(data)
+        return payload
 
     def format_tools(self, tools: list[BaseTool]) -> list[dict]:
         return [
@@ -0,0 +1,19 @@
+# stubs.py
+#
+# Stand-ins shared by the offline tests.
+
+from core.schemas import LLMConfig
+from providers.base_provider import BaseLLMProvider
+
+
+class NoLLM(BaseLLMProvider):
+    """Provider for tool-only tests: any LLM call fails the test."""
+
+    def __init__(self, config: LLMConfig | None = None):
+        super().__init__(config or LLMConfig(provider="openai", model="stub"))
+
+    async def call(self, messages, tools=None, response_format=None):
+        raise AssertionError("a tool-only test called the LLM")
+
+    def format_tools(self, tools):
+        return []
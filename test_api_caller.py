@@ -0,0 +1,157 @@
+# test_api_caller.py
+#
+# ApiCallerTool against a local stand-in HTTP server: conditional requests, max-age,
+# no-store, invalidation, body caps, JSON projection and connection reuse.
+
+import asyncio
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from core.schemas import AgentState, ExecutionContext
+from tools.infrastructure.api_caller import ApiCallerInput, ApiCallerTool, HTTPCache, project
+
+ITEMS = {"total": 3, "items": [{"id": i, "name": f"item {i}", "blob": "x" * 200} for i in range(3)]}
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    hits: Counter = Counter()
+    version = 1
+
+    def do_GET(self):
+        StandIn.hits[self.path] += 1
+        if self.path == "/items":
+            etag = f'"v{StandIn.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", {"ETag": etag, "Cache-Control": "max-age=0"})
+            return self._send(200, json.dumps(ITEMS).encode(), {"ETag": etag, "Cache-Control": "max-age=0"}, "application/json")
+        if self.path == "/fresh":
+            return self._send(200, b'{"ok": true}', {"Cache-Control": "max-age=60"}, "application/json")
+        if self.path == "/no-store":
+            return self._send(200, b"secret", {"Cache-Control": "no-store, max-age=60"})
+        if self.path == "/private":
+            return self._send(200, b"mine", {"Cache-Control": "private, max-age=60"})
+        if self.path == "/big":
+            return self._send(200, b"a" * 1_000_000, {"Cache-Control": "max-age=60"})
+        self._send(404, b"not found", {})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StandIn.version += 1
+        self._send(201, b"{}", {}, "application/json")
+
+    def _send(self, status, body, headers, content_type="text/plain"):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def call(tool: ApiCallerTool, **kwargs):
+    return tool.execute(ApiCallerInput(**kwargs), CONTEXT)
+
+
+def test_etag_revalidation_and_invalidation():
+    server, base = serve()
+
+    async def run():
+        tool = ApiCallerTool()
+        first = await call(tool, url=f"{base}/items")
+        second = await call(tool, url=f"{base}/items")
+        assert first.data["cache"] == "miss" and second.data["cache"] == "revalidated"
+        assert second.data["body"] == ITEMS
+        await call(tool, url=f"{base}/items", method="POST", json_body={"name": "new"})
+        third = await call(tool, url=f"{base}/items")
+        assert third.data["cache"] == "miss"  # the POST dropped the entry
+        assert tool.cache.stats.revalidated == 1 and tool.cache.stats.invalidated == 1
+        await tool.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+def test_max_age_no_store_and_private():
+    server, base = serve()
+
+    async def run():
+        tool = ApiCallerTool(cache=HTTPCache())
+        for path in ("/fresh", "/no-store", "/private"):
+            for _ in range(3):
+                result = await call(tool, url=f"{base}{path}")
+                assert result.success
+        assert StandIn.hits["/fresh"] == 1
+        assert StandIn.hits["/no-store"] == 3 and StandIn.hits["/private"] == 3
+        bypass = await call(tool, url=f"{base}/fresh", headers={"Cache-Control": "no-cache"})
+        assert bypass.data["cache"] == "miss" and StandIn.hits["/fresh"] == 2
+        missing = await call(tool, url=f"{base}/nowhere")
+        assert not missing.success and missing.error == "HTTP 404"
+        # All calls went over a handful of keep-alive connections
+        stats = tool.pool_stats[base]
+        assert stats.reused_connections > stats.new_connections
+        await tool.aclose()
+
+    StandIn.hits.clear()
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+def test_body_cap_and_projection():
+    server, base = serve()
+
+    async def run():
+        tool = ApiCallerTool(max_response_bytes=100_000, max_result_chars=2_000)
+        big = await call(tool, url=f"{base}/big")
+        assert big.metadata["bytes"] == 100_000 and big.metadata["truncated"]
+        assert len(big.data["body"]) < 2_100
+        again = await call(tool, url=f"{base}/big")
+        assert again.data["cache"] == "miss"  # truncated bodies are never cached
+        projected = await call(tool, url=f"{base}/items", fields=["total", "items.*.id", "items.9.id"])
+        assert projected.data["body"] == {"total": 3, "items.*.id": [0, 1, 2], "items.9.id": None}
+        capped_json = await call(tool, url=f"{base}/items", max_bytes=50)
+        assert not capped_json.success and "larger than 50 bytes" in capped_json.error
+        await tool.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+def test_allowed_hosts():
+    async def run():
+        tool = ApiCallerTool(allowed_hosts=["api.internal", ".corp.example"])
+        blocked = await call(tool, url="http://169.254.169.254/latest/meta-data")
+        assert not blocked.success and "allowed_hosts" in blocked.error
+        scheme = await call(tool, url="file:///etc/passwd")
+        assert not scheme.success
+        tool._check_host(httpx.URL("https://billing.corp.example/v1"))  # subdomain: no error
+
+    asyncio.run(run())
+
+
+def test_project_paths():
+    data = {"a": [{"b": {"c": 1}}, {"b": {"c": 2}}, {"x": 0}], "n": None}
+    assert project(data, ["a.*.b.c", "a.1.b", "n.z", "missing"]) == {
+        "a.*.b.c": [1, 2, None], "a.1.b": {"c": 2}, "n.z": None, "missing": None,
+    }
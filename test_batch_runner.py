@@ -0,0 +1,79 @@
+# test_batch_runner.py
+#
+# BatchWorkflowRunner over tool-only workflows (no LLM calls): every input gets its
+# own session, and retry_failed() re-runs failed items under their original indexes
+# and session ids.
+
+import asyncio
+from pydantic import BaseModel
+from core.base_agent import AgentConfig, BaseAgent
+from core.base_tool import BaseTool
+from core.schemas import ExecutionContext, ToolResult, WorkflowDefinition, WorkflowStep
+from executors.batch_runner import BatchWorkflowRunner
+from stubs import NoLLM
+
+
+class EchoInput(BaseModel):
+    text: str
+
+
+class FlakyEchoTool(BaseTool):
+    """Echoes its input; fails for texts in `failing`. Records the session of every call."""
+
+    name = "echo"
+    description = "Echo text"
+    input_model = EchoInput
+
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+        self.sessions: dict[str, str] = {}
+
+    async def execute(self, input: EchoInput, context: ExecutionContext) -> ToolResult:
+        self.sessions[input.text] = context.session_id
+        if input.text in self.failing:
+            return ToolResult(success=False, error=f"can't echo {input.text}")
+        return ToolResult(success=True, data=input.text)
+
+
+WORKFLOW = WorkflowDefinition(
+    name="echo",
+    description="Echo one input",
+    steps=[WorkflowStep(name="echo", tool_name="echo", prompt="Echo it", input_override={"text": "{text}"})],
+)
+
+
+def make_runner(tool: FlakyEchoTool) -> BatchWorkflowRunner:
+    agent = BaseAgent(AgentConfig(name="batch", system_prompt="", tools=[tool]), NoLLM())
+    return BatchWorkflowRunner(agent, max_concurrency=2, batch_id="b")
+
+
+def test_run_gives_each_input_a_session():
+    async def main():
+        tool = FlakyEchoTool(failing={"x1"})
+        runner = make_runner(tool)
+        results = [result async for result in runner.run(WORKFLOW, [{"text": f"x{i}"} for i in range(5)])]
+        assert sorted(r.index for r in results) == [0, 1, 2, 3, 4]
+        assert tool.sessions == {f"x{i}": f"b:{i}" for i in range(5)}
+        assert runner.metrics.completed == 4 and runner.metrics.failed == 1
+        assert [r.index for r in runner.failed] == [1] and "echo" in runner.failed[0].error
+
+    asyncio.run(main())
+
+
+def test_retry_failed_keeps_indexes_and_sessions():
+    async def main():
+        tool = FlakyEchoTool(failing={"x3", "x5"})
+        runner = make_runner(tool)
+        inputs = [{"text": f"x{i}"} for i in range(6)]
+        [result async for result in runner.run(WORKFLOW, inputs)]
+        assert sorted(r.index for r in runner.failed) == [3, 5]
+
+        tool.failing.clear()
+        tool.sessions.clear()
+        retried = [result async for result in runner.retry_failed(WORKFLOW)]
+        assert sorted(r.index for r in retried) == [3, 5] and all(r.success for r in retried)
+        assert tool.sessions == {"x3": "b:3", "x5": "b:5"}  # not b:0 / b:1, which belong to other items
+        assert {r.index: r.results["echo"].data for r in retried} == {3: "x3", 5: "x5"}
+        assert runner.failed == []
+
+    asyncio.run(main())
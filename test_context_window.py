@@ -0,0 +1,72 @@
+# test_context_window.py
+#
+# Context policies: KeepLastN (including n=0), budget fitting that always keeps the
+# latest turn, and SummarizeOldestPolicy's summary lookup after appends and rewinds.
+
+import asyncio
+from core.schemas import LLMConfig, LLMResponse
+from memory.context_window import KeepLastNPolicy, SlidingWindowPolicy, SummarizeOldestPolicy, TokenEstimator
+from providers.base_provider import BaseLLMProvider
+
+
+class CountingSummarizer(BaseLLMProvider):
+    def __init__(self):
+        super().__init__(LLMConfig(provider="openai", model="stub"))
+        self.calls = 0
+
+    async def call(self, messages, tools=None, response_format=None) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=f"summary {self.calls}", finish_reason="stop")
+
+    def format_tools(self, tools):
+        return []
+
+
+def messages(count: int, chars: int = 36, tag: str = "m") -> list[dict[str, str]]:
+    # 36 chars = 9 tokens + 4 overhead = 13 tokens per message
+    return [{"role": "user", "content": f"{tag}{i}".ljust(chars, ".")} for i in range(count)]
+
+
+def test_keep_last_n():
+    history = messages(10)
+    assert KeepLastNPolicy(n=3).select(history, 1_000) == history[-3:]
+    assert KeepLastNPolicy(n=0).select(history, 1_000) == []
+    assert KeepLastNPolicy(n=5).select(history, 13 * 2) == history[-2:]
+
+
+def test_latest_turn_is_kept_truncated():
+    estimator = TokenEstimator()
+    history = messages(3) + [{"role": "user", "content": "q" * 4_000}]  # 1000 tokens
+    for policy in (KeepLastNPolicy(n=10), SlidingWindowPolicy(pinned=1)):
+        selected = policy.select(history, 200)
+        latest = selected[-1]
+        assert latest["content"].startswith("qqqq") and latest["content"].endswith(TokenEstimator.TRUNCATED)
+        assert estimator.count_message(latest) <= 200 - (13 if isinstance(policy, SlidingWindowPolicy) else 0)
+    assert history[-1]["content"] == "q" * 4_000  # the chat history itself is untouched
+    assert KeepLastNPolicy(n=10).select([], 10) == []
+
+
+def test_summaries_follow_the_history():
+    async def main():
+        summarizer = CountingSummarizer()
+        policy = SummarizeOldestPolicy(summarizer, pinned=1, min_batch=4, summary_budget_ratio=0.0)
+        history = messages(1, tag="task") + messages(20)
+        budget = 13 * 6
+
+        await policy.prepare(history, budget)
+        assert summarizer.calls == 1
+        selected = policy.select(history, budget)
+        assert selected[0] == history[0] and selected[1]["content"].endswith("summary 1")
+        assert selected[-1] == history[-1]
+
+        # Appending keeps the summary; preparing again without enough new overflow is free
+        history.append({"role": "assistant", "content": "ok"})
+        await policy.prepare(history, budget)
+        assert summarizer.calls == 1 and policy.select(history, budget)[1]["content"].endswith("summary 1")
+
+        # A rewound history with a different prefix must not get the old summary
+        rewound = history[:1] + messages(20, tag="other")
+        assert policy._latest_summary(rewound[1:]) == (0, None)
+        assert policy.select(rewound, budget)[1] == rewound[-5]
+
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+# test_duckduckgo_search.py
+#
+# DuckDuckGoSearchTool with a stand-in upstream: identical searches in flight are shared,
+# and a caller that is cancelled or times out doesn't take the shared search down with it.
+
+import asyncio
+from core.schemas import AgentState, ExecutionContext
+from tools.infrastructure.duckduckgo_search import DuckDuckGoSearchTool, DuckSearchInput
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+
+class StandInSearch(DuckDuckGoSearchTool):
+    def __init__(self, delay: float = 0.0, error: str | None = None):
+        super().__init__()
+        self.delay = delay
+        self.error = error
+
+    async def _search_upstream(self, search_key: str, max_results: int) -> list[dict]:
+        self.searches += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return [{"title": search_key, "href": f"https://example.com/{i}"} for i in range(max_results)]
+
+
+def test_identical_searches_share_one_request():
+    async def main():
+        tool = StandInSearch(delay=0.05)
+        first, second = await asyncio.gather(tool.search("Python  asyncio", 2), tool.search("python asyncio", 2))
+        assert first == second and len(first) == 2
+        assert tool.searches == 1 and tool.cache_hits == 1
+
+        first[0]["title"] = "changed"  # callers get their own copies
+        assert (await tool.search("python asyncio", 2))[0]["title"] == "Python  asyncio"
+        assert tool.searches == 1 and tool.cache_hits == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def main():
+        tool = StandInSearch(delay=0.1)
+        leader = asyncio.create_task(tool.execute(DuckSearchInput(search_key="news"), CONTEXT))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(tool.execute(DuckSearchInput(search_key="news"), CONTEXT))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        result = await follower
+        assert result.success and [r["href"] for r in result.data["results"]][0] == "https://example.com/0"
+        assert leader.cancelled() and tool.searches == 1
+
+        # The search finished for the cache even though its starter gave up on it
+        timed_out = StandInSearch(delay=0.1)
+        try:
+            await asyncio.wait_for(timed_out.search("news"), timeout=0.01)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("expected a timeout")
+        assert len(await timed_out.search("news")) == 5 and timed_out.searches == 1
+
+    asyncio.run(main())
+
+
+def test_failures_are_reported_not_returned():
+    async def main():
+        tool = StandInSearch(error="rate limited")
+        result = await tool.execute(DuckSearchInput(search_key=["a", "b"]), CONTEXT)
+        assert not result.success and result.error == "rate limited; rate limited"
+        assert not tool._in_flight
+
+        class CancelledSearch(StandInSearch):
+            async def search(self, search_key: str, max_results: int = 5) -> list[dict]:
+                if search_key == "gone":
+                    raise asyncio.CancelledError()
+                return await super().search(search_key, max_results)
+
+        result = await CancelledSearch().execute(DuckSearchInput(search_key=["gone", "kept"], max_results=1), CONTEXT)
+        assert result.success and [r["title"] for r in result.data["results"]] == ["kept"]
+        assert list(result.data["errors"]) == ["gone"]
+
+    asyncio.run(main())
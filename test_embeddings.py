@@ -0,0 +1,76 @@
+# test_embeddings.py
+#
+# Micro-batching, coalescing and the disk cache of BaseEmbeddingProvider, using the local
+# hashing embedder.
+
+import asyncio
+import os
+import tempfile
+import numpy as np
+from core.schemas import EmbeddingConfig
+from providers.hashing import HashingEmbeddingProvider
+
+
+class FailingEmbedder(HashingEmbeddingProvider):
+    async def _embed_batch(self, texts):
+        raise RuntimeError("upstream down")
+
+
+def test_deterministic_and_normalized():
+    async def run():
+        first = await HashingEmbeddingProvider().embed_many(["the cat sat", "a dog barked"])
+        second = await HashingEmbeddingProvider().embed_many(["the cat sat", "a dog barked"])
+        assert first.shape == (2, 256) and first.dtype == np.float32
+        assert np.array_equal(first, second)
+        assert np.allclose(np.linalg.norm(first, axis=1), 1.0)
+        related, unrelated = await HashingEmbeddingProvider().embed_many(["the cat sat down", "stock prices fell"])
+        assert first[0] @ related > first[0] @ unrelated
+    asyncio.run(run())
+
+
+def test_concurrent_requests_share_upstream_calls():
+    async def run():
+        embedder = HashingEmbeddingProvider(EmbeddingConfig(provider="hashing", model="hashing", max_batch_size=64))
+        texts = [f"text number {i}" for i in range(200)]
+        vectors = await asyncio.gather(*(embedder.embed(text) for text in texts))
+        assert embedder.stats.upstream_calls == 4  # 64 + 64 + 64 + 8
+        assert embedder.stats.upstream_texts == 200
+        assert np.array_equal(np.stack(vectors), embedder.embed_sync(texts))
+    asyncio.run(run())
+
+
+def test_identical_texts_embedded_once():
+    async def run():
+        embedder = HashingEmbeddingProvider()
+        await asyncio.gather(*(embedder.embed("same chunk") for _ in range(10)), embedder.embed_many(["same chunk"] * 5))
+        assert embedder.stats.upstream_texts == 1
+        assert embedder.stats.coalesced == 10
+    asyncio.run(run())
+
+
+def test_disk_cache_survives_restart():
+    async def run(path: str):
+        config = EmbeddingConfig(provider="hashing", model="hashing", cache_path=path)
+        async with HashingEmbeddingProvider(config) as embedder:
+            first = await embedder.embed_many(["alpha", "beta"])
+        async with HashingEmbeddingProvider(config) as embedder:
+            second = await embedder.embed_many(["beta", "alpha", "gamma"])
+            assert embedder.stats.cache_hits == 2
+            assert embedder.stats.upstream_texts == 1
+        assert np.array_equal(second[:2], first[::-1])
+        # Another model's vectors are not served from the same file
+        async with HashingEmbeddingProvider(config.model_copy(update={"dimensions": 64})) as embedder:
+            assert (await embedder.embed("alpha")).shape == (64,)
+            assert embedder.stats.cache_hits == 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(os.path.join(directory, "embeddings.db")))
+
+
+def test_upstream_error_reaches_every_caller():
+    async def run():
+        embedder = FailingEmbedder()
+        results = await asyncio.gather(embedder.embed("a"), embedder.embed("b"), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not embedder._in_flight
+    asyncio.run(run())
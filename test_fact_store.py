@@ -0,0 +1,124 @@
+# test_fact_store.py
+#
+# FactStore: BM25 ranking of keyword matches (entity weighted over attribute and value),
+# plain-text queries, the entity filter, upserts keyed by (entity, attribute) that keep
+# the FTS index in sync, and TTL expiry.
+
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from memory.long_term.fact_store import Fact, FactStore
+
+FACTS = [
+    Fact(entity="alice", attribute="employer", value="Acme Corporation"),
+    Fact(entity="alice", attribute="city", value="Paris"),
+    Fact(entity="bob", attribute="employer", value="Globex"),
+    Fact(entity="bob", attribute="favourite_food", value="pizza in Paris, pizza in Rome, pizza anywhere"),
+    Fact(entity="paris", attribute="country", value="France"),
+    Fact(entity="carol", attribute="note", value="visited Paris once"),
+]
+
+
+async def make_store(path: str = ":memory:") -> FactStore:
+    store = FactStore(path)
+    assert await store.add_many(FACTS) == len(FACTS)
+    return store
+
+
+def test_bm25_ranking():
+    async def main():
+        store = await make_store()
+        results = await store.search("paris")
+        assert len(results) == 4
+        # The entity column weighs double
+        assert (results[0].entity, results[0].attribute) == ("paris", "country")
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+        assert all(r.score > 0 and r.id is not None for r in results)
+
+        # Rarer and repeated terms rank higher
+        results = await store.search("pizza paris")
+        assert results[0].attribute == "favourite_food"
+        assert len(await store.search("paris", k=2)) == 2
+
+    asyncio.run(main())
+
+
+def test_plain_text_queries():
+    async def main():
+        store = await make_store()
+        # Stopwords are dropped, words are OR-ed, punctuation is ignored
+        results = await store.search("Where does the employer of Alice work?")
+        found = {(r.entity, r.attribute) for r in results}
+        assert found == {("alice", "employer"), ("alice", "city"), ("bob", "employer")}
+        assert results[0].attribute == "employer" and results[0].entity == "alice"
+
+        # The last word is a prefix match; stemming matches other forms of the rest
+        assert [r.entity for r in await store.search("Glob")] == ["bob"]
+        assert {r.entity for r in await store.search("visits to Glob")} == {"carol", "bob"}
+        assert await store.search("what is the") == []
+        assert await store.search('"unbalanced ( quotes*') == []  # no FTS5 syntax error
+
+    asyncio.run(main())
+
+
+def test_entity_filter():
+    async def main():
+        store = await make_store()
+        results = await store.search("paris", entity="alice")
+        assert [(r.entity, r.attribute) for r in results] == [("alice", "city")]
+        assert await store.search("globex", entity="alice") == []
+
+        assert [f.attribute for f in await store.get("alice")] == ["city", "employer"]
+        assert [f.value for f in await store.get("alice", "employer")] == ["Acme Corporation"]
+        assert await store.get("nobody") == []
+
+    asyncio.run(main())
+
+
+def test_upsert_replaces_in_place():
+    async def main():
+        path = os.path.join(tempfile.mkdtemp(), "facts.db")
+        store = await make_store(path)
+        before = (await store.get("alice", "employer"))[0]
+        await store.add(Fact(entity="alice", attribute="employer", value="Initech", source="chat"))
+        assert await store.count() == len(FACTS)
+
+        after = (await store.get("alice", "employer"))[0]
+        assert after.id == before.id and after.value == "Initech" and after.source == "chat"
+        assert after.timestamp >= before.timestamp
+        # The FTS index follows the update: the old value no longer matches
+        assert await store.search("acme") == []
+        assert [r.value for r in await store.search("initech")] == ["Initech"]
+
+        assert await store.delete("alice", "employer") == 1
+        assert await store.search("initech") == []
+        assert await store.delete("bob") == 2
+        assert await store.count() == len(FACTS) - 3
+        store.close()
+
+        reopened = FactStore(path)
+        assert [f.attribute for f in await reopened.get("alice")] == ["city"]
+        assert [r.entity for r in await reopened.search("france")] == ["paris"]
+        reopened.close()
+
+    asyncio.run(main())
+
+
+def test_expired_facts_stop_matching():
+    async def main():
+        store = FactStore(default_ttl=60)
+        await store.add(Fact(entity="weather", attribute="today", value="sunny"))
+        await store.add(Fact(entity="weather", attribute="yesterday", value="sunny"), ttl=0.01)
+        await store.add(Fact(
+            entity="weather", attribute="last_year", value="sunny",
+            expires_at=datetime.now() - timedelta(seconds=1),
+        ))
+        time.sleep(0.02)
+        assert [r.attribute for r in await store.search("sunny")] == ["today"]
+        assert [f.attribute for f in await store.get("weather")] == ["today"]
+        assert (await store.get("weather"))[0].expires_at is not None
+        assert await store.purge_expired() == 2 and await store.count() == 1
+
+    asyncio.run(main())
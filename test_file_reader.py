@@ -0,0 +1,126 @@
+# test_file_reader.py
+#
+# FileReaderTool on temporary files: the sparse line index (across checkpoints and after
+# the file changes), tail, search, encoding detection, and the output caps of every mode.
+
+import codecs
+import os
+import tempfile
+from core.schemas import AgentState, ExecutionContext
+from tools.infrastructure.file_reader import CHECKPOINT_EVERY, FileReaderInput, FileReaderTool, detect_encoding
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+
+def write(data: bytes, name: str = "file.txt") -> str:
+    path = os.path.join(tempfile.mkdtemp(), name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def numbered_file(lines: int) -> str:
+    return write("".join(f"line {i}\n" for i in range(1, lines + 1)).encode())
+
+
+def read(tool: FileReaderTool, path: str, **kwargs) -> dict:
+    result = tool.run(FileReaderInput(path=path, **kwargs), CONTEXT)
+    assert result.success, result.error
+    return result.data
+
+
+def test_line_index():
+    tool = FileReaderTool()
+    path = numbered_file(5 * CHECKPOINT_EVERY + 7)
+    for start in (1, CHECKPOINT_EVERY, CHECKPOINT_EVERY + 1, 3 * CHECKPOINT_EVERY + 5, 5 * CHECKPOINT_EVERY + 6):
+        data = read(tool, path, start=start, count=2)
+        assert data["content"].split("\n")[0] == f"{start}\tline {start}"
+    data = read(tool, path, start=5 * CHECKPOINT_EVERY + 7, count=5)
+    assert data["content"] == f"{5 * CHECKPOINT_EVERY + 7}\tline {5 * CHECKPOINT_EVERY + 7}"
+    assert data["next_start"] is None and data["total_lines"] == 5 * CHECKPOINT_EVERY + 7
+    assert read(tool, path, start=10**6)["content"] == ""
+    assert read(tool, path, mode="info")["total_lines"] == 5 * CHECKPOINT_EVERY + 7
+
+    # Rewritten file: the cached index is dropped
+    with open(path, "w") as f:
+        f.write("new first\nnew second")
+    data = read(tool, path, start=2, count=1)
+    assert data["content"] == "2\tnew second" and data["total_lines"] == 2
+
+
+def test_tail():
+    tool = FileReaderTool()
+    path = numbered_file(3000)
+    data = read(tool, path, mode="tail", count=3)
+    assert data["content"] == "line 2998\nline 2999\nline 3000" and data["lines"] == 3  # index not built yet
+
+    read(tool, path, mode="info")  # builds the index: now line numbers are known
+    data = read(tool, path, mode="tail", count=2)
+    assert data["content"] == "2999\tline 2999\n3000\tline 3000"
+
+    no_newline = write(b"a\nb\nc")
+    assert read(tool, no_newline, mode="tail", count=5)["content"] == "a\nb\nc"
+
+
+def test_search():
+    tool = FileReaderTool()
+    path = write(b"alpha\nBeta\ngamma beta\ndelta\nbeta again\n")
+    data = read(tool, path, mode="search", pattern="beta")
+    assert data["content"] == "3:gamma beta\n5:beta again" and not data["more_matches"]
+    data = read(tool, path, mode="search", pattern="beta", ignore_case=True, max_matches=2)
+    assert data["content"] == "2:Beta\n3:gamma beta" and data["more_matches"]
+    assert list(tool.iter_matches(path, "^[ad]")) == [(1, "alpha"), (4, "delta")]
+    assert not tool.run(FileReaderInput(path=path, mode="search", pattern="("), CONTEXT).success
+
+
+def test_encoding_detection():
+    assert detect_encoding(b"plain ascii\n") == ("utf-8", False)
+    assert detect_encoding("héllo".encode("utf-8")) == ("utf-8", False)
+    assert detect_encoding("héllo".encode("cp1252")) == ("cp1252", False)
+    assert detect_encoding(codecs.BOM_UTF8 + b"x") == ("utf-8-sig", False)
+    assert detect_encoding("line\n".encode("utf-16-le") * 10) == ("utf-16-le", False)
+    assert detect_encoding(bytes(range(256)) * 4)[1]  # binary
+
+    tool = FileReaderTool()
+    utf16 = write(codecs.BOM_UTF16_LE + "eins\nzwei\ndrei\n".encode("utf-16-le"))
+    assert read(tool, utf16, start=2, count=1)["content"] == "2\tzwei"
+    assert read(tool, utf16, mode="tail", count=1)["content"] == "3\tdrei"
+    assert read(tool, utf16, mode="search", pattern="ei$")["matches"] == 2
+    latin = write("café\n".encode("cp1252"))
+    data = read(tool, latin)
+    assert data["encoding"] == "cp1252" and data["content"] == "1\tcafé"
+
+
+def test_output_caps():
+    tool = FileReaderTool(max_output_chars=200, max_line_chars=50)
+    path = numbered_file(1000)
+
+    data = read(tool, path, count=1000)
+    assert len(data["content"]) <= 200
+    shown = data["content"].split("\n")
+    assert data["next_start"] == len(shown) + 1  # continue right after the last line shown
+    assert read(tool, path, start=data["next_start"], count=1)["content"].startswith(f"{data['next_start']}\t")
+
+    read(tool, path, mode="info")
+    data = read(tool, path, mode="tail", count=1000)
+    assert len(data["content"]) <= 200 and data["content"].endswith("1000\tline 1000")
+    assert data["lines"] == len(data["content"].split("\n"))
+
+    # Collecting stops at the budget: a huge count doesn't decode lines that can't be shown
+    decoded = []
+    decode_line = tool._decode_line
+    tool._decode_line = lambda *args: decoded.append(args) or decode_line(*args)
+    read(tool, path, count=1000)
+    read(tool, path, mode="tail", count=1000)
+    assert len(decoded) < 50
+    del tool._decode_line
+
+    long_line = write(b"x" * 1_000_000 + b"\nshort\n")
+    data = read(tool, long_line, count=2)
+    assert data["content"].startswith("1\t" + "x" * 50 + " [line truncated]") and len(data["content"]) <= 200
+
+    data = read(tool, long_line, mode="bytes", start=0, count=10_000)
+    assert len(data["content"]) == 200 and data["next_offset"] == 200
+
+    data = read(tool, path, mode="search", pattern="line", max_matches=1000)
+    assert len(data["content"]) <= 200 and data["more_matches"]
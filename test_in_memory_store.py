@@ -0,0 +1,127 @@
+# test_in_memory_store.py
+#
+# InMemoryStateStore under a byte budget: LRU and LFU pick the right sessions to evict,
+# evicted sessions spilled to disk load back unchanged, and load_view() hands out a
+# read-only view that rejects writes.
+
+import asyncio
+import os
+import tempfile
+from core.schemas import AgentState
+from memory.state_store.codec import StateCodec
+from memory.state_store.in_memory import InMemoryStateStore
+from memory.state_store.read_only import ReadOnlyError
+
+
+def make_state(label: str) -> AgentState:
+    return AgentState(
+        current_step=label,
+        outputs={"answer": label * 50},
+        chat_history=[{"role": "user", "content": f"{label} {i}"} for i in range(10)],
+    )
+
+
+# Every make_state() has the same size; the budget holds three of them
+STATE_BYTES = len(StateCodec(compress_threshold=None).encode_state(make_state("a")))
+BUDGET = 3 * STATE_BYTES + STATE_BYTES // 2
+
+
+def test_lru_evicts_least_recently_used():
+    async def main():
+        store = InMemoryStateStore(max_bytes=BUDGET)
+        for label in "abc":
+            await store.save(label, make_state(label))
+        await store.load("a")  # "b" is now the least recently used
+        await store.save("d", make_state("d"))
+        assert await store.list_keys() == ["a", "c", "d"]
+
+        await store.save("e", make_state("e"))  # then "c"
+        assert await store.list_keys() == ["a", "d", "e"]
+        assert store.stats.evictions == 2 and store.stats.resident_bytes <= BUDGET
+        assert await store.load("b") is None and store.stats.misses == 1
+
+    asyncio.run(main())
+
+
+def test_lfu_evicts_least_frequently_used():
+    async def main():
+        store = InMemoryStateStore(max_bytes=BUDGET, eviction="lfu")
+        for label in "abc":
+            await store.save(label, make_state(label))
+        for _ in range(3):
+            await store.load("a")
+        await store.load("c")
+        # "b" has been used least; "a" stays although "c" was used after it
+        await store.save("d", make_state("d"))
+        assert await store.list_keys() == ["a", "c", "d"]
+
+        # Among equally used sessions, the least recently used goes first
+        await store.save("e", make_state("e"))
+        assert await store.list_keys() == ["a", "c", "e"]
+
+    asyncio.run(main())
+
+
+def test_spilled_sessions_load_back():
+    async def main():
+        spill_dir = tempfile.mkdtemp()
+        store = InMemoryStateStore(max_bytes=BUDGET, spill_dir=spill_dir)
+        for label in "abcde":
+            await store.save(label, make_state(label))
+        stats = store.stats
+        assert stats.resident_sessions == 3 and stats.spilled_sessions == 2
+        assert len(os.listdir(spill_dir)) == 2
+        assert await store.list_keys() == ["a", "b", "c", "d", "e"]
+        assert await store.exists("a")
+
+        # Loading a spilled session brings it back into memory and deletes its file
+        assert await store.load("a") == make_state("a")
+        assert store.stats.spill_hits == 1 and store.stats.spilled_sessions == 2  # "c" went out for it
+        assert await store.load("a") == make_state("a")
+        assert store.stats.spill_hits == 1
+
+        # A save replaces the spilled copy, a delete removes it
+        await store.save("b", make_state("b").model_copy(update={"feedback": "changed"}))
+        assert (await store.load("b")).feedback == "changed"
+        await store.delete("c")
+        assert not await store.exists("c") and await store.load("c") is None
+        assert os.listdir(spill_dir) == ["d.state"]
+
+    asyncio.run(main())
+
+
+def test_view_rejects_writes():
+    async def main():
+        store = InMemoryStateStore()
+        await store.save("s", make_state("s"))
+        view = await store.load_view("s")
+        assert view.current_step == "s" and view.chat_history[0]["content"] == "s 0"
+        for write in (
+            lambda: setattr(view, "current_step", "x"),
+            lambda: delattr(view, "feedback"),
+        ):
+            try:
+                write()
+            except ReadOnlyError:
+                pass
+            else:
+                raise AssertionError("expected ReadOnlyError")
+        for write in (
+            lambda: view.outputs.__setitem__("answer", "x"),
+            lambda: view.chat_history.append({"role": "user", "content": "x"}),
+            lambda: view.chat_history[0].__setitem__("content", "x"),
+        ):
+            try:
+                write()
+            except (TypeError, AttributeError):
+                pass
+            else:
+                raise AssertionError("expected the view to reject the write")
+
+        assert await store.load("s") == make_state("s")
+        thawed = view.thaw()
+        thawed.current_step = "x"  # a copy, not the stored state
+        assert (await store.load("s")).current_step == "s"
+        assert await store.load_view("missing") is None
+
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+# test_journal.py
+#
+# JournalStateStore: after any sequence of changes (appends, rewinds, mutated attempts,
+# outputs, feedback, position, snapshots), replaying snapshot + journal gives back the
+# live state, with or without compaction; compaction bounds the journal, and a torn
+# last line or a crash between snapshot and truncation replays correctly.
+
+import asyncio
+import random
+import tempfile
+from core.schemas import AgentState, Attempt, ToolResult
+from memory.state_store.journal import JournalStateStore
+
+
+def dump(state: AgentState) -> dict:
+    return state.model_dump(mode="json")
+
+
+def mutate(state: AgentState, rng: random.Random, n: int) -> None:
+    """One random change of the kind executors make."""
+    action = rng.randrange(9)
+    if action <= 2:
+        state.chat_history.append({"role": rng.choice(["user", "assistant"]), "content": f"message {n}"})
+    elif action == 3:
+        state.attempts.append(Attempt(step=f"step{n % 4}", attempt_number=1))
+    elif action == 4 and state.attempts:
+        state.attempts[-1].tool_results.append(ToolResult(success=True, data=n))  # filled in after appending
+    elif action == 5:
+        # GO_BACK: the history is replaced by a shorter copy, then continues differently
+        cut = rng.randrange(len(state.chat_history) + 1)
+        state.chat_history = state.chat_history[:cut] + [{"role": "user", "content": f"rewound {n}"}]
+        state.attempts = state.attempts[:rng.randrange(len(state.attempts) + 1)]
+    elif action == 6:
+        if state.outputs and rng.random() < 0.3:
+            state.outputs.pop(rng.choice(sorted(state.outputs)))
+        else:
+            state.outputs[f"step{n % 4}"] = {"value": n}
+    elif action == 7:
+        state.feedback = rng.choice([None, f"feedback {n}"])
+        state.current_step, state.current_attempt = f"step{n % 4}", n % 3 + 1
+    else:
+        state.snapshots[f"step{n % 4}"] = f"s:snapshot:step{n % 4}"
+
+
+def test_replay_matches_live_state():
+    async def main():
+        for compact_every in (5, 37, 10_000):
+            directory = tempfile.mkdtemp()
+            store = JournalStateStore(directory, compact_every=compact_every)
+            rng = random.Random(compact_every)
+            state = AgentState()
+            for n in range(300):
+                mutate(state, rng, n)
+                if rng.random() < 0.7:  # not every change is saved right away
+                    await store.save("s", state)
+            await store.save("s", state)
+
+            replayed = await JournalStateStore(directory).load("s")  # another process, no cached view
+            assert dump(replayed) == dump(state), compact_every
+            if compact_every < 300:
+                assert len(await store.read_events("s")) < compact_every
+
+    asyncio.run(main())
+
+
+def test_compaction_keeps_state_and_resets_journal():
+    async def main():
+        directory = tempfile.mkdtemp()
+        store = JournalStateStore(directory, compact_every=10_000)
+        state = AgentState()
+        for n in range(50):
+            state.chat_history.append({"role": "user", "content": f"m{n}"})
+            await store.save("s", state)
+        assert len(await store.read_events("s")) == 50
+
+        await store.compact("s", state)
+        assert await store.read_events("s") == []
+        state.chat_history.append({"role": "assistant", "content": "after"})
+        await store.save("s", state)
+        events = await store.read_events("s")
+        assert [event.type for event in events] == ["message_appended"] and events[0].seq == 51
+        assert dump(await JournalStateStore(directory).load("s")) == dump(state)
+
+    asyncio.run(main())
+
+
+def test_crash_recovery():
+    async def main():
+        directory = tempfile.mkdtemp()
+        store = JournalStateStore(directory)
+        state = AgentState()
+        for n in range(5):
+            state.chat_history.append({"role": "user", "content": f"m{n}"})
+            await store.save("s", state)
+
+        # Torn last write: the partial line is ignored, and later events don't land on it
+        with open(store._journal_path("s"), "a", encoding="utf-8") as f:
+            f.write('{"seq": 6, "type": "message_appen')
+        store = JournalStateStore(directory)
+        assert dump(await store.load("s")) == dump(state)
+        state.chat_history.append({"role": "assistant", "content": "after the tear"})
+        await store.save("s", state)
+        assert dump(await JournalStateStore(directory).load("s")) == dump(state)
+
+        # Crash after the snapshot was written but before the journal was truncated
+        store = JournalStateStore(directory)
+        await store.load("s")
+        events = store._journal_path("s").read_text(encoding="utf-8")
+        await store.compact("s", state)
+        store._journal_path("s").write_text(events, encoding="utf-8")
+        replayed = await JournalStateStore(directory).load("s")
+        assert dump(replayed) == dump(state)  # events the snapshot covers are not applied twice
+
+    asyncio.run(main())
+
+
+def test_sessions_listing_and_delete():
+    async def main():
+        store = JournalStateStore(tempfile.mkdtemp(), compact_every=2)
+        for key in ("a/1", "a/2", "b"):
+            await store.save(key, AgentState(current_step=key))
+        assert await store.list_keys("a/") == ["a/1", "a/2"]
+        await store.delete("a/1")
+        assert await store.list_keys() == ["a/2", "b"] and await store.load("a/1") is None
+        assert (await store.load("a/2")).current_step == "a/2"
+
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+# test_pdf_engine.py
+#
+# Report rendering to a temporary path with PDFCreatorTool: the ToolResult reports the
+# path and page count, the file is a well-formed PDF (header, xref offsets, trailer,
+# one page object per page) with the report text in it, and failures leave no file.
+
+import os
+import re
+import tempfile
+import zlib
+from core.schemas import AgentState, ExecutionContext
+from tools.domain.research.pdf_creator import PDFCreatorInput, PDFCreatorTool
+from tools.domain.research.pdf_engine import ReportTemplate
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+SECTIONS = [
+    {"heading": "1. Summary", "content": "Revenue grew (slightly) in every region.\nCosts held flat."},
+    {"heading": "2. Outlook", "content": "Growth continues next quarter."},
+]
+
+
+def page_streams(data: bytes) -> list[bytes]:
+    streams = re.findall(rb"<< /Length (\d+)( /Filter /FlateDecode)? >>\nstream\n", data)
+    contents, start = [], 0
+    for length, compressed in streams:
+        start = data.index(b"\nstream\n", start) + len(b"\nstream\n")
+        content = data[start:start + int(length)]
+        contents.append(zlib.decompress(content) if compressed else content)
+    return contents
+
+
+def check_structure(data: bytes, pages: int) -> None:
+    assert data.startswith(b"%PDF-1.4\n") and data.endswith(b"%%EOF\n")
+    xref_at = int(re.search(rb"startxref\n(\d+)\n", data).group(1))
+    assert data[xref_at:].startswith(b"xref\n")
+
+    # Every xref entry points at the object it numbers
+    size = int(re.search(rb"xref\n0 (\d+)\n", data).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n \n", data[xref_at:])
+    assert len(offsets) == size - 1
+    for number, offset in enumerate(offsets, start=1):
+        assert data[int(offset):].startswith(b"%d 0 obj\n" % number)
+
+    assert data.count(b"/Type /Page ") == pages and b"/Count %d >>" % pages in data
+
+
+def test_render_small_report():
+    path = os.path.join(tempfile.mkdtemp(), "report.pdf")
+    tool = PDFCreatorTool()
+    result = tool.run(PDFCreatorInput(title="Quarterly Report", sections=SECTIONS, output_path=path), CONTEXT)
+    assert result.success and result.error is None
+    assert result.data == {"path": path, "pages": 1}
+    assert os.listdir(os.path.dirname(path)) == ["report.pdf"]  # the .part file was renamed
+
+    with open(path, "rb") as f:
+        data = f.read()
+    check_structure(data, pages=1)
+    assert b"/Title <FEFF" in data and b"/BaseFont /Helvetica-Bold" in data
+    content = page_streams(data)[0]
+    for line in (b"Quarterly Report", b"1. Summary", b"Costs held flat.", b"Revenue grew \\(slightly\\)"):
+        assert line in content
+
+
+def test_long_report_spans_pages():
+    path = os.path.join(tempfile.mkdtemp(), "long.pdf")
+    sections = [{"heading": f"Section {i}", "content": "word " * 400} for i in range(10)]
+    tool = PDFCreatorTool(ReportTemplate(compress=False))
+    result = tool.run(PDFCreatorInput(title="Long", sections=sections, output_path=path), CONTEXT)
+    assert result.success and result.data["pages"] > 5
+
+    with open(path, "rb") as f:
+        data = f.read()
+    check_structure(data, pages=result.data["pages"])
+    assert b"/FlateDecode" not in data
+    contents = page_streams(data)
+    assert len(contents) == result.data["pages"]
+    assert b"Section 9" in contents[-1] and b"Section 9" not in contents[0]
+
+
+def test_failure_leaves_no_file():
+    directory = tempfile.mkdtemp()
+    bad = PDFCreatorInput(title="Report", sections=SECTIONS, output_path=os.path.join(directory, "missing", "r.pdf"))
+    result = PDFCreatorTool().run(bad, CONTEXT)
+    assert not result.success and "No such file or directory" in result.error
+
+    class Unprintable:
+        def __str__(self):
+            raise ValueError("cannot render this section")
+
+    path = os.path.join(directory, "r.pdf")
+    result = PDFCreatorTool().run(
+        PDFCreatorInput(title="Report", sections=[SECTIONS[0], {"heading": Unprintable()}], output_path=path),
+        CONTEXT,
+    )
+    assert not result.success and result.error == "cannot render this section"
+    assert os.listdir(directory) == []  # the partly written .part file was removed
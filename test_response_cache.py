@@ -0,0 +1,158 @@
+# test_response_cache.py
+#
+# CachedProvider and ResponseCache with a counting stand-in provider: identical concurrent
+# calls share one upstream request (also when it fails, or the caller that started it is
+# cancelled), entries are isolated from callers, expire after the TTL, fall back to the
+# SQLite tier, and sampling calls bypass the cache.
+
+import asyncio
+import os
+import tempfile
+import time
+from core.schemas import LLMConfig, LLMResponse
+from providers.base_provider import BaseLLMProvider
+from providers.cache import CacheConfig, CachedProvider, ResponseCache
+
+
+class CountingProvider(BaseLLMProvider):
+    def __init__(self, delay: float = 0.0, temperature: float = 0.0, error: str | None = None):
+        super().__init__(LLMConfig(provider="openai", model="stub", temperature=temperature))
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def call(self, messages, tools=None, response_format=None) -> LLMResponse:
+        self.calls += 1
+        number = self.calls
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return LLMResponse(
+            content=f"answer {number}: {messages[-1]['content']}",
+            finish_reason="stop",
+            usage={"prompt_tokens": 10, "completion_tokens": 5},
+        )
+
+    def format_tools(self, tools):
+        return []
+
+
+def ask(text: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": text}]
+
+
+def test_identical_calls_share_one_request():
+    async def main():
+        upstream = CountingProvider(delay=0.05)
+        cached = CachedProvider(upstream)
+        responses = await asyncio.gather(*(cached.call(ask("q")) for _ in range(5)), cached.call(ask("other")))
+        assert upstream.calls == 2 and cached.stats.coalesced == 4 and cached.stats.misses == 2
+        assert [r.content for r in responses] == ["answer 1: q"] * 5 + ["answer 2: other"]
+        assert len({id(r) for r in responses}) == 6  # each caller has its own copy
+
+        upstream.error = "upstream down"
+        outcomes = await asyncio.gather(*(cached.call(ask("fails")) for _ in range(3)), return_exceptions=True)
+        assert [str(o) for o in outcomes] == ["upstream down"] * 3 and upstream.calls == 3
+        assert not cached._in_flight
+        upstream.error = None
+        await cached.call(ask("fails"))  # the failure wasn't cached
+        assert upstream.calls == 4
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def main():
+        upstream = CountingProvider(delay=0.1)
+        cached = CachedProvider(upstream)
+        leader = asyncio.create_task(asyncio.wait_for(cached.call(ask("q")), timeout=0.05))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cached.call(ask("q")))
+        try:
+            await leader
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("expected the leader to time out")
+
+        assert (await follower).content == "answer 1: q"
+        assert upstream.calls == 1 and cached.stats.coalesced == 1
+        assert (await cached.call(ask("q"))).content == "answer 1: q"  # and it was cached
+        assert upstream.calls == 1
+
+    asyncio.run(main())
+
+
+def test_entries_are_isolated_from_callers():
+    async def main():
+        cached = CachedProvider(CountingProvider())
+        first = await cached.call(ask("q"))
+        first.usage["retrieved_tokens"] = 99  # what BaseAgent does after a call
+        second = await cached.call(ask("q"))
+        assert second.usage == {"prompt_tokens": 10, "completion_tokens": 5}
+        second.usage["retrieved_tokens"] = 7
+        assert "retrieved_tokens" not in (await cached.call(ask("q"))).usage
+
+        # Streaming stores the "done" response the caller also receives
+        chunks = [chunk async for chunk in cached.stream(ask("s"))]
+        chunks[-1].response.usage["retrieved_tokens"] = 99
+        assert "retrieved_tokens" not in (await cached.call(ask("s"))).usage
+
+    asyncio.run(main())
+
+
+def test_ttl_and_disk_tier():
+    async def main():
+        path = os.path.join(tempfile.mkdtemp(), "cache.db")
+        upstream = CountingProvider()
+        cached = CachedProvider(upstream, ResponseCache(CacheConfig(db_path=path, ttl_seconds=60)))
+        await cached.call(ask("q"))
+        cached.cache.close()
+
+        # Another process: the memory tier is empty, the SQLite tier answers
+        restarted = CachedProvider(upstream, ResponseCache(CacheConfig(db_path=path, ttl_seconds=60)))
+        assert (await restarted.call(ask("q"))).content == "answer 1: q"
+        assert restarted.stats.disk_hits == 1 and upstream.calls == 1
+        await restarted.call(ask("q"))
+        assert restarted.stats.memory_hits == 1
+
+        # Past the TTL, both tiers drop the entry
+        key = restarted.cache_key(ask("q"), None, None)
+        response, _ = restarted.cache._memory[key]
+        restarted.cache._memory[key] = (response, time.time() - 1)
+        restarted.cache._db.execute("UPDATE llm_cache SET expires_at = ?", (time.time() - 1,))
+        assert (await restarted.call(ask("q"))).content == "answer 2: q"
+        assert restarted.stats.expirations == 2 and upstream.calls == 2
+        restarted.cache.close()
+
+    asyncio.run(main())
+
+
+def test_memory_lru_eviction():
+    async def main():
+        upstream = CountingProvider()
+        cached = CachedProvider(upstream, ResponseCache(CacheConfig(max_memory_entries=2)))
+        for text in ("a", "b", "a", "c"):  # "a" was used more recently than "b"
+            await cached.call(ask(text))
+        assert cached.stats.evictions == 1 and upstream.calls == 3
+        await cached.call(ask("a"))
+        await cached.call(ask("b"))
+        assert upstream.calls == 4
+
+    asyncio.run(main())
+
+
+def test_sampling_calls_bypass_the_cache():
+    async def main():
+        upstream = CountingProvider(temperature=0.7)
+        cached = CachedProvider(upstream)
+        await cached.call(ask("q"))
+        await cached.call(ask("q"))
+        assert upstream.calls == 2 and cached.stats.bypassed == 2 and cached.stats.misses == 0
+
+        forced = CachedProvider(upstream, ResponseCache(CacheConfig(force=True)))
+        await forced.call(ask("q"))
+        await forced.call(ask("q"))
+        assert upstream.calls == 3 and forced.stats.hits == 1 and forced.stats.bypassed == 0
+
+    asyncio.run(main())
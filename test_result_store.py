@@ -0,0 +1,102 @@
+# test_result_store.py
+#
+# ToolResultStore: small results stay inline, large ones are stored under a handle with a
+# bounded preview, entries are evicted least-recently-used, and FetchToolResultTool reads
+# parts of a stored result back by handle, path and offset/limit.
+
+import asyncio
+from core.schemas import AgentState, ExecutionContext
+from memory.result_store import ToolResultStore, preview
+from tools.infrastructure.fetch_tool_result import FetchToolResultInput, FetchToolResultTool
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+ROWS = {"results": [{"title": f"result {i}", "body": "x" * 300} for i in range(20)], "total": 20}
+
+
+def test_small_results_stay_inline():
+    store = ToolResultStore(inline_limit=100)
+    assert store.render({"ok": True}, "api") == ("{'ok': True}", None)
+    assert store.render("y" * 100, "api") == ("y" * 100, None)
+    assert not store._entries
+
+
+def test_large_results_are_stored_with_a_preview():
+    store = ToolResultStore(inline_limit=500, preview_chars=300)
+    text, handle = store.render(ROWS, "web_search")
+    assert handle.startswith("web_search_") and store.has(handle)
+    assert store.get(handle) is ROWS
+
+    header, body = text.split("\n", 1)
+    assert header == (
+        f"(stored as {handle}, dict with results: 20 items, total, {len(str(ROWS))} chars; "
+        "call fetch_tool_result to read more)"
+    )
+    # The long list is cut short, the keys after it are still listed
+    assert body == preview(ROWS, 300)
+    assert body.startswith("results:\n  [0] ") and body.endswith("\ntotal: 20")
+
+    text, _ = store.render("z" * 2000, "file_reader")
+    assert ", text, 2000 chars;" in text
+    assert text.endswith("z" * 300 + "... [1700 more chars]")
+
+
+def test_preview_truncation():
+    assert preview("short", 10) == "short"
+    assert preview("a" * 50, 10) == "aaaaaaaaaa... [40 more chars]"
+
+    listed = preview(list(range(100)), 800)
+    assert listed.splitlines() == ["[0] 0", "[1] 1", "[2] 2", "[3] 3", "[4] 4", "... 95 more items"]
+
+    keyed = preview({f"k{i}": i for i in range(8)}, 800)
+    assert keyed.splitlines()[-1] == "... 3 more keys"
+
+    # Long items are cut per item, and the whole preview stays within its budget
+    long_items = preview(["w" * 1000] * 3, 200)
+    assert all(len(line) < 120 for line in long_items.splitlines())
+    assert len(preview(ROWS, 300)) <= 300 + len("... [99999 more chars]")
+
+
+def test_handles_are_evicted_least_recently_used():
+    store = ToolResultStore(max_entries=2)
+    first, second = store.put("one"), store.put("two")
+    assert store.get(first) == "one"  # now "two" is the oldest
+    third = store.put("three")
+    assert store.has(first) and store.has(third) and not store.has(second)
+    try:
+        store.get(second)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError for an evicted handle")
+
+    store.clear()
+    assert not store.has(first)
+
+
+def test_fetch_tool_reads_by_handle():
+    async def main():
+        store = ToolResultStore(inline_limit=500)
+        _, handle = store.render(ROWS, "web_search")
+        tool = FetchToolResultTool(store, max_chars=1000)
+
+        result = await tool.execute(FetchToolResultInput(handle=handle, path="results.3.title"), CONTEXT)
+        assert result.success and result.data == "result 3"
+
+        result = await tool.execute(FetchToolResultInput(handle=handle, path="results", offset=18, limit=5), CONTEXT)
+        assert [row["title"] for row in result.data] == ["result 18", "result 19"]
+
+        # Slices larger than the cap come back as a preview
+        result = await tool.execute(FetchToolResultInput(handle=handle, path="results", limit=None), CONTEXT)
+        assert result.metadata["truncated"] and isinstance(result.data, str)
+        assert len(result.data) <= 1000 + len("... [99999 more chars]")
+
+        for bad in (
+            FetchToolResultInput(handle="web_search_missing"),
+            FetchToolResultInput(handle=handle, path="results.99"),
+            FetchToolResultInput(handle=handle, path="total.x"),
+        ):
+            result = await tool.execute(bad, CONTEXT)
+            assert not result.success and result.error.startswith(f"Cannot read {bad.handle}")
+
+    asyncio.run(main())
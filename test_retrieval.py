@@ -0,0 +1,154 @@
+# test_retrieval.py
+#
+# ContextRetrieval under its latency budget: slow and failing retrievers are skipped,
+# results are cached per session and turn (never when partial, never past the TTL),
+# and BaseAgent.build_messages charges the injected block against the history budget.
+
+import asyncio
+import time
+from core.base_agent import AgentConfig, BaseAgent
+from core.schemas import MESSAGE_SOURCE, LLMConfig, LLMResponse
+from memory.context_window import KeepLastNPolicy
+from memory.retrieval import BaseRetriever, ContextRetrieval, RetrievedItem
+from providers.base_provider import BaseLLMProvider
+
+
+class StaticRetriever(BaseRetriever):
+    def __init__(self, name: str, texts: list[str], delay: float = 0.0, error: str | None = None):
+        self.name = name
+        self.texts = texts
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def retrieve(self, query: str, k: int) -> list[RetrievedItem]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return [RetrievedItem(text=text, score=1.0 / (i + 1), source=self.name) for i, text in enumerate(self.texts[:k])]
+
+
+class EchoProvider(BaseLLMProvider):
+    async def call(self, messages, tools=None, response_format=None) -> LLMResponse:
+        return LLMResponse(content="ok", finish_reason="stop")
+
+    def format_tools(self, tools):
+        return []
+
+
+def turn(text: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": text}]
+
+
+def test_slow_and_failing_retrievers_are_skipped():
+    async def main():
+        fast = StaticRetriever("facts", ["alpha", "beta"])
+        slow = StaticRetriever("memories", ["never"], delay=5.0)
+        broken = StaticRetriever("broken", [], error="index offline")
+        retrieval = ContextRetrieval([fast, slow, broken], timeout=0.05)
+
+        started = time.perf_counter()
+        report = await retrieval.prepare(turn("what do we know?"))
+        assert time.perf_counter() - started < 1.0  # the budget, not the slow retriever
+        assert [item.text for item in report.items] == ["alpha", "beta"]
+        assert report.skipped == {"memories": "timeout", "broken": "error: index offline"}
+        assert report.text.startswith(ContextRetrieval.HEADER) and report.tokens > 0
+
+    asyncio.run(main())
+
+
+def test_cache_per_scope_turn_and_ttl():
+    async def main():
+        facts = StaticRetriever("facts", ["alpha"])
+        retrieval = ContextRetrieval([facts])
+        history = turn("question")
+
+        first = await retrieval.prepare(history, scope="a")
+        history.append({"role": "user", "content": "[Tool: search] Result: ..."})  # not a new turn
+        again = await retrieval.prepare(history, scope="a")
+        assert facts.calls == 1 and again.cached and not first.cached
+        assert retrieval.cached(history, scope="a").items == first.items
+
+        # Another session asking the same thing retrieves for itself
+        await retrieval.prepare(turn("question"), scope="b")
+        assert facts.calls == 2 and retrieval.cached(history, scope="c") is None
+
+        await retrieval.prepare(turn("another question"), scope="a")
+        assert facts.calls == 3
+
+        # A workflow step result isn't a turn either: the query stays the user's request
+        history = turn("plan my trip")
+        history.append({"role": "user", "content": "[Step: search] Result:\nflights", MESSAGE_SOURCE: "step"})
+        assert (await retrieval.prepare(history, scope="a")).query == "plan my trip"
+        assert facts.calls == 4
+
+        retrieval.ttl = 0.0
+        await retrieval.prepare(history, scope="a")
+        assert facts.calls == 5
+
+    asyncio.run(main())
+
+
+def test_partial_results_are_not_reused():
+    async def main():
+        fast = StaticRetriever("facts", ["alpha"])
+        slow = StaticRetriever("memories", ["gamma"], delay=5.0)
+        retrieval = ContextRetrieval([fast, slow], timeout=0.05)
+        history = turn("question")
+
+        partial = await retrieval.prepare(history)
+        assert partial.skipped == {"memories": "timeout"}
+        assert retrieval.cached(history) is not None  # still injected for this call
+
+        slow.delay = 0.0
+        complete = await retrieval.prepare(history)
+        assert not complete.cached and not complete.skipped
+        assert [item.text for item in complete.items] == ["alpha", "gamma"]
+        assert (await retrieval.prepare(history)).cached
+
+    asyncio.run(main())
+
+
+def test_no_retrievers():
+    async def main():
+        report = await ContextRetrieval([]).prepare(turn("question"))
+        assert report.items == [] and report.text == "" and report.tokens == 0 and not report.skipped
+
+    asyncio.run(main())
+
+
+def test_build_messages_charges_retrieved_tokens_to_history():
+    async def main():
+        retrieval = ContextRetrieval([StaticRetriever("facts", ["x" * 400])], max_tokens=512)
+        policy = KeepLastNPolicy(n=100, max_context_tokens=1_000)
+        provider = EchoProvider(LLMConfig(provider="openai", model="test", max_tokens=200))
+        agent = BaseAgent(AgentConfig(name="a", system_prompt="sys", retrieval=retrieval, context_policy=policy), provider)
+        agent.state.chat_history = [{"role": "user", "content": "y" * 396} for _ in range(10)]  # 100 tokens each
+
+        budget = agent.context_budget()
+        assert budget == 1_000 - 200 - 1
+        assert len(agent.build_messages()) == 1 + 7  # no retrieval prepared yet: 7 messages fit
+
+        await agent.prepare_context()
+        report = agent.last_retrieval
+        assert report.tokens > 100
+        messages = agent.build_messages()
+        assert report.text in messages[0]["content"]
+        history_tokens = policy.estimator.count_messages(messages[1:])
+        assert history_tokens <= budget - report.tokens and len(messages) == 1 + 6
+
+        # A new session on the same agent doesn't inherit the cached block
+        agent.reset()
+        agent.state.chat_history = [{"role": "user", "content": "y" * 396} for _ in range(10)]
+        assert agent.build_messages()[0]["content"] == "sys"
+
+        response = await agent.call_llm()
+        assert response.usage["retrieved_tokens"] == agent.last_retrieval.tokens
+
+        # The marker on tool results stays in the history, providers never see it
+        agent.add_tool_result("search", "found")
+        assert agent.state.chat_history[-1][MESSAGE_SOURCE] == "tool"
+        assert agent.build_messages()[-1] == {"role": "user", "content": "[Tool: search] Result: found"}
+
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+# test_row_diff.py
+#
+# Prefix-hash diffing used by PostgresStateStore.save for chat_history and attempts:
+# appends, a mutated last item, rewinds (GO_BACK), shrinking lists and saving back a
+# partial load, checked against a fake connection that keeps one table in memory (no
+# Postgres, no asyncpg).
+
+import asyncio
+from memory.state_store.row_diff import base_hash, chain_hashes, sync_rows
+
+
+class FakeTable:
+    """The subset of an asyncpg connection sync_rows uses, over one in-memory table."""
+
+    def __init__(self):
+        self.rows: list[tuple[str, str]] = []  # (item, prefix_hash) by seq
+        self.reads = 0
+        self.deleted = 0
+        self.inserted = 0
+
+    async def fetch(self, sql: str, session_id: str, lower: int, upper: int):
+        assert sql.startswith("SELECT prefix_hash") and "seq >= $2 AND seq < $3" in sql
+        self.reads += 1
+        return [{"prefix_hash": prefix_hash} for _, prefix_hash in self.rows[lower:upper]]
+
+    async def fetchval(self, sql: str, session_id: str, seq: int):
+        assert sql.startswith("SELECT prefix_hash") and "seq = $2" in sql
+        self.reads += 1
+        return self.rows[seq][1] if seq < len(self.rows) else None
+
+    async def execute(self, sql: str, session_id: str, start: int):
+        assert sql.startswith("DELETE") and "seq >= $2" in sql
+        self.deleted += len(self.rows) - start
+        del self.rows[start:]
+
+    async def save(self, items: list[str], offset: int = 0) -> int:
+        """What PostgresStateStore.save does for one list; returns the rows kept.
+
+        `items` start at position `offset`, as in a partial load.
+        """
+        chain = chain_hashes(items, await base_hash(self, "agent_messages", "s1", offset))
+        tail = self.rows[-1][1] if self.rows else None
+
+        async def insert(start: int) -> None:
+            assert start == len(self.rows)
+            self.rows.extend(zip(items[start - offset:], chain[start - offset:]))
+            self.inserted += offset + len(items) - start
+
+        return await sync_rows(self, "agent_messages", "s1", chain, len(self.rows), tail, insert, offset)
+
+    def load(self, limit: int) -> tuple[list[str], int]:
+        """The last `limit` items and their offset, like load(history_limit=...)."""
+        offset = max(0, len(self.rows) - limit)
+        return [item for item, _ in self.rows[offset:]], offset
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_chain_hashes_cover_the_prefix():
+    a, b = chain_hashes(["x", "y", "z"]), chain_hashes(["x", "q", "z"])
+    assert a[0] == b[0] and a[1] != b[1] and a[2] != b[2]  # one change breaks every later hash
+    assert chain_hashes([]) == []
+
+
+def test_append_only_save_reads_nothing():
+    table = FakeTable()
+    assert run(table.save(["a", "b"])) == 0
+    assert run(table.save(["a", "b", "c", "d"])) == 2
+    assert [item for item, _ in table.rows] == ["a", "b", "c", "d"]
+    assert table.reads == 0 and table.deleted == 0 and table.inserted == 4
+    assert run(table.save(["a", "b", "c", "d"])) == 4 and table.inserted == 4  # unchanged
+
+
+def test_mutated_last_item_is_rewritten():
+    table = FakeTable()
+    run(table.save(["a", "b", "c"]))
+    assert run(table.save(["a", "b", "c*", "d"])) == 2
+    assert [item for item, _ in table.rows] == ["a", "b", "c*", "d"] and table.deleted == 1
+
+
+def test_rewind_truncates_from_first_divergence():
+    table = FakeTable()
+    run(table.save(["a", "b", "c", "d", "e"]))
+    # GO_BACK restored a snapshot taken after "b", then the run went on differently:
+    # the history is as long as before but diverges at index 2, not at its last item
+    assert run(table.save(["a", "b", "x", "y", "e"])) == 2
+    assert [item for item, _ in table.rows] == ["a", "b", "x", "y", "e"]
+    assert table.deleted == 3
+
+
+def test_shrunk_list_keeps_matching_prefix():
+    table = FakeTable()
+    run(table.save(["a", "b", "c", "d", "e"]))
+    # Shorter than what is stored, and its last item equals a stored item at another index
+    assert run(table.save(["a", "b", "e"])) == 2
+    assert [item for item, _ in table.rows] == ["a", "b", "e"]
+    assert run(table.save(["a"])) == 1 and [item for item, _ in table.rows] == ["a"]
+    assert run(table.save([])) == 0 and table.rows == []
+
+
+def test_stored_hashes_match_a_fresh_save():
+    edited, fresh = FakeTable(), FakeTable()
+    for items in (["a", "b", "c"], ["a", "x"], ["a", "x", "y", "z"]):
+        run(edited.save(items))
+    run(fresh.save(["a", "x", "y", "z"]))
+    assert edited.rows == fresh.rows
+
+
+def test_partial_load_saved_back_keeps_older_rows():
+    table = FakeTable()
+    run(table.save(["a", "b", "c", "d", "e"]))
+    items, offset = table.load(limit=2)
+    assert (items, offset) == (["d", "e"], 3)
+
+    assert run(table.save(items + ["f"], offset)) == 5
+    assert [item for item, _ in table.rows] == ["a", "b", "c", "d", "e", "f"] and table.deleted == 0
+
+    # A rewind inside the loaded window only touches rows from there on
+    items, offset = table.load(limit=3)
+    assert run(table.save(items[:1] + ["x"], offset)) == 4
+    assert [item for item, _ in table.rows] == ["a", "b", "c", "d", "x"]
+    assert run(table.save([], 3)) == 3 and [item for item, _ in table.rows] == ["a", "b", "c"]
+
+    # Hashes are the same as for a full save of the same list
+    fresh = FakeTable()
+    run(fresh.save(["a", "b", "c"]))
+    assert fresh.rows == table.rows
+
+    # Rows before the window were removed in the meantime: refuse rather than guess
+    try:
+        run(table.save(["z"], 5))
+    except ValueError as e:
+        assert "stale" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+    assert [item for item, _ in table.rows] == ["a", "b", "c"]
@@ -0,0 +1,49 @@
+# test_run_stream.py
+#
+# AgentRunner.run_stream with stand-in provider streams: deltas are forwarded and the run
+# ends in a "final" chunk, also when the provider's stream stops before its "done" chunk.
+
+import asyncio
+from core.base_agent import AgentConfig, BaseAgent
+from core.schemas import ExecutionContext, LLMConfig, LLMResponse, StreamChunk
+from executors.agent_runner import AgentRunner
+from providers.base_provider import BaseLLMProvider
+
+
+class ScriptedStream(BaseLLMProvider):
+    def __init__(self, chunks: list[StreamChunk]):
+        super().__init__(LLMConfig(provider="openai", model="stub"))
+        self.chunks = chunks
+
+    async def call(self, messages, tools=None, response_format=None) -> LLMResponse:
+        raise AssertionError("run_stream should stream")
+
+    async def stream(self, messages, tools=None, response_format=None):
+        for chunk in self.chunks:
+            yield chunk
+
+    def format_tools(self, tools):
+        return []
+
+
+async def collect(chunks: list[StreamChunk]) -> tuple[list[StreamChunk], BaseAgent]:
+    agent = BaseAgent(AgentConfig(name="stream", system_prompt=""), ScriptedStream(chunks))
+    runner = AgentRunner(agent, ExecutionContext(agent_state=agent.state, session_id="s"))
+    return [chunk async for chunk in runner.run_stream("hi")], agent
+
+
+def test_complete_stream():
+    streamed, agent = asyncio.run(collect([
+        StreamChunk(type="text_delta", text="hel"),
+        StreamChunk(type="text_delta", text="lo"),
+        StreamChunk(type="done", response=LLMResponse(content="hello", finish_reason="stop")),
+    ]))
+    assert [chunk.type for chunk in streamed] == ["text_delta", "text_delta", "done", "final"]
+    assert streamed[-1].text == "hello" and agent.state.chat_history[-1]["content"] == "hello"
+
+
+def test_stream_ending_without_done():
+    streamed, agent = asyncio.run(collect([StreamChunk(type="text_delta", text="hel")]))
+    assert [chunk.type for chunk in streamed] == ["text_delta", "final"]
+    assert streamed[-1].text == "API error: Provider stream ended before the response was complete"
+    assert agent.state.chat_history == [{"role": "user", "content": "hi"}]  # the partial text isn't kept
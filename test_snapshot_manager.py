@@ -0,0 +1,102 @@
+# test_snapshot_manager.py
+#
+# SnapshotManager: delta snapshots restore the state they were taken from, and with a
+# store every snapshot is persisted there as a delta record, so a fresh manager (another
+# process, or after a restart) can still go back to it.
+
+import asyncio
+import os
+import tempfile
+from core.schemas import AgentState, Attempt
+from memory.state_store.in_memory import InMemoryStateStore
+from memory.state_store.snapshot_manager import PARENT, SnapshotManager
+from memory.state_store.sqlite import SQLiteStateStore
+
+
+def grow(state: AgentState, step: str, messages: int) -> None:
+    state.current_step = step
+    state.chat_history.extend({"role": "user", "content": f"{step} {i}"} for i in range(messages))
+    state.attempts.append(Attempt(step=step, attempt_number=1))
+    state.outputs[step] = f"{step} done"
+
+
+def test_restores_in_memory():
+    async def main():
+        manager = SnapshotManager()
+        state = AgentState()
+        grow(state, "plan", 3)
+        await manager.save_snapshot("s1", "plan", state)
+        grow(state, "write", 4)
+        await manager.save_snapshot("s1", "write", state)
+
+        restored = await manager.load_snapshot("s1", "plan")
+        assert restored.current_step == "plan" and len(restored.chat_history) == 3
+        assert restored.outputs == {"plan": "plan done"} and len(restored.attempts) == 1
+        assert await manager.list_snapshots("s1") == ["plan", "write"]
+        assert await manager.load_snapshot("s1", "missing") is None
+
+    asyncio.run(main())
+
+
+def test_snapshots_are_persisted_through_store():
+    async def main():
+        path = os.path.join(tempfile.mkdtemp(), "state.db")
+        store = SQLiteStateStore(path)
+        manager = SnapshotManager(store)
+        state = AgentState()
+        grow(state, "plan", 3)
+        await manager.save_snapshot("s1", "plan", state)
+        grow(state, "write", 4)
+        await manager.save_snapshot("s1", "write", state)
+        assert state.snapshots == {"plan": "s1:snapshot:plan", "write": "s1:snapshot:write"}
+        await store.aclose()
+
+        # A new process: nothing in memory, everything from the store
+        store = SQLiteStateStore(path)
+        manager = SnapshotManager(store)
+        assert sorted(await manager.list_snapshots("s1")) == ["plan", "write"]
+        restored = await manager.load_snapshot("s1", "plan")
+        assert restored.current_step == "plan" and len(restored.chat_history) == 3
+        assert [m["content"] for m in restored.chat_history] == ["plan 0", "plan 1", "plan 2"]
+        restored = await manager.load_snapshot("s1", "write")
+        assert len(restored.chat_history) == 7 and restored.outputs["write"] == "write done"
+
+        await manager.delete_snapshot("s1", "plan")
+        assert await manager.list_snapshots("s1") == ["write"]
+        assert await manager.load_snapshot("s1", "plan") is None
+        await store.aclose()
+
+    asyncio.run(main())
+
+
+def test_store_holds_deltas_not_full_states():
+    async def main():
+        store = InMemoryStateStore()
+        manager = SnapshotManager(store, keyframe_interval=4)
+        state = AgentState()
+        expected = {}
+        for n in range(10):
+            grow(state, f"step{n}", 50)
+            await manager.save_snapshot("s1", f"step{n}", state)
+            expected[f"step{n}"] = state.model_copy(deep=True)
+
+        records = [key for key in await store.list_keys("s1:delta:")]
+        deltas = [await store.load(key) for key in records]
+        assert len(deltas) == 10
+        assert sorted(len(d.chat_history) for d in deltas if PARENT in d.snapshots) == [50] * 7
+        assert sorted(len(d.chat_history) for d in deltas if PARENT not in d.snapshots) == [50, 250, 450]  # keyframes
+
+        # Back to an earlier step, then on from there: later records extend the restored one
+        state = await manager.load_snapshot("s1", "step5")
+        grow(state, "redo", 2)
+        await manager.save_snapshot("s1", "redo", state)
+        expected["redo"] = state.model_copy(deep=True)
+
+        fresh = SnapshotManager(store)
+        for name, want in expected.items():
+            restored = await fresh.load_snapshot("s1", name)
+            assert restored.chat_history == want.chat_history, name
+            assert restored.attempts == want.attempts and restored.outputs == want.outputs, name
+            assert restored.current_step == want.current_step and restored.snapshots == want.snapshots, name
+
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+# test_sql_tools.py
+#
+# SQL tool family on a temporary SQLite file: pooled connections, capped column-oriented
+# results, read-only enforcement, the cached schema catalog and query validation.
+
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from core.schemas import AgentState, ExecutionContext
+from tools.domain.sql.execute_query import ExecuteQueryInput, ExecuteQueryTool
+from tools.domain.sql.get_schema import GetSchemaInput, GetSchemaTool
+from tools.domain.sql.pool import SQLConnectionPool
+from tools.domain.sql.schema_catalog import SchemaCatalog
+from tools.domain.sql.validate_query import ValidateQueryInput, ValidateQueryTool, is_read_only, strip_sql
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test")
+
+
+def make_db() -> str:
+    path = os.path.join(tempfile.mkdtemp(), "shop.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT NOT NULL UNIQUE, name TEXT);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            total REAL,
+            note TEXT
+        );
+        CREATE INDEX idx_orders_user ON orders (user_id);
+    """)
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(i, f"u{i}@x.io", f"User {i}") for i in range(100)])
+    conn.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, ?)",
+        [(i, i % 100, i * 1.5, "x" * 50) for i in range(10_000)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_execute_query_caps_and_columns():
+    pool = SQLConnectionPool.sqlite(make_db())
+    tool = ExecuteQueryTool(pool, max_rows=500, batch_size=64)
+    result = tool.run(ExecuteQueryInput(query="SELECT id, total FROM orders WHERE user_id = ?", params=[7]), CONTEXT)
+    assert result.success and result.data["columns"] == ["id", "total"]
+    assert result.data["values"][0][:2] == [7, 107] and result.data["rows"] == 100
+    assert not result.data["more_rows"] and result.metadata["rows_scanned"] == 100
+    assert "latency_ms" in result.metadata
+
+    capped = tool.run(ExecuteQueryInput(query="SELECT * FROM orders", max_rows=10_000), CONTEXT)
+    assert capped.data["rows"] == 500 and capped.data["more_rows"]
+    assert capped.metadata["rows_scanned"] == 501  # one row past the cap, never the whole table
+
+    by_size = ExecuteQueryTool(pool, max_bytes=5_000).run(ExecuteQueryInput(query="SELECT note FROM orders"), CONTEXT)
+    assert by_size.data["more_rows"] and by_size.data["rows"] < 100
+    assert by_size.metadata["bytes"] <= 5_000
+    pool.close()
+
+
+def test_execute_query_size_cap_is_hard():
+    path = make_db()
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO orders VALUES (?, ?, ?, ?)", (-1, 1, 0.0, "y" * 5_000_000))
+    conn.execute("INSERT INTO users VALUES (?, ?, ?)", (-1, "big@x.io", "z" * 200_000))
+    conn.commit()
+    conn.close()
+    pool = SQLConnectionPool.sqlite(path)
+    tool = ExecuteQueryTool(pool, max_bytes=10_000)
+
+    # A single huge cell is cut to fit instead of coming back whole
+    huge = tool.run(ExecuteQueryInput(query="SELECT id, note FROM orders ORDER BY id"), CONTEXT)
+    assert huge.data["rows"] == 1 and huge.data["more_rows"] and huge.metadata["truncated"]
+    assert huge.data["values"][0] == [-1] and huge.data["values"][1][0].endswith("…")
+    assert huge.metadata["bytes"] <= 10_000 and len(huge.data["values"][1][0]) > 9_000
+
+    # Short cells in the same row stay whole
+    mixed = tool.run(ExecuteQueryInput(query="SELECT email, name FROM users WHERE id = -1"), CONTEXT)
+    assert mixed.data["values"][0] == ["big@x.io"] and mixed.metadata["bytes"] <= 10_000
+
+    # Later rows that would overflow the cap end the result instead
+    later = tool.run(ExecuteQueryInput(query="SELECT note FROM orders ORDER BY id DESC"), CONTEXT)
+    assert later.data["more_rows"] and later.metadata["bytes"] <= 10_000
+    assert "truncated" not in later.metadata and all(len(v) == 50 for v in later.data["values"][0])
+    pool.close()
+
+
+def test_read_only_and_single_statement():
+    path = make_db()
+    read_only = ExecuteQueryTool(SQLConnectionPool.sqlite(path), allow_writes=True)  # pool wins
+    for query in ("DELETE FROM orders", "WITH x AS (SELECT 1) DELETE FROM orders", "SELECT 1; DROP TABLE users"):
+        result = read_only.run(ExecuteQueryInput(query=query), CONTEXT)
+        assert not result.success, query
+    assert read_only.run(ExecuteQueryInput(query="SELECT ';' AS s -- ; DROP"), CONTEXT).success
+
+    writable = ExecuteQueryTool(SQLConnectionPool.sqlite(path, read_only=False), allow_writes=True)
+    updated = writable.run(ExecuteQueryInput(query="UPDATE users SET name = ? WHERE id < 10", params=["x"]), CONTEXT)
+    assert updated.success and updated.data["rows_affected"] == 10
+
+
+def test_schema_catalog_cache_and_invalidation():
+    path = make_db()
+    pool = SQLConnectionPool.sqlite(path, read_only=False)
+    catalog = SchemaCatalog(pool)
+    schema = GetSchemaTool(catalog)
+    first = schema.run(GetSchemaInput(), CONTEXT)
+    assert not first.metadata["cached"] and first.metadata["rows_scanned"] > 0
+    orders = next(table for table in first.data["tables"] if table["name"] == "orders")
+    assert "user_id INTEGER NOT NULL" in orders["columns"] and orders["foreign_keys"] == ["user_id -> users.id"]
+    assert orders["indexes"] == ["idx_orders_user (user_id)"]
+    second = schema.run(GetSchemaInput(tables=["ORDERS"]), CONTEXT)
+    assert second.metadata["cached"] and second.metadata["rows_scanned"] == 0
+
+    ExecuteQueryTool(pool, catalog, allow_writes=True).run(ExecuteQueryInput(query="CREATE TABLE refunds (id INTEGER)"), CONTEXT)
+    assert catalog.stats.invalidations == 1
+    # DDL from another connection is seen through PRAGMA schema_version
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE coupons (code TEXT)")
+    conn.commit()
+    conn.close()
+    third = schema.run(GetSchemaInput(tables=["refunds", "coupons", "order"]), CONTEXT)
+    assert not third.metadata["cached"] and len(third.data["tables"]) == 2
+    assert third.data["missing"] == {"order": ["orders"]}
+
+
+def test_validate_query():
+    tool = ValidateQueryTool(SQLConnectionPool.sqlite(make_db()))
+    scan = tool.run(ValidateQueryInput(query="SELECT * FROM orders WHERE total > ?"), CONTEXT)
+    assert scan.success and scan.data["scans"] == ["SCAN orders"]
+    seek = tool.run(ValidateQueryInput(query="SELECT * FROM orders WHERE user_id = :user"), CONTEXT)
+    assert seek.success and not seek.data["scans"]
+    bad = tool.run(ValidateQueryInput(query="SELECT missing_column FROM orders"), CONTEXT)
+    assert not bad.success and "missing_column" in bad.error
+    assert not tool.run(ValidateQueryInput(query="INSERT INTO users VALUES (1, 'a', 'b')"), CONTEXT).success
+    assert is_read_only("EXPLAIN SELECT 1") and not is_read_only("with t as (select 1) update users set name = 1")
+    assert strip_sql("SELECT 'it''s; here' /* ; */ FROM t -- ;").split() == ["SELECT", "'_'", "FROM", "t"]
+
+
+def test_pool_bounds_connections_and_interrupts():
+    pool = SQLConnectionPool.sqlite(make_db(), max_size=2)
+    tool = ExecuteQueryTool(pool)
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        results = list(threads.map(
+            lambda i: tool.run(ExecuteQueryInput(query="SELECT count(*) FROM orders WHERE user_id = ?", params=[i]), CONTEXT),
+            range(64),
+        ))
+    assert all(result.success and result.data["values"] == [[100]] for result in results)
+    assert pool.stats.created <= 2 and pool.stats.acquired == 64
+
+    slow = ExecuteQueryTool(pool, query_timeout=0.2).run(ExecuteQueryInput(
+        query="WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n"
+    ), CONTEXT)
+    assert not slow.success and "interrupt" in slow.error
+    assert tool.run(ExecuteQueryInput(query="SELECT 1"), CONTEXT).success  # connection still usable
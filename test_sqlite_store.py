@@ -0,0 +1,107 @@
+# test_sqlite_store.py
+#
+# SQLiteStateStore's single writer: writes queued while a commit runs are coalesced into
+# one transaction, superseded saves are skipped without losing the latest state, and a
+# bad write in a batch fails only its own caller. Also key listing and step progress.
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from core.schemas import AgentState, StepProgress, ToolResult
+from memory.state_store.sqlite import SQLiteStateStore
+
+
+def state(step: str) -> AgentState:
+    return AgentState(current_step=step)
+
+
+class LockedDatabase:
+    """Holds the write lock from another connection, so the store's writer queues up a batch."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, isolation_level=None)
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.conn.execute("COMMIT")
+        self.conn.close()
+
+
+async def burst(store: SQLiteStateStore, path: str, writes: list) -> list:
+    """Run writes while the database is locked, so they queue up as one batch; returns each
+    write's result or exception."""
+    await store.save("warm-up", state("x"))
+    with LockedDatabase(path):
+        blocker = asyncio.ensure_future(store.save("blocker", state("x")))
+        await asyncio.sleep(0.1)  # the writer takes it alone and waits for the lock
+        tasks = [asyncio.ensure_future(write) for write in writes]
+        await asyncio.sleep(0.1)  # everything else queues behind it
+    await blocker
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_writes_are_coalesced():
+    async def main():
+        path = os.path.join(tempfile.mkdtemp(), "state.db")
+        store = SQLiteStateStore(path)
+        writes = [store.save(f"s{i % 20}", state(f"v{i}")) for i in range(200)]
+        writes.append(store.delete("s0"))
+        results = await burst(store, path, writes)
+        assert all(result is None for result in results)
+        assert store.stats.writes == 203 and store.stats.transactions == 3
+        assert store.stats.superseded >= 180  # per key, only the last save of the batch is written
+
+        assert await store.load("s0") is None  # the delete came after every save of s0
+        for key in range(1, 20):
+            assert (await store.load(f"s{key}")).current_step == f"v{180 + key}"
+        await store.aclose()
+
+    asyncio.run(main())
+
+
+def test_bad_write_fails_alone():
+    async def main():
+        path = os.path.join(tempfile.mkdtemp(), "state.db")
+        store = SQLiteStateStore(path)
+        writes = [
+            store.save("before", state("ok")),
+            store._submit("save", "bad", (None, time.time())),  # violates NOT NULL
+            store.save("after", state("ok")),
+            store.save_step_progress("before", StepProgress(step="one", result=ToolResult(success=True))),
+        ]
+        before, bad, after, progress = await burst(store, path, writes)
+        assert before is None and after is None and progress is None
+        assert isinstance(bad, sqlite3.IntegrityError)
+        assert store.stats.transactions <= 3
+        assert (await store.load("before")).current_step == "ok"
+        assert (await store.load("after")).current_step == "ok"
+        assert await store.load("bad") is None
+        assert list(await store.load_step_progress("before")) == ["one"]
+        await store.aclose()
+
+    asyncio.run(main())
+
+
+def test_list_keys_and_step_progress():
+    async def main():
+        store = SQLiteStateStore(os.path.join(tempfile.mkdtemp(), "state.db"))
+        for key in ("a:snapshot:x", "a:snapshot:y", "a:z", "b"):
+            await store.save(key, state(key))
+        assert await store.list_keys("a:snapshot:") == ["a:snapshot:x", "a:snapshot:y"]
+        assert await store.list_keys() == ["a:snapshot:x", "a:snapshot:y", "a:z", "b"]
+
+        for step in ("one", "two"):
+            await store.save_step_progress("b", StepProgress(step=step, result=ToolResult(success=True, data=step)))
+        assert sorted(await store.load_step_progress("b")) == ["one", "two"]
+        await store.delete_step_progress("b", ["one"])
+        assert list(await store.load_step_progress("b")) == ["two"]
+        await store.delete("b")  # takes the session's progress with it
+        assert await store.load_step_progress("b") == {} and not await store.exists("b")
+        await store.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+# test_state_codec.py
+#
+# Round trips of StateCodec.
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+from core.schemas import (
+    AgentState, Attempt, LLMResponse, ToolCall, ToolResult,
+    CheckpointResponse, CheckpointDecision,
+)
+from memory.state_store.codec import StateCodec
+from memory.state_store.sqlite import SQLiteStateStore
+
+
+def make_state(messages: int = 40) -> AgentState:
+    state = AgentState(current_step="outline", current_attempt=2, feedback="shorter please")
+    state.snapshots = {"search": "s1:snapshot:search"}
+    for i in range(messages):
+        state.chat_history.append({"role": "user" if i % 2 else "assistant", "content": f"message {i} " * 20})
+    state.chat_history.append({"role": "tool", "content": "{}", "tool_call_id": "call_1"})
+    state.attempts.append(Attempt(
+        step="search",
+        attempt_number=1,
+        timestamp=datetime(2025, 1, 2, 3, 4, 5, 678901),
+        llm_response=LLMResponse(
+            content=None,
+            tool_calls=[ToolCall(tool_name="web_search", arguments={"query": "agents", "max_results": 5})],
+            finish_reason="tool_use",
+            usage={"prompt_tokens": 120, "completion_tokens": 15},
+            raw={"id": "resp_1", "choices": [{"index": 0}]},
+        ),
+        tool_results=[ToolResult(success=True, data={"results": [{"title": "a"}]}, metadata={"ms": 12})],
+        checkpoint_response=CheckpointResponse(decision=CheckpointDecision.GO_BACK, go_back_to="search"),
+    ))
+    state.attempts.append(Attempt(step="outline", attempt_number=2, error="timeout"))
+    state.outputs = {"search": {"results": [{"title": "a"}]}, "outline": "1. intro"}
+    return state
+
+
+def without_raw(state: AgentState) -> AgentState:
+    copy = state.model_copy(deep=True)
+    for attempt in copy.attempts:
+        if attempt.llm_response:
+            attempt.llm_response.raw = None
+    return copy
+
+
+def test_state_round_trip_drops_raw():
+    state = make_state()
+    codec = StateCodec()
+    assert codec.decode_state(codec.encode_state(state)) == without_raw(state)
+
+
+def test_state_round_trip_uncompressed():
+    state = make_state(messages=2)
+    codec = StateCodec(compress_threshold=None)
+    data = codec.encode_state(state)
+    assert data[4] == 0  # no compression flag
+    assert codec.decode_state(data) == without_raw(state)
+
+
+def test_raw_truncate():
+    codec = StateCodec(raw_policy="truncate", raw_max_chars=10)
+    response = make_state().attempts[0].llm_response
+    decoded = codec.decode_response(codec.encode_response(response))
+    assert decoded.raw == '{"id":"res...[truncated]'
+    assert decoded.tool_calls == response.tool_calls
+
+
+def test_raw_side_store():
+    raw_store: dict = {}
+    codec = StateCodec(raw_policy="side_store", raw_store=raw_store)
+    attempt = make_state().attempts[0]
+    decoded = codec.decode_attempt(codec.encode_attempt(attempt))
+    assert decoded == attempt
+    assert list(raw_store.values()) == [attempt.llm_response.raw]
+    # Saving the same state again reuses the entry
+    state = make_state()
+    codec.encode_state(state)
+    codec.encode_state(state)
+    assert len(raw_store) == 1
+    state.attempts[0].llm_response.raw = {"id": "resp_2"}
+    codec.encode_state(state)
+    assert len(raw_store) == 2
+    # A codec without the side store keeps the handle
+    handle = StateCodec().decode_attempt(codec.encode_attempt(attempt)).llm_response.raw
+    assert set(handle) == {"$raw"}
+
+
+def test_reads_pydantic_json():
+    state = make_state()
+    assert StateCodec().decode_state(state.model_dump_json().encode()) == state
+    assert StateCodec().decode_state(state.model_dump_json()) == state
+
+
+def test_store_reads_rows_written_without_codec():
+    path = os.path.join(tempfile.mkdtemp(), "state.db")
+    state = without_raw(make_state())
+
+    async def run():
+        plain = SQLiteStateStore(path)
+        await plain.save("old", state)
+        await plain.aclose()
+        coded = SQLiteStateStore(path, codec=StateCodec())
+        assert await coded.load("old") == state
+        await coded.save("new", state)
+        assert await coded.load("new") == state
+        await coded.aclose()
+
+    asyncio.run(run())
+
+
+def test_smaller_than_json():
+    state = make_state(messages=200)
+    assert len(StateCodec().encode_state(state)) < len(state.model_dump_json()) / 3
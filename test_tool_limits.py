@@ -0,0 +1,84 @@
+# test_tool_limits.py
+#
+# Per-tool concurrency limits and timeouts as AgentRunner applies them: the global and
+# per-session caps hold across concurrent tool calls and sessions, and a call past its
+# timeout becomes a failed ToolResult that gives its slot back.
+
+import asyncio
+from pydantic import BaseModel
+from core.base_agent import AgentConfig, BaseAgent
+from core.base_tool import BaseTool
+from core.schemas import ExecutionContext, ToolCall, ToolResult
+from executors.agent_runner import AgentRunner
+from stubs import NoLLM
+
+
+class SlowInput(BaseModel):
+    seconds: float = 0.05
+
+
+class SlowTool(BaseTool):
+    """Sleeps; tracks how many calls are inside execute() at once, overall and per session."""
+
+    name = "slow"
+    description = "Sleep for a while"
+    input_model = SlowInput
+
+    def __init__(self, max_concurrency=None, max_concurrency_per_session=None, timeout=None):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_session = max_concurrency_per_session
+        self.timeout = timeout
+        self.active: dict[str, int] = {}
+        self.peak = 0
+        self.peak_per_session = 0
+
+    async def execute(self, input: SlowInput, context: ExecutionContext) -> ToolResult:
+        session = context.session_id
+        self.active[session] = self.active.get(session, 0) + 1
+        self.peak = max(self.peak, sum(self.active.values()))
+        self.peak_per_session = max(self.peak_per_session, self.active[session])
+        try:
+            await asyncio.sleep(input.seconds)
+        finally:
+            self.active[session] -= 1
+        return ToolResult(success=True, data=input.seconds)
+
+
+def runner(tool: SlowTool, session_id: str, tool_timeout: float | None = None) -> AgentRunner:
+    agent = BaseAgent(AgentConfig(name="limits", system_prompt="", tools=[tool]), NoLLM())
+    return AgentRunner(agent, ExecutionContext(agent_state=agent.state, session_id=session_id), tool_timeout=tool_timeout)
+
+
+def calls(n: int, seconds: float = 0.05) -> list[ToolCall]:
+    return [ToolCall(tool_name="slow", arguments={"seconds": seconds}) for _ in range(n)]
+
+
+def test_concurrency_limits():
+    async def main():
+        tool = SlowTool(max_concurrency=3, max_concurrency_per_session=2)
+        sessions = [runner(tool, f"s{i}") for i in range(3)]
+        results = await asyncio.gather(*(r._execute_tool_calls(calls(4)) for r in sessions))
+        assert all(result.success for batch in results for result in batch)
+        assert tool.peak == 3 and tool.peak_per_session == 2
+
+        unlimited = SlowTool()
+        await runner(unlimited, "s")._execute_tool_calls(calls(6))
+        assert unlimited.peak == 6
+
+    asyncio.run(main())
+
+
+def test_timeouts():
+    async def main():
+        tool = SlowTool(max_concurrency=1, timeout=0.05)
+        slow, fast = await runner(tool, "s")._execute_tool_calls(calls(1, seconds=5.0) + calls(1, seconds=0.0))
+        assert not slow.success and slow.error == "Execution error: timed out after 0.05s"
+        assert fast.success  # the timed-out call gave its slot back
+        assert tool.active == {"s": 0}
+
+        # Tools without their own timeout use the runner's default
+        untimed = SlowTool()
+        result, = await runner(untimed, "s", tool_timeout=0.05)._execute_tool_calls(calls(1, seconds=5.0))
+        assert result.error == "Execution error: timed out after 0.05s"
+
+    asyncio.run(main())
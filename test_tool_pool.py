@@ -0,0 +1,115 @@
+# test_tool_pool.py
+#
+# ToolPool dispatch by execution class: blocking_io tools on bounded threads, cpu_bound
+# tools in worker processes (rebuilt from their public attributes), the thread fallback
+# for tools that can't be pickled, and the queue stats, also for calls cancelled while queued.
+
+import asyncio
+import os
+import threading
+import time
+import warnings
+from pydantic import BaseModel
+from core.base_tool import SyncTool
+from core.schemas import AgentState, ExecutionContext, ToolResult
+from executors.tool_pool import ToolPool
+
+CONTEXT = ExecutionContext(agent_state=AgentState(), session_id="test", metadata={"flag": True, "conn": object()})
+
+
+class SleepInput(BaseModel):
+    seconds: float = 0.0
+
+
+class WhereTool(SyncTool):
+    """Sleeps, then reports which process and thread it ran on."""
+
+    name = "where"
+    description = "Report where the tool ran"
+    input_model = SleepInput
+
+    def __init__(self, label: str = "public", execution: str = "blocking_io"):
+        self.label = label
+        self.execution = execution
+        self._secret = "private"
+
+    def run(self, input: SleepInput, context: ExecutionContext) -> ToolResult:
+        time.sleep(input.seconds)
+        return ToolResult(success=True, data={
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+            "label": self.label,
+            "secret": getattr(self, "_secret", None),
+            "metadata": context.metadata,
+        })
+
+
+def test_blocking_io_runs_on_bounded_threads():
+    async def main():
+        pool = ToolPool(max_threads=2)
+        tool = WhereTool()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.execute(tool, SleepInput(seconds=0.1), CONTEXT) for _ in range(4)))
+        assert time.perf_counter() - started >= 0.2  # two at a time, not four
+        assert all(r.success for r in results)
+        assert threading.get_ident() not in {r.data["thread"] for r in results}
+        assert results[0].data["secret"] == "private"  # same object on a thread
+
+        stats = pool.stats["blocking_io"]
+        assert stats.submitted == 4 and stats.completed == 4 and stats.max_queued == 2  # beyond the two running
+        assert stats.queued == 0 and stats.running == 0 and stats.avg_queue_seconds > 0
+        pool.shutdown()
+
+    asyncio.run(main())
+
+
+def test_cpu_bound_runs_in_a_worker_process():
+    async def main():
+        pool = ToolPool(max_processes=1)
+        result = await pool.execute(WhereTool("configured", execution="cpu_bound"), SleepInput(), CONTEXT)
+        assert result.success and result.data["pid"] != os.getpid()
+        assert result.data["label"] == "configured"
+        assert result.data["secret"] is None  # private attributes stay in this process
+        assert result.data["metadata"] == {"flag": True}  # only primitive metadata is sent
+        assert pool.stats["cpu_bound"].completed == 1
+        pool.shutdown()
+
+    asyncio.run(main())
+
+
+def test_unpicklable_tool_falls_back_to_a_thread():
+    async def main():
+        pool = ToolPool()
+        tool = WhereTool(execution="cpu_bound")
+        tool.label = lambda: None  # lambdas don't pickle
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = await pool.execute(tool, SleepInput(), CONTEXT)
+        assert result.success and result.data["pid"] == os.getpid()
+        assert "running it on a thread" in str(caught[0].message)
+        assert pool.stats["cpu_bound"].fallbacks == 1 and pool.stats["cpu_bound"].submitted == 0
+        assert pool.stats["blocking_io"].completed == 1
+        assert pool._processes is None  # never started
+        pool.shutdown()
+
+    asyncio.run(main())
+
+
+def test_cancelled_while_queued():
+    async def main():
+        pool = ToolPool(max_threads=1)
+        tool = WhereTool()
+        running = asyncio.create_task(pool.execute(tool, SleepInput(seconds=0.1), CONTEXT))
+        queued = asyncio.create_task(pool.execute(tool, SleepInput(), CONTEXT))
+        await asyncio.sleep(0.02)
+        stats = pool.stats["blocking_io"]
+        assert stats.running == 1 and stats.queued == 1
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert stats.queued == 0 and stats.running == 1
+        assert (await running).success
+        assert stats.submitted == 2 and stats.completed == 1 and stats.failed == 0 and stats.running == 0
+        pool.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+# test_vector_store.py
+#
+# VectorStore persistence and writes: save/open round-trips (float32 and int8), saving
+# back into the directory an index was memory-mapped from, upserts and deletes.
+
+import tempfile
+import numpy as np
+from memory.long_term.vector_store import VectorStore
+
+
+def make_store(rows: int = 200, quantize: bool = False) -> tuple[VectorStore, np.ndarray]:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((rows, 16)).astype(np.float32)
+    store = VectorStore(16, quantize=quantize, block_rows=64)
+    store.add([f"doc{i}" for i in range(rows)], vectors, [{"i": i, "even": i % 2 == 0} for i in range(rows)])
+    return store, vectors
+
+
+def test_round_trip():
+    for quantize in (False, True):
+        store, vectors = make_store(quantize=quantize)
+        directory = tempfile.mkdtemp()
+        store.save(directory)
+        opened = VectorStore.open(directory)
+        assert len(opened) == 200 and opened.quantize == quantize
+        hit = opened.search(vectors[17], k=3)[0]
+        assert hit.id == "doc17" and hit.metadata == {"i": 17, "even": False}
+        assert [r.id for r in opened.search(vectors[17], k=5, where={"even": True})] == [
+            r.id for r in store.search(vectors[17], k=5, where={"even": True})
+        ]
+        vector, metadata = opened.get("doc3")
+        assert metadata["i"] == 3 and np.allclose(vector, vectors[3] / np.linalg.norm(vectors[3]), atol=0.02)
+
+
+def test_save_back_to_opened_directory():
+    store, vectors = make_store()
+    directory = tempfile.mkdtemp()
+    store.save(directory)
+    opened = VectorStore.open(directory)  # memory-mapped
+    opened.add(["extra"], np.ones((1, 16), dtype=np.float32), [{"i": -1}])
+    opened.delete(["doc0"])
+    opened.save(directory)
+    # The old maps still read correctly after the files were replaced
+    assert opened.search(vectors[5], k=1)[0].id == "doc5"
+    reopened = VectorStore.open(directory)
+    assert len(reopened) == 200 and reopened.get("doc0") is None
+    assert reopened.get("extra")[1] == {"i": -1}
+
+
+def test_upsert_and_delete():
+    store, vectors = make_store(rows=10)
+    store.add(["doc1"], -vectors[1:2], [{"i": "new"}])
+    assert len(store) == 10 and store.get("doc1")[1] == {"i": "new"}
+    assert store.search(vectors[1], k=10)[-1].id == "doc1"  # now points the other way
+    assert store.delete(["doc1", "doc2", "missing"]) == 2 and len(store) == 8
+    assert all(result.id not in ("doc1", "doc2") for result in store.search(vectors[2], k=10))
+
+    # The same id twice in one batch counts once; the last vector wins
+    store.add(["dup", "dup"], np.stack([vectors[3], vectors[4]]), [{"n": 1}, {"n": 2}])
+    assert len(store) == 9 and store.get("dup")[1] == {"n": 2}
+    assert [result.id for result in store.search(vectors[4], k=10)].count("dup") == 1
+
+    directory = tempfile.mkdtemp()
+    store.save(directory)
+    reopened = VectorStore.open(directory)
+    assert len(reopened) == 9 and reopened.rows == 9
@@ -0,0 +1,145 @@
+# test_workflow_dag.py
+#
+# WorkflowExecutor's DAG mode with tool-only steps (no LLM calls): dependency order,
+# concurrency of independent steps, history in declaration order whatever the timing,
+# failed steps and tool exceptions, a checkpoint error cancelling running branches,
+# and invalid graphs.
+
+import asyncio
+from pydantic import BaseModel
+from core.base_agent import AgentConfig, BaseAgent
+from core.base_tool import BaseTool
+from core.schemas import ExecutionContext, ToolResult, WorkflowDefinition, WorkflowStep
+from executors.workflow_executor import WorkflowExecutor
+from stubs import NoLLM
+
+
+class TaskInput(BaseModel):
+    label: str
+    delay: float = 0.0
+    fail: bool = False
+    crash: bool = False
+
+
+class TaskTool(BaseTool):
+    """Sleeps, then returns its label. Logs ("start"/"end", label) events."""
+
+    name = "task"
+    description = "Run a task"
+    input_model = TaskInput
+
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+
+    async def execute(self, input: TaskInput, context: ExecutionContext) -> ToolResult:
+        self.events.append(("start", input.label))
+        try:
+            await asyncio.sleep(input.delay)
+        except asyncio.CancelledError:
+            self.events.append(("cancelled", input.label))
+            raise
+        if input.crash:
+            raise RuntimeError(f"{input.label} crashed")
+        self.events.append(("end", input.label))
+        if input.fail:
+            return ToolResult(success=False, error=f"{input.label} failed")
+        return ToolResult(success=True, data=input.label)
+
+
+def step(name: str, depends_on: list[str] | None = None, **task) -> WorkflowStep:
+    return WorkflowStep(
+        name=name,
+        tool_name="task",
+        prompt=name,
+        input_override={"label": name, **task},
+        depends_on=depends_on,
+    )
+
+
+def make_executor(tool: TaskTool) -> WorkflowExecutor:
+    agent = BaseAgent(AgentConfig(name="dag", system_prompt="", tools=[tool]), NoLLM())
+    return WorkflowExecutor(agent, ExecutionContext(agent_state=agent.state, session_id="dag"))
+
+
+def run(executor: WorkflowExecutor, steps: list[WorkflowStep]):
+    return asyncio.run(executor.run(WorkflowDefinition(name="dag", description="", steps=steps)))
+
+
+def test_dependencies_order_and_concurrency():
+    tool = TaskTool()
+    executor = make_executor(tool)
+    results = run(executor, [
+        step("fetch", depends_on=[]),
+        step("slow", depends_on=["fetch"], delay=0.05),
+        step("fast", depends_on=["fetch"]),
+        step("merge", depends_on=["slow", "fast"]),
+    ])
+    assert list(results) == ["fetch", "slow", "fast", "merge"] and all(r.success for r in results.values())
+
+    position = {event: i for i, event in enumerate(tool.events)}
+    assert position[("end", "fetch")] < position[("start", "slow")]
+    assert position[("start", "fast")] < position[("end", "slow")]  # independent branches overlap
+    assert position[("end", "fast")] < position[("end", "slow")] < position[("start", "merge")]
+
+    # History follows declaration order, not completion order
+    history = [m["content"].split("]")[0] for m in executor.agent.state.chat_history]
+    assert history == ["[Step: fetch", "[Step: slow", "[Step: fast", "[Step: merge"]
+
+
+def test_failed_step_is_recorded_and_dependents_still_run():
+    tool = TaskTool()
+    executor = make_executor(tool)
+    results = run(executor, [
+        step("a", depends_on=[]),
+        step("b", depends_on=["a"], fail=True),
+        step("c", depends_on=["b"]),
+    ])
+    assert results["b"].success is False and results["b"].error == "b failed"
+    assert results["c"].success  # like sequential mode, a failed result doesn't stop the workflow
+    assert [a.step for a in executor.agent.state.attempts] == ["a", "b", "c"]
+    assert not any(m["content"].startswith("[Step: b]") for m in executor.agent.state.chat_history)
+
+
+def test_tool_exception_becomes_failed_result():
+    tool = TaskTool()
+    executor = make_executor(tool)
+    results = run(executor, [
+        step("root", depends_on=[]),
+        step("boom", depends_on=["root"], crash=True),
+        step("after", depends_on=["boom"]),
+    ])
+    assert not results["boom"].success and "boom crashed" in results["boom"].error
+    assert results["after"].success
+
+
+def test_checkpoint_error_cancels_running_branches():
+    class Crashing:
+        async def handle(self, step_name, result):
+            raise RuntimeError("review failed")
+
+    tool = TaskTool()
+    executor = make_executor(tool)
+    executor.checkpoint_handler = Crashing()
+    checked = step("checked", depends_on=["root"])
+    checked.checkpoint = True
+    try:
+        run(executor, [step("root", depends_on=[]), step("long", depends_on=["root"], delay=5.0), checked])
+    except RuntimeError as e:
+        assert str(e) == "review failed"
+    else:
+        raise AssertionError("expected the checkpoint error")
+    assert ("cancelled", "long") in tool.events and ("end", "long") not in tool.events
+
+
+def test_invalid_graphs():
+    for steps, message in [
+        ([step("a", depends_on=["missing"])], "unknown steps"),
+        ([step("a", depends_on=["b"]), step("b", depends_on=["a"])], "cycle"),
+        ([step("a", depends_on=[]), step("a", depends_on=[])], "duplicate"),
+    ]:
+        try:
+            run(make_executor(TaskTool()), steps)
+        except ValueError as e:
+            assert message in str(e)
+        else:
+            raise AssertionError(f"expected ValueError ({message})")
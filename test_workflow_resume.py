@@ -0,0 +1,115 @@
+# test_workflow_resume.py
+#
+# Resuming a workflow from per-step progress after the process died mid-run: finished
+# steps are restored from the state store (not re-run), with their outputs, attempts
+# and chat history, in both sequential and DAG mode. Tool-only steps, no LLM calls.
+
+import asyncio
+import os
+import tempfile
+from pydantic import BaseModel
+from core.base_agent import AgentConfig, BaseAgent
+from core.base_tool import BaseTool
+from core.schemas import ExecutionContext, ToolResult, WorkflowDefinition, WorkflowStep
+from executors.workflow_executor import WorkflowExecutor
+from memory.state_store.sqlite import SQLiteStateStore
+from stubs import NoLLM
+
+
+class StepInput(BaseModel):
+    label: str
+
+
+class StepTool(BaseTool):
+    """Returns its label uppercased; hangs on labels in `hang` (a process about to die)."""
+
+    name = "step"
+    description = "Run a step"
+    input_model = StepInput
+
+    def __init__(self, hang: set[str] = frozenset()):
+        self.hang = hang
+        self.calls: list[str] = []
+
+    async def execute(self, input: StepInput, context: ExecutionContext) -> ToolResult:
+        self.calls.append(input.label)
+        if input.label in self.hang:
+            await asyncio.Event().wait()
+        return ToolResult(success=True, data=input.label.upper())
+
+
+def workflow(dag: bool) -> WorkflowDefinition:
+    deps = {"extract": [], "clean": ["extract"], "report": ["clean"]} if dag else {}
+    return WorkflowDefinition(
+        name="pipeline",
+        description="",
+        steps=[
+            WorkflowStep(name=name, tool_name="step", prompt=name, input_override={"label": name}, depends_on=deps.get(name))
+            for name in ("extract", "clean", "report")
+        ],
+    )
+
+
+def make_executor(tool: StepTool, store: SQLiteStateStore) -> WorkflowExecutor:
+    agent = BaseAgent(AgentConfig(name="resume", system_prompt="", tools=[tool]), NoLLM())
+    return WorkflowExecutor(agent, ExecutionContext(agent_state=agent.state, session_id="job-1"), state_store=store)
+
+
+async def crash_then_resume(dag: bool) -> tuple[StepTool, WorkflowExecutor, dict]:
+    path = os.path.join(tempfile.mkdtemp(), "progress.db")
+
+    # First process: dies while "report" runs
+    store = SQLiteStateStore(path)
+    first = StepTool(hang={"report"})
+    task = asyncio.create_task(make_executor(first, store).run(workflow(dag)))
+    while "report" not in first.calls:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await store.aclose()
+    assert first.calls == ["extract", "clean", "report"]
+
+    # Second process: same session, fresh agent and store
+    store = SQLiteStateStore(path)
+    second = StepTool()
+    executor = make_executor(second, store)
+    results = await executor.run(workflow(dag))
+    await store.aclose()
+    return second, executor, results
+
+
+def check_resumed(tool: StepTool, executor: WorkflowExecutor, results: dict) -> None:
+    assert tool.calls == ["report"]  # extract and clean were restored, not re-run
+    assert {name: result.data for name, result in results.items()} == {
+        "extract": "EXTRACT", "clean": "CLEAN", "report": "REPORT",
+    }
+    state = executor.agent.state
+    assert state.outputs == {"extract": "EXTRACT", "clean": "CLEAN", "report": "REPORT"}
+    assert [attempt.step for attempt in state.attempts] == ["extract", "clean", "report"]
+    assert [m["content"].split("]")[0] for m in state.chat_history] == [
+        "[Step: extract", "[Step: clean", "[Step: report",
+    ]
+
+
+def test_sequential_resume_after_crash():
+    check_resumed(*asyncio.run(crash_then_resume(dag=False)))
+
+
+def test_dag_resume_after_crash():
+    check_resumed(*asyncio.run(crash_then_resume(dag=True)))
+
+
+def test_finished_run_is_not_repeated():
+    async def main():
+        store = SQLiteStateStore(os.path.join(tempfile.mkdtemp(), "progress.db"))
+        await make_executor(StepTool(), store).run(workflow(dag=False))
+        again = StepTool()
+        results = await make_executor(again, store).run(workflow(dag=False))
+        assert again.calls == [] and results["report"].data == "REPORT"
+
+        await store.delete_step_progress("job-1", ["report"])
+        await make_executor(again, store).run(workflow(dag=False))
+        assert again.calls == ["report"]
+        await store.aclose()
+
+    asyncio.run(main())
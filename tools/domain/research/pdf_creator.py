@@ -1,9 +1,11 @@
 # tools/domain/research/pdf_creator.py
 
+import asyncio
 from pydantic import BaseModel
-from fpdf import FPDF
-from core.base_tool import BaseTool
-from core.schemas import ToolResult, ExecutionContext
+from core.base_tool import SyncTool
+from core.schemas import AgentState, ToolResult, ExecutionContext
+from executors.tool_pool import ToolPool
+from tools.domain.research.pdf_engine import ReportTemplate, renderer_for
 
 
 class PDFCreatorInput(BaseModel):
@@ -12,33 +14,30 @@ class PDFCreatorInput(BaseModel):
     output_path: str
 
 
-class PDFCreatorTool(BaseTool):
+class PDFCreatorTool(SyncTool):
+    """Renders reports with the streaming engine in `pdf_engine` (same layout as FPDF's).
+
+    Each worker process keeps one renderer per template, so font tables and measured
+    words are reused across calls. `render_batch()` spreads many reports over the
+    ToolPool's worker processes.
+    """
+
     name = "pdf_creator"
     description = "Creates a PDF from structured content"
     input_model = PDFCreatorInput
+    execution = "cpu_bound"  # layout is pure Python
 
-    async def execute(self, input: PDFCreatorInput, context: ExecutionContext) -> ToolResult:
+    def __init__(self, template: ReportTemplate | None = None):
+        self.template = template or ReportTemplate()
+
+    def run(self, input: PDFCreatorInput, context: ExecutionContext) -> ToolResult:
         try:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Helvetica", "B", 24)
-            pdf.cell(0, 20, input.title, ln=True, align="C")
-            pdf.ln(10)
-            
-            for section in input.sections:
-                pdf.set_font("Helvetica", "B", 16)
-                pdf.cell(0, 10, section["heading"], ln=True)
-                pdf.set_font("Helvetica", "", 12)
-                pdf.multi_cell(0, 7, section["content"])
-                pdf.ln(5)
-            
-            pdf.output(input.output_path)
-            
+            pages = renderer_for(self.template).render(input.title, input.sections, input.output_path)
             return ToolResult(
                 success=True,
                 tool_name=self.name,
                 input=input.model_dump(),
-                data={"path": input.output_path, "pages": pdf.page_no()},
+                data={"path": input.output_path, "pages": pages},
             )
         except Exception as e:
             return ToolResult(
@@ -46,4 +45,22 @@ class PDFCreatorTool(BaseTool):
                 tool_name=self.name,
                 input=input.model_dump(),
                 error=str(e),
-            )
\ No newline at end of file
+            )
+
+    async def render_batch(
+        self,
+        inputs: list[PDFCreatorInput],
+        pool: ToolPool | None = None,
+        context: ExecutionContext | None = None,
+    ) -> list[ToolResult]:
+        """Render every report across the pool's worker processes. Results keep input order."""
+        pool = pool or ToolPool.shared()
+        context = context or ExecutionContext(agent_state=AgentState(), session_id="pdf_batch")
+
+        async def render_one(input: PDFCreatorInput) -> ToolResult:
+            try:
+                return await pool.execute(self, input, context)
+            except Exception as e:
+                return ToolResult(success=False, tool_name=self.name, input=input.model_dump(), error=str(e))
+
+        return list(await asyncio.gather(*(render_one(input) for input in inputs)))
@@ -0,0 +1,286 @@
+# tools/domain/research/pdf_engine.py
+
+import os
+import zlib
+from fpdf.fonts import CORE_FONTS, CORE_FONTS_CHARWIDTHS
+from pydantic import BaseModel, ConfigDict
+from typing import Literal
+
+PT_PER_MM = 72 / 25.4
+MAX_CACHED_WORDS = 200_000  # per font, per process
+
+
+class ReportTemplate(BaseModel):
+    """Page geometry and type sizes of a report. Lengths in mm, font sizes in pt.
+
+    Defaults reproduce the original FPDF layout: A4, 10 mm margins, page break 20 mm
+    above the bottom edge.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    page_width: float = 210.0
+    page_height: float = 297.0
+    margin: float = 10.0
+    bottom_margin: float = 20.0
+    cell_padding: float = 1.0
+    font: str = "helvetica"  # a core PDF font: helvetica, times or courier
+    title_size: float = 24
+    title_height: float = 20
+    title_gap: float = 10
+    heading_size: float = 16
+    heading_height: float = 10
+    body_size: float = 12
+    line_height: float = 7
+    section_gap: float = 5
+    compress: bool = True
+
+
+class _Font:
+    """A core font's WinAnsi (cp1252) width table plus a cache of measured words."""
+
+    def __init__(self, key: str, resource: str):
+        self.resource = resource  # /F1, /F2 ... in page content
+        self.base_font = CORE_FONTS[key]
+        widths = CORE_FONTS_CHARWIDTHS[key]
+        self.widths: dict[str, int] = {}
+        for code in range(256):
+            try:
+                char = bytes([code]).decode("cp1252")
+            except UnicodeDecodeError:
+                continue
+            self.widths[char] = widths[chr(code)]
+        self._words: dict[str, int] = {}
+
+    def width(self, word: str) -> int:
+        """Width in 1/1000 em."""
+        cached = self._words.get(word)
+        if cached is None:
+            cached = sum(map(self.widths.__getitem__, word))
+            if len(self._words) >= MAX_CACHED_WORDS:
+                self._words.clear()
+            self._words[word] = cached
+        return cached
+
+
+class ReportRenderer:
+    """Lays out title/heading/body reports and streams them to disk page by page.
+
+    Font metrics and measured word widths live on the renderer, so keeping one per
+    template (see `renderer_for()`) makes every later report cheaper. Only the page being
+    laid out is held in memory: finished pages are compressed and written immediately,
+    so a 10,000-page report costs no more memory than a one-page one.
+    """
+
+    def __init__(self, template: ReportTemplate | None = None):
+        self.template = template or ReportTemplate()
+        regular, bold = self.template.font, f"{self.template.font}B"
+        self.regular = _Font(regular, "/F1")
+        self.bold = _Font(bold, "/F2")
+
+    def render(self, title: str, sections: list[dict], output_path: str) -> int:
+        """Write the report to `output_path` (atomically). Returns the page count."""
+        t = self.template
+        layout = _Layout(self, _PDFWriter(output_path + ".part", t, [self.regular, self.bold], title))
+        try:
+            layout.block(title, self.bold, t.title_size, t.title_height, align="center")
+            layout.skip(t.title_gap)
+            for section in sections:
+                layout.block(str(section.get("heading", "")), self.bold, t.heading_size, t.heading_height)
+                layout.block(str(section.get("content", "")), self.regular, t.body_size, t.line_height, align="justify")
+                layout.skip(t.section_gap)
+            pages = layout.finish()
+        except BaseException:
+            layout.writer.abort()
+            raise
+        os.replace(output_path + ".part", output_path)
+        return pages
+
+    def wrap(self, text: str, font: _Font, size: float, max_width: float) -> list[tuple[str, bool]]:
+        """Greedy line breaking at spaces; words wider than a line are split by character.
+
+        Returns (line, ends_paragraph) pairs.
+        """
+        limit = max_width * PT_PER_MM * 1000 / size
+        space = font.widths[" "]
+        lines = []
+        for paragraph in text.split("\n"):
+            current: list[str] = []
+            used = 0
+            for word in paragraph.split(" "):
+                width = font.width(word)
+                if current and used + space + width > limit:
+                    lines.append((" ".join(current), False))
+                    current, used = [], 0
+                if not current and width > limit:
+                    pieces = self._split_word(word, font, limit)
+                    lines.extend((piece, False) for piece in pieces[:-1])
+                    word, width = pieces[-1], font.width(pieces[-1])
+                used = width if not current else used + space + width
+                current.append(word)
+            lines.append((" ".join(current), True))
+        return lines
+
+    def _split_word(self, word: str, font: _Font, limit: float) -> list[str]:
+        pieces, start, used = [], 0, 0
+        for i, char in enumerate(word):
+            width = font.widths[char]
+            if used + width > limit and i > start:
+                pieces.append(word[start:i])
+                start, used = i, 0
+            used += width
+        pieces.append(word[start:])
+        return pieces
+
+
+class _Layout:
+    """Cursor over the page being filled. Mirrors FPDF's cell placement."""
+
+    def __init__(self, renderer: ReportRenderer, writer: "_PDFWriter"):
+        self.renderer = renderer
+        self.writer = writer
+        self.template = renderer.template
+        self.y = self.template.margin
+        self.content: list[bytes] = []
+        self.pages = 0
+
+    def block(
+        self,
+        text: str,
+        font: _Font,
+        size: float,
+        height: float,
+        align: Literal["left", "center", "justify"] = "left",
+    ) -> None:
+        t = self.template
+        text = _winansi(text)
+        inner = t.page_width - 2 * t.margin - 2 * t.cell_padding
+        for line, ends_paragraph in self.renderer.wrap(text, font, size, inner):
+            if self.y + height > t.page_height - t.bottom_margin:
+                self._flush()
+            if line:
+                x = t.margin + t.cell_padding
+                spacing = b""
+                if align != "left":
+                    free = inner - sum(map(font.widths.__getitem__, line)) * size / 1000 / PT_PER_MM
+                    if align == "center":
+                        x += free / 2
+                    elif not ends_paragraph and " " in line:
+                        # Word spacing (applies to the space character), like FPDF's align="J"
+                        spacing = b"%.3f Tw " % (free * PT_PER_MM / line.count(" "))
+                # Baseline as FPDF places it: middle of the cell plus 0.3 em
+                baseline = self.y + height / 2 + 0.3 * size / PT_PER_MM
+                self.content.append(
+                    b"q BT %s %.2f Tf %.2f %.2f Td %s(%s) Tj ET Q\n" % (
+                        font.resource.encode(), size,
+                        x * PT_PER_MM, (t.page_height - baseline) * PT_PER_MM,
+                        spacing, _escape(line),
+                    )
+                )
+            self.y += height
+
+    def skip(self, height: float) -> None:
+        self.y += height  # like FPDF's ln(): never breaks the page by itself
+
+    def finish(self) -> int:
+        self._flush()
+        self.writer.close()
+        return self.pages
+
+    def _flush(self) -> None:
+        self.writer.add_page(b"".join(self.content))
+        self.pages += 1
+        self.content = []
+        self.y = self.template.margin
+
+
+class _PDFWriter:
+    """Minimal PDF 1.4 writer that appends each page as it is finished.
+
+    Object numbers: 1 catalog, 2 page tree (written last, when all kids are known),
+    3 info, 4 resources, then fonts, then content/page pairs.
+    """
+
+    def __init__(self, path: str, template: ReportTemplate, fonts: list[_Font], title: str):
+        self.path = path
+        self.compress = template.compress
+        self.media_box = b"[0 0 %.2f %.2f]" % (template.page_width * PT_PER_MM, template.page_height * PT_PER_MM)
+        self._file = open(path, "wb", buffering=1 << 16)
+        self._offsets: dict[int, int] = {}
+        self._kids: list[int] = []
+        self._next = 5
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        font_refs = []
+        for font in fonts:
+            number = self._allocate()
+            self._object(number, b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % font.base_font.encode())
+            font_refs.append(b"%s %d 0 R" % (font.resource.encode(), number))
+        self._object(4, b"<< /Font << %s >> >>" % b" ".join(font_refs))
+        self._object(3, b"<< /Title %s /Producer (corvus report engine) >>" % _text_string(title))
+
+    def add_page(self, content: bytes) -> None:
+        contents, page = self._allocate(), self._allocate()
+        if self.compress:
+            content = zlib.compress(content, 6)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+        else:
+            header = b"<< /Length %d >>" % len(content)
+        self._object(contents, header + b"\nstream\n" + content + b"\nendstream")
+        self._object(page, b"<< /Type /Page /Parent 2 0 R /MediaBox %s /Resources 4 0 R /Contents %d 0 R >>" % (self.media_box, contents))
+        self._kids.append(page)
+
+    def close(self) -> None:
+        kids = b" ".join(b"%d 0 R" % kid for kid in self._kids)
+        self._object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._kids)))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_at = self._file.tell()
+        size = self._next
+        rows = [b"xref\n0 %d\n0000000000 65535 f \n" % size]
+        rows.extend(b"%010d 00000 n \n" % self._offsets[number] for number in range(1, size))
+        rows.append(b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+        self._file.write(b"".join(rows))
+        self._file.close()
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _allocate(self) -> int:
+        self._next += 1
+        return self._next - 1
+
+    def _object(self, number: int, body: bytes) -> None:
+        self._offsets[number] = self._file.tell()
+        self._file.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+
+_renderers: dict[ReportTemplate, ReportRenderer] = {}
+
+
+def renderer_for(template: ReportTemplate | None = None) -> ReportRenderer:
+    """Renderer for `template`, kept for the life of the process so its caches stay warm."""
+    template = template or ReportTemplate()
+    renderer = _renderers.get(template)
+    if renderer is None:
+        renderer = _renderers[template] = ReportRenderer(template)
+    return renderer
+
+
+def _winansi(text: str) -> str:
+    """Text as the core fonts can show it: characters outside cp1252 become '?'."""
+    return text.encode("cp1252", "replace").decode("cp1252")
+
+
+def _escape(line: str) -> bytes:
+    return (
+        line.encode("cp1252")
+        .replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r")
+    )
+
+
+def _text_string(text: str) -> bytes:
+    """PDF text string for metadata (UTF-16BE with BOM, hex encoded)."""
+    return b"<FEFF%s>" % text.encode("utf-16-be").hex().upper().encode()
@@ -0,0 +1,164 @@
+# tools/domain/sql/execute_query.py
+
+import time
+from pydantic import BaseModel
+from core.base_tool import SyncTool
+from core.schemas import ToolResult, ExecutionContext
+from tools.domain.sql.pool import SQLConnectionPool
+from tools.domain.sql.schema_catalog import SchemaCatalog
+from tools.domain.sql.validate_query import check_statement, is_ddl
+from typing import Any
+
+
+class ExecuteQueryInput(BaseModel):
+    query: str
+    params: list[Any] | dict[str, Any] | None = None  # bound by the driver, never formatted in
+    max_rows: int | None = None  # at most the tool's max_rows
+
+
+class ExecuteQueryTool(SyncTool):
+    """Runs one SQL statement on a pooled connection and returns the rows by column.
+
+    Rows are fetched in batches of `batch_size` and accumulated column by column until
+    the row cap (`max_rows`) is hit or the next row would take the result past the size
+    cap (`max_bytes`, estimated from the values). At most one row past the row cap is
+    fetched, to report `more_rows`. A first row that alone exceeds `max_bytes` is
+    returned with its text cells cut to fit (ending in "…", `truncated` in the metadata).
+    On SQLite, statements are interrupted after `query_timeout` seconds.
+
+    Writes need `allow_writes=True` and a pool that is not read-only; DDL also
+    invalidates the schema catalog. `rows_scanned` in the metadata counts rows read from
+    the cursor; the database may examine more (see validate_query's plan).
+    """
+
+    name = "execute_query"
+    description = (
+        "Runs one SQL query and returns {columns, values (one list per column), rows, more_rows}. "
+        "Pass values through params with placeholders instead of writing them into the query."
+    )
+    input_model = ExecuteQueryInput
+    execution = "blocking_io"
+
+    def __init__(
+        self,
+        pool: SQLConnectionPool,
+        catalog: SchemaCatalog | None = None,
+        allow_writes: bool = False,
+        max_rows: int = 1_000,
+        max_bytes: int = 256_000,
+        batch_size: int = 256,
+        query_timeout: float | None = 30.0,  # seconds, SQLite only; BaseTool.timeout bounds the whole call
+    ):
+        self.pool = pool
+        self.catalog = catalog
+        self.allow_writes = allow_writes and not pool.read_only
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.query_timeout = query_timeout
+
+    def run(self, input: ExecuteQueryInput, context: ExecutionContext) -> ToolResult:
+        started = time.perf_counter()
+        metadata: dict[str, Any] = {"rows_scanned": 0}
+        try:
+            check_statement(input.query, self.allow_writes)
+            with self.pool.connection() as conn:
+                metadata["pool_wait_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                data = self._execute(conn, input, metadata)
+            if is_ddl(input.query) and self.catalog is not None:
+                self.catalog.invalidate()
+            metadata["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return ToolResult(
+                success=True,
+                tool_name=self.name,
+                input=input.model_dump(),
+                data=data,
+                metadata=metadata,
+            )
+        except Exception as e:
+            metadata["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                error=str(e),
+                metadata=metadata,
+            )
+
+    def _execute(self, conn, input: ExecuteQueryInput, metadata: dict) -> dict:
+        max_rows = min(input.max_rows or self.max_rows, self.max_rows)
+        sqlite = self.pool.dialect == "sqlite"
+        if sqlite and self.query_timeout:
+            deadline = time.monotonic() + self.query_timeout
+            # A non-zero return interrupts the statement (checked every 10k VM steps)
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+        cursor = conn.cursor()
+        try:
+            executed = time.perf_counter()
+            cursor.execute(input.query, input.params if input.params is not None else ())
+            metadata["execute_ms"] = round((time.perf_counter() - executed) * 1000, 3)
+            if cursor.description is None:  # INSERT/UPDATE/DDL
+                conn.commit()
+                rowcount = cursor.rowcount
+                return {"rows_affected": rowcount if rowcount is not None and rowcount >= 0 else None}
+            fetched = time.perf_counter()
+            columns = [column[0] for column in cursor.description]
+            values: list[list] = [[] for _ in columns]
+            rows = size = 0
+            more_rows = False
+            while not more_rows:
+                # Never pull more than one row past the cap
+                batch = cursor.fetchmany(min(self.batch_size, max_rows - rows + 1))
+                if not batch:
+                    break
+                metadata["rows_scanned"] += len(batch)
+                for row in batch:
+                    if rows >= max_rows:
+                        more_rows = True
+                        break
+                    row = [_cell(value) for value in row]
+                    row_size = sum(map(_size, row))
+                    if size + row_size > self.max_bytes:
+                        if rows == 0:
+                            # One huge cell must not mean no rows at all, nor the whole cell
+                            row, row_size = _truncate(row, self.max_bytes)
+                            metadata["truncated"] = True
+                        if rows or row_size > self.max_bytes:
+                            more_rows = True
+                            break
+                    for column, value in zip(values, row):
+                        column.append(value)
+                    size += row_size
+                    rows += 1
+            metadata["fetch_ms"] = round((time.perf_counter() - fetched) * 1000, 3)
+            metadata["bytes"] = size
+            return {"columns": columns, "values": values, "rows": rows, "more_rows": more_rows}
+        finally:
+            cursor.close()
+            if sqlite and self.query_timeout:
+                conn.set_progress_handler(None, 0)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"  # blobs don't belong in a prompt
+    return value
+
+
+def _truncate(row: list, budget: int) -> tuple[list, int]:
+    """Cut the row's text cells so the row's size fits in budget, sharing it out fairly."""
+    cells = list(row)
+    room = budget - sum(_size(value) for value in row if not isinstance(value, str))
+    texts = sorted((i for i, value in enumerate(row) if isinstance(value, str)), key=lambda i: len(row[i]))
+    for n, i in enumerate(texts):
+        share = room // (len(texts) - n)  # short cells stay whole and leave their rest to longer ones
+        if _size(cells[i]) > share:
+            cells[i] = cells[i][: max(0, share - 3)] + "…"
+        room -= _size(cells[i])
+    return cells, sum(map(_size, cells))
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value) + 2
+    return 8 if value is not None else 4
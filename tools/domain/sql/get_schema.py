@@ -0,0 +1,96 @@
+# tools/domain/sql/get_schema.py
+
+import difflib
+import time
+from pydantic import BaseModel
+from core.base_tool import SyncTool
+from core.schemas import ToolResult, ExecutionContext
+from tools.domain.sql.schema_catalog import SchemaCatalog, TableInfo
+
+
+class GetSchemaInput(BaseModel):
+    tables: list[str] | None = None  # None = every table (names only when there are many)
+    refresh: bool = False  # re-read the database instead of the cached catalog
+
+
+class GetSchemaTool(SyncTool):
+    """Describes tables from the shared SchemaCatalog, so repeated calls cost no introspection.
+
+    Without `tables`, a database with more than `max_tables` tables is listed by name and
+    column count only; the agent then asks for the tables it needs.
+    """
+
+    name = "get_schema"
+    description = (
+        "Describes the database: tables, columns (type, NOT NULL, PK), indexes and foreign keys. "
+        "Pass `tables` to describe only those."
+    )
+    input_model = GetSchemaInput
+    execution = "blocking_io"
+
+    def __init__(self, catalog: SchemaCatalog, max_tables: int = 30):
+        self.catalog = catalog
+        self.max_tables = max_tables
+
+    def run(self, input: GetSchemaInput, context: ExecutionContext) -> ToolResult:
+        started = time.perf_counter()
+        try:
+            tables, rows_scanned, cached = self.catalog.get(refresh=input.refresh)
+            if input.tables is not None:
+                lookup = {name.lower(): name for name in tables}
+                found = [lookup[name.lower()] for name in input.tables if name.lower() in lookup]
+                missing = [name for name in input.tables if name.lower() not in lookup]
+                data = {"tables": [describe(tables[name]) for name in found]}
+                if missing:
+                    data["missing"] = {
+                        name: difflib.get_close_matches(name, list(tables), n=3) for name in missing
+                    }
+            elif len(tables) > self.max_tables:
+                data = {
+                    "tables": {name: f"{table.kind}, {len(table.columns)} columns" for name, table in tables.items()},
+                    "note": f"{len(tables)} tables; pass `tables` for their columns",
+                }
+            else:
+                data = {"tables": [describe(table) for table in tables.values()]}
+            return ToolResult(
+                success=not data.get("missing") or bool(data["tables"]),
+                tool_name=self.name,
+                input=input.model_dump(),
+                data=data,
+                error=f"Unknown tables: {', '.join(data['missing'])}" if data.get("missing") else None,
+                metadata={
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "rows_scanned": rows_scanned,
+                    "cached": cached,
+                },
+            )
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                error=str(e),
+                metadata={"latency_ms": round((time.perf_counter() - started) * 1000, 3), "rows_scanned": 0},
+            )
+
+
+def describe(table: TableInfo) -> dict:
+    """Compact form for the prompt: one string per column."""
+    columns = []
+    for column in table.columns:
+        parts = [column.name, column.type]
+        if column.primary_key:
+            parts.append("PK")
+        elif not column.nullable:
+            parts.append("NOT NULL")
+        if column.default is not None:
+            parts.append(f"DEFAULT {column.default}")
+        columns.append(" ".join(part for part in parts if part))
+    described = {"name": table.name, "columns": columns}
+    if table.kind != "table":
+        described["kind"] = table.kind
+    if table.indexes:
+        described["indexes"] = table.indexes
+    if table.foreign_keys:
+        described["foreign_keys"] = table.foreign_keys
+    return described
@@ -0,0 +1,145 @@
+# tools/domain/sql/pool.py
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+from pydantic import BaseModel
+from typing import Any, Callable, Iterator, Literal
+
+
+class SQLPoolStats(BaseModel):
+    acquired: int = 0
+    created: int = 0  # connections opened; acquired / created = reuse factor
+    discarded: int = 0  # closed after an error left them unusable
+    in_use: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquired if self.acquired else 0.0
+
+
+class SQLConnectionPool:
+    """Bounded pool of DB-API connections shared by the SQL tools.
+
+    The tools are blocking_io SyncTools, so connections are borrowed from worker threads:
+    `connect` must return connections usable from any thread (for sqlite3,
+    check_same_thread=False). At most `max_size` are open; further callers wait up to
+    `acquire_timeout`. A connection is rolled back when returned, so no transaction
+    outlives a call, and one that fails to roll back is closed instead of reused.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 4,
+        dialect: Literal["sqlite", "generic"] = "generic",
+        read_only: bool = False,
+        acquire_timeout: float = 30.0,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.dialect = dialect
+        self.read_only = read_only
+        self.acquire_timeout = acquire_timeout
+        self.stats = SQLPoolStats()
+        self._idle: queue.LifoQueue = queue.LifoQueue()  # most recently used first: warm caches
+        self._lock = threading.Lock()
+        self._open = 0
+        self._closed = False
+
+    @classmethod
+    def sqlite(cls, path: str, read_only: bool = True, max_size: int = 4, **kwargs) -> "SQLConnectionPool":
+        """Pool over a SQLite file. Read-only pools open it with mode=ro and query_only."""
+        uri = f"file:{quote(os.path.abspath(path))}" + ("?mode=ro" if read_only else "")
+
+        def connect() -> sqlite3.Connection:
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            if read_only:
+                conn.execute("PRAGMA query_only = ON")
+            return conn
+
+        return cls(connect, max_size=max_size, dialect="sqlite", read_only=read_only, **kwargs)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn, wait = self._acquire()
+        with self._lock:  # callers are on different threads
+            self.stats.acquired += 1
+            self.stats.in_use += 1
+            self.stats.total_wait_seconds += wait
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self.stats.in_use -= 1
+            self._release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+    def _acquire(self) -> tuple[Any, float]:
+        if self._closed:
+            raise RuntimeError("SQLConnectionPool is closed")
+        started = time.perf_counter()
+        deadline = started + self.acquire_timeout
+        while True:
+            try:
+                return self._idle.get_nowait(), time.perf_counter() - started
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = self._open < self.max_size
+                if create:
+                    self._open += 1
+            if create:
+                try:
+                    conn = self.connect()
+                except BaseException:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+                with self._lock:
+                    self.stats.created += 1
+                return conn, time.perf_counter() - started
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"No database connection free after {self.acquire_timeout}s")
+            try:
+                # Short waits: a discarded connection frees a slot without anything being queued
+                return self._idle.get(timeout=min(remaining, 0.1)), time.perf_counter() - started
+            except queue.Empty:
+                continue
+
+    def _release(self, conn: Any) -> None:
+        try:
+            conn.rollback()
+        except Exception:
+            with self._lock:
+                self.stats.discarded += 1
+            self._close(conn)
+            return
+        if self._closed:
+            self._close(conn)
+        else:
+            self._idle.put(conn)
+
+    def _close(self, conn: Any) -> None:
+        with self._lock:
+            self._open -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
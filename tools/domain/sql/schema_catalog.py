@@ -0,0 +1,155 @@
+# tools/domain/sql/schema_catalog.py
+
+import threading
+import time
+from pydantic import BaseModel
+from tools.domain.sql.pool import SQLConnectionPool
+
+DEFAULT_SCHEMAS = {"main", "public", "dbo"}  # tables here are listed without a schema prefix
+
+
+class ColumnInfo(BaseModel):
+    name: str
+    type: str = ""
+    nullable: bool = True
+    primary_key: bool = False
+    default: str | None = None
+
+
+class TableInfo(BaseModel):
+    name: str
+    kind: str = "table"  # or "view"
+    columns: list[ColumnInfo] = []
+    indexes: list[str] = []  # "idx_orders_user (user_id, created_at) UNIQUE"
+    foreign_keys: list[str] = []  # "user_id -> users.id"
+
+
+class SchemaCatalogStats(BaseModel):
+    hits: int = 0
+    loads: int = 0
+    invalidations: int = 0
+    last_load_seconds: float = 0.0
+
+
+class SchemaCatalog:
+    """Tables, columns, indexes and foreign keys, introspected once and served from memory.
+
+    For SQLite each lookup compares `PRAGMA schema_version` (one cheap read) with the
+    loaded version, so DDL from any connection or process is picked up. Other databases
+    keep the catalog for `ttl` seconds (None = until `invalidate()`); ExecuteQueryTool
+    invalidates it after DDL it runs itself.
+    """
+
+    def __init__(self, pool: SQLConnectionPool, ttl: float | None = 300.0):
+        self.pool = pool
+        self.ttl = ttl
+        self.stats = SchemaCatalogStats()
+        self._tables: dict[str, TableInfo] | None = None
+        self._version: int | None = None
+        self._loaded_at = 0.0
+        self._generation = 0  # bumped by invalidate(); a load that raced with it isn't kept
+        self._lock = threading.Lock()
+
+    def get(self, refresh: bool = False) -> tuple[dict[str, TableInfo], int, bool]:
+        """(tables by name, catalog rows read, served from memory)."""
+        with self._lock, self.pool.connection() as conn:
+            version = _schema_version(conn) if self.pool.dialect == "sqlite" else None
+            if not refresh and self._tables is not None and self._valid(version):
+                self.stats.hits += 1
+                return self._tables, 0, True
+            generation = self._generation
+            started = time.perf_counter()
+            loader = _load_sqlite if self.pool.dialect == "sqlite" else _load_information_schema
+            tables, rows = loader(conn)
+            if generation == self._generation:
+                self._tables, self._version, self._loaded_at = tables, version, time.monotonic()
+            self.stats.loads += 1
+            self.stats.last_load_seconds = time.perf_counter() - started
+            return tables, rows, False
+
+    def invalidate(self) -> None:
+        # No lock: get() holds it while waiting for a connection the caller may hold
+        self._generation += 1
+        self._tables = None
+        self.stats.invalidations += 1
+
+    def _valid(self, version: int | None) -> bool:
+        if version is not None:
+            return version == self._version
+        return self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+
+
+def _schema_version(conn) -> int:
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _load_sqlite(conn) -> tuple[dict[str, TableInfo], int]:
+    rows = 0
+    objects = conn.execute(
+        "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view') "
+        "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    ).fetchall()
+    rows += len(objects)
+    tables = {}
+    for name, kind in objects:
+        quoted = _quote(name)
+        columns = conn.execute(f"PRAGMA table_info({quoted})").fetchall()
+        indexes = conn.execute(f"PRAGMA index_list({quoted})").fetchall()
+        foreign_keys = conn.execute(f"PRAGMA foreign_key_list({quoted})").fetchall()
+        rows += len(columns) + len(indexes) + len(foreign_keys)
+        table = TableInfo(
+            name=name,
+            kind=kind,
+            columns=[
+                ColumnInfo(name=column, type=type_ or "", nullable=not notnull, primary_key=bool(pk), default=default)
+                for _, column, type_, notnull, default, pk in columns
+            ],
+            foreign_keys=[
+                f"{row[3]} -> {row[2]}.{row[4]}" if row[4] else f"{row[3]} -> {row[2]}"
+                for row in foreign_keys
+            ],
+        )
+        for index in indexes:
+            index_name, unique, origin = index[1], index[2], index[3]
+            if origin == "pk":
+                continue  # already shown on the columns
+            parts = conn.execute(f"PRAGMA index_info({_quote(index_name)})").fetchall()
+            rows += len(parts)
+            described = f"{index_name} ({', '.join(str(part[2]) for part in parts)})"
+            table.indexes.append(described + (" UNIQUE" if unique else ""))
+        tables[name] = table
+    return tables, rows
+
+
+def _load_information_schema(conn) -> tuple[dict[str, TableInfo], int]:
+    """Columns from the SQL-standard information_schema (Postgres, MySQL, SQL Server...)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT c.table_schema, c.table_name, t.table_type, c.column_name, c.data_type, "
+        "c.is_nullable, c.column_default "
+        "FROM information_schema.columns c JOIN information_schema.tables t "
+        "ON t.table_schema = c.table_schema AND t.table_name = c.table_name "
+        "WHERE c.table_schema NOT IN ('information_schema', 'pg_catalog', 'sys', 'mysql', 'performance_schema') "
+        "ORDER BY c.table_schema, c.table_name, c.ordinal_position"
+    )
+    tables: dict[str, TableInfo] = {}
+    rows = 0
+    for schema, table_name, table_type, column, data_type, is_nullable, default in cursor.fetchall():
+        rows += 1
+        name = table_name if schema in DEFAULT_SCHEMAS else f"{schema}.{table_name}"
+        table = tables.get(name)
+        if table is None:
+            kind = "view" if "VIEW" in str(table_type).upper() else "table"
+            table = tables[name] = TableInfo(name=name, kind=kind)
+        table.columns.append(ColumnInfo(
+            name=column,
+            type=str(data_type),
+            nullable=str(is_nullable).upper() == "YES",
+            default=None if default is None else str(default),
+        ))
+    cursor.close()
+    return tables, rows
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
@@ -0,0 +1,165 @@
+# tools/domain/sql/validate_query.py
+
+import re
+import time
+from pydantic import BaseModel
+from core.base_tool import SyncTool
+from core.schemas import ToolResult, ExecutionContext
+from tools.domain.sql.pool import SQLConnectionPool
+from typing import Any
+
+READ_STATEMENTS = {"select", "with", "values", "explain"}
+DDL_STATEMENTS = {"create", "alter", "drop", "rename", "truncate"}
+WRITE_KEYWORDS = re.compile(r"\b(insert|update|delete|replace|merge|upsert)\b", re.IGNORECASE)
+NAMED_PARAMETER = re.compile(r"[:@$]([A-Za-z_]\w*)")
+
+
+class ValidateQueryInput(BaseModel):
+    query: str
+    params: list[Any] | dict[str, Any] | None = None  # None = validate with NULL placeholders
+
+
+class ValidateQueryTool(SyncTool):
+    """Checks a query without running it: one statement, allowed kind, and a query plan.
+
+    The database compiles the statement (`EXPLAIN QUERY PLAN` on SQLite, `EXPLAIN`
+    elsewhere), so unknown tables or columns and syntax errors surface here. On SQLite
+    the plan's full-table SCAN steps are listed under `scans`.
+    """
+
+    name = "validate_query"
+    description = (
+        "Checks a SQL query without executing it. Returns whether it is valid and read-only, "
+        "its query plan, and which tables it would scan in full."
+    )
+    input_model = ValidateQueryInput
+    execution = "blocking_io"
+
+    def __init__(self, pool: SQLConnectionPool, allow_writes: bool = False):
+        self.pool = pool
+        self.allow_writes = allow_writes and not pool.read_only
+
+    def run(self, input: ValidateQueryInput, context: ExecutionContext) -> ToolResult:
+        started = time.perf_counter()
+        metadata = {"rows_scanned": 0}
+        try:
+            kind = check_statement(input.query, self.allow_writes)
+            with self.pool.connection() as conn:
+                metadata["pool_wait_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                plan = explain(conn, self.pool.dialect, input.query, input.params)
+            metadata["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return ToolResult(
+                success=True,
+                tool_name=self.name,
+                input=input.model_dump(),
+                data={
+                    "valid": True,
+                    "statement": kind,
+                    "read_only": is_read_only(input.query),
+                    "plan": plan,
+                    "scans": [step for step in plan if step.startswith("SCAN ") and "INDEX" not in step],
+                },
+                metadata=metadata,
+            )
+        except Exception as e:
+            metadata["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                data={"valid": False},
+                error=str(e),
+                metadata=metadata,
+            )
+
+
+def explain(conn, dialect: str, query: str, params: list | dict | None) -> list[str]:
+    """The database's plan for `query`, one step per line; compiling it validates it."""
+    statement = strip_sql(query).rstrip().rstrip(";")
+    if dialect == "sqlite":
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query.strip().rstrip(';')}", _placeholders(statement, params)).fetchall()
+        depth = {0: -1}
+        plan = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[node] + detail if depth[node] else detail)
+        return plan
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"EXPLAIN {query.strip().rstrip(';')}", params or ())
+        return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def check_statement(query: str, allow_writes: bool) -> str:
+    """Statement keyword ("select", "insert", ...) of a single-statement query, or ValueError."""
+    statements = [part for part in strip_sql(query).split(";") if part.strip()]
+    if not statements:
+        raise ValueError("Empty query")
+    if len(statements) > 1:
+        raise ValueError("Only one statement per call")
+    kind = statement_kind(query)
+    if not allow_writes and not is_read_only(query):
+        raise ValueError(f"Only read-only queries are allowed, got {kind.upper()}")
+    return kind
+
+
+def statement_kind(query: str) -> str:
+    words = strip_sql(query).split(None, 1)
+    return words[0].lower() if words else ""
+
+
+def is_read_only(query: str) -> bool:
+    kind = statement_kind(query)
+    if kind not in READ_STATEMENTS:
+        return False
+    # WITH ... DELETE and EXPLAIN ANALYZE INSERT still write
+    return not WRITE_KEYWORDS.search(strip_sql(query))
+
+
+def is_ddl(query: str) -> bool:
+    return statement_kind(query) in DDL_STATEMENTS
+
+
+def strip_sql(query: str) -> str:
+    """The query with comments removed and string literals / quoted identifiers blanked."""
+    out = []
+    i, length = 0, len(query)
+    while i < length:
+        char = query[i]
+        if char == "-" and query.startswith("--", i):
+            end = query.find("\n", i)
+            i = length if end == -1 else end
+        elif char == "/" and query.startswith("/*", i):
+            end = query.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            out.append(" ")
+        elif char in "'\"`[":
+            closing = "]" if char == "[" else char
+            end = i + 1
+            while True:
+                end = query.find(closing, end)
+                if end == -1:
+                    end = length
+                    break
+                if closing != "]" and query.startswith(closing * 2, end):  # '' escape
+                    end += 2
+                    continue
+                break
+            out.append(char + "_" + closing)
+            i = end + 1
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def _placeholders(statement: str, params: list | dict | None) -> list | dict:
+    """Given params, or NULLs for every placeholder so the statement can be compiled."""
+    if params is not None:
+        return params
+    names = NAMED_PARAMETER.findall(statement)
+    if names:
+        return dict.fromkeys(names)
+    return [None] * statement.count("?")
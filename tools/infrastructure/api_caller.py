@@ -0,0 +1,422 @@
+# tools/infrastructure/api_caller.py
+
+import email.utils
+import time
+from collections import OrderedDict
+from urllib.parse import urljoin
+import httpx
+import orjson
+from pydantic import BaseModel
+from core.base_tool import BaseTool
+from core.schemas import ToolResult, ExecutionContext
+from memory.result_store import preview
+from providers.http_pool import HTTPPoolConfig, PooledHTTPClient
+from typing import Any, Literal
+
+# Cacheable by default (RFC 9110 15.1); anything else is never stored
+CACHEABLE_STATUS = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_HEURISTIC_FRESHNESS = 24 * 3600.0
+
+
+class ApiCallerInput(BaseModel):
+    url: str
+    method: Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    params: dict[str, str | int | float | bool] | None = None
+    headers: dict[str, str] | None = None
+    json_body: Any = None
+    fields: list[str] | None = None  # dotted paths to keep, "*" = every list item: ["items.*.id", "total"]
+    max_bytes: int | None = None  # body cap for this call; never above the tool's max_response_bytes
+
+
+class HTTPCacheStats(BaseModel):
+    hits: int = 0  # fresh entry, no request sent
+    revalidated: int = 0  # stale entry confirmed by 304 Not Modified
+    misses: int = 0
+    stored: int = 0
+    invalidated: int = 0  # dropped after a POST/PUT/PATCH/DELETE to the same URL
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.revalidated
+        total = served + self.misses
+        return served / total if total else 0.0
+
+
+class CachedResponse:
+    """Stored GET response plus what RFC 9111 needs to compute its age."""
+
+    def __init__(self, status: int, headers: httpx.Headers, body: bytes, vary: dict[str, str | None], request_time: float, response_time: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.vary = vary  # request header values the response was selected on
+        self.request_time = request_time
+        self.response_time = response_time
+
+    def current_age(self, now: float) -> float:
+        date = _http_date(self.headers.get("date"))
+        apparent_age = max(0.0, self.response_time - date) if date is not None else 0.0
+        try:
+            age_value = float(self.headers.get("age", 0))
+        except ValueError:
+            age_value = 0.0
+        corrected_initial_age = max(apparent_age, age_value + (self.response_time - self.request_time))
+        return corrected_initial_age + (now - self.response_time)
+
+    def freshness_lifetime(self) -> float:
+        directives = _cache_control(self.headers.get("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        for name in ("s-maxage", "max-age"):  # we are a shared cache: s-maxage wins
+            if directives.get(name) is not None:
+                try:
+                    return max(0.0, float(directives[name]))
+                except ValueError:
+                    return 0.0
+        expires = self.headers.get("expires")
+        if expires is not None:
+            expires_at = _http_date(expires)
+            date = _http_date(self.headers.get("date")) or self.response_time
+            return max(0.0, expires_at - date) if expires_at is not None else 0.0
+        last_modified = _http_date(self.headers.get("last-modified"))
+        if last_modified is not None and "public" not in directives:
+            # Heuristic freshness: 10% of the time since the last change
+            date = _http_date(self.headers.get("date")) or self.response_time
+            return min(MAX_HEURISTIC_FRESHNESS, max(0.0, (date - last_modified) / 10))
+        return 0.0
+
+
+class HTTPCache:
+    """Shared in-memory HTTP cache for GET responses, after RFC 9111.
+
+    Stores responses that carry freshness information (s-maxage, max-age, Expires) or a
+    validator (ETag, Last-Modified), and skips no-store, private, `Vary: *` and
+    authorized requests unless the response explicitly allows sharing. Stale entries are
+    revalidated with If-None-Match / If-Modified-Since; one variant is kept per URL.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = HTTPCacheStats()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+
+    def lookup(self, url: str, request_headers: httpx.Headers) -> CachedResponse | None:
+        if "no-store" in _cache_control(request_headers.get("cache-control")):
+            return None
+        entry = self._entries.get(url)
+        if entry is None or any(request_headers.get(name) != value for name, value in entry.vary.items()):
+            return None
+        self._entries.move_to_end(url)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse, request_headers: httpx.Headers) -> bool:
+        directives = _cache_control(request_headers.get("cache-control"))
+        if "no-cache" in directives or request_headers.get("pragma") == "no-cache":
+            return False
+        age = entry.current_age(time.time())
+        if directives.get("max-age") is not None:
+            try:
+                if age > float(directives["max-age"]):
+                    return False
+            except ValueError:
+                return False
+        return age < entry.freshness_lifetime()
+
+    def store(
+        self,
+        url: str,
+        request_headers: httpx.Headers,
+        status: int,
+        headers: httpx.Headers,
+        body: bytes,
+        request_time: float,
+        response_time: float,
+    ) -> bool:
+        response_directives = _cache_control(headers.get("cache-control"))
+        vary_names = [name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()]
+        if (
+            status not in CACHEABLE_STATUS
+            or "no-store" in response_directives
+            or "no-store" in _cache_control(request_headers.get("cache-control"))
+            or "private" in response_directives
+            or "*" in vary_names
+            or len(body) > self.max_bytes
+        ):
+            return False
+        if "authorization" in request_headers and not {"public", "s-maxage", "must-revalidate"} & response_directives.keys():
+            return False
+        entry = CachedResponse(
+            status, headers, body,
+            {name: request_headers.get(name) for name in vary_names},
+            request_time, response_time,
+        )
+        if entry.freshness_lifetime() <= 0 and "etag" not in headers and "last-modified" not in headers:
+            return False  # could never be served or revalidated
+        self._remove(url)
+        self._entries[url] = entry
+        self._bytes += len(body)
+        self.stats.stored += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+        return True
+
+    def refresh(self, entry: CachedResponse, headers: httpx.Headers, request_time: float, response_time: float) -> None:
+        """Apply a 304's headers to the stored response (RFC 9111 4.3.4)."""
+        for name in {name.lower() for name in headers.keys()} - {"content-length", "content-encoding", "transfer-encoding"}:
+            entry.headers[name] = ", ".join(headers.get_list(name))
+        entry.request_time, entry.response_time = request_time, response_time
+
+    def invalidate(self, url: str, headers: httpx.Headers | None = None) -> None:
+        """Drop the URL, and the Location/Content-Location of the response, after an unsafe request."""
+        urls = {url}
+        for name in ("location", "content-location"):
+            if headers is not None and headers.get(name):
+                urls.add(urljoin(url, headers[name]))
+        for target in urls:
+            if target in self._entries:
+                self._remove(target)
+                self.stats.invalidated += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> dict[str, str]:
+        headers = {}
+        if entry.headers.get("etag"):
+            headers["if-none-match"] = entry.headers["etag"]
+        if entry.headers.get("last-modified"):
+            headers["if-modified-since"] = entry.headers["last-modified"]
+        return headers
+
+
+class ApiCallerTool(BaseTool):
+    """Generic HTTP/REST tool over pooled keep-alive connections.
+
+    One PooledHTTPClient per origin, so `pool_config` limits apply per host and every
+    call to a host reuses its connections. GET responses go through an RFC 9111 cache
+    (`cache=True` for a private one, an HTTPCache to share it, False to disable).
+
+    Bodies are streamed and cut at `max_response_bytes`; JSON is parsed once and
+    projected to `fields` straight away, so only those values reach the ToolResult, which
+    is itself capped at `max_result_chars`.
+    """
+
+    name = "api_caller"
+    description = (
+        "Calls an HTTP API and returns the status and body. For JSON, pass `fields` "
+        "(dotted paths, '*' for every list item, e.g. ['items.*.id', 'total']) to get only what you need."
+    )
+    input_model = ApiCallerInput
+
+    def __init__(
+        self,
+        allowed_hosts: list[str] | None = None,  # None = any; ".corp.example" matches subdomains
+        headers: dict[str, str] | None = None,  # sent on every call, e.g. auth for internal APIs
+        pool_config: HTTPPoolConfig | None = None,
+        cache: bool | HTTPCache = True,
+        max_response_bytes: int = 2_000_000,
+        max_result_chars: int = 8_000,
+    ):
+        self.allowed_hosts = allowed_hosts
+        self.headers = headers or {}
+        self.pool_config = pool_config or HTTPPoolConfig(max_connections=10, max_keepalive_connections=5, timeout=30.0)
+        self.cache = cache if isinstance(cache, HTTPCache) else (HTTPCache() if cache else None)
+        self.max_response_bytes = max_response_bytes
+        self.max_result_chars = max_result_chars
+        self._clients: dict[str, PooledHTTPClient] = {}
+
+    @property
+    def pool_stats(self) -> dict:
+        return {origin: client.stats for origin, client in self._clients.items()}
+
+    async def execute(self, input: ApiCallerInput, context: ExecutionContext) -> ToolResult:
+        try:
+            url = httpx.URL(input.url, params=input.params) if input.params else httpx.URL(input.url)
+            self._check_host(url)
+            status, data, metadata = await self._call(input, url)
+            return ToolResult(
+                success=status < 400,
+                tool_name=self.name,
+                input=input.model_dump(),
+                data=data,
+                error=None if status < 400 else f"HTTP {status}",
+                metadata=metadata,
+            )
+        except (httpx.HTTPError, orjson.JSONDecodeError, ValueError) as e:
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                error=f"{type(e).__name__}: {e}",
+            )
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def _call(self, input: ApiCallerInput, url: httpx.URL) -> tuple[int, dict, dict]:
+        cap = min(input.max_bytes or self.max_response_bytes, self.max_response_bytes)
+        request_headers = httpx.Headers({**self.headers, **(input.headers or {})})
+        key = str(url)
+        entry = None
+        cache_status = "bypass"
+        send_headers = request_headers
+        if self.cache is not None and input.method == "GET":
+            entry = self.cache.lookup(key, request_headers)
+            if entry is not None and self.cache.is_fresh(entry, request_headers):
+                self.cache.stats.hits += 1
+                return self._result(input, entry.status, entry.headers, entry.body, False, cap, "hit")
+            cache_status = "miss"
+            if entry is not None:
+                send_headers = request_headers.copy()
+                send_headers.update(HTTPCache.conditional_headers(entry))
+
+        request_time = time.time()
+        client = self._client(url)
+        kwargs = {"json": input.json_body} if input.json_body is not None else {}
+        async with client.stream(input.method, key, headers=send_headers, **kwargs) as response:
+            body, truncated = await _read_capped(response, cap)
+        response_time = time.time()
+
+        if self.cache is not None:
+            if entry is not None and response.status_code == 304:
+                self.cache.refresh(entry, response.headers, request_time, response_time)
+                self.cache.stats.revalidated += 1
+                return self._result(input, entry.status, entry.headers, entry.body, False, cap, "revalidated")
+            if cache_status == "miss":
+                self.cache.stats.misses += 1
+                if not truncated:
+                    self.cache.store(key, request_headers, response.status_code, response.headers, body, request_time, response_time)
+            elif input.method in UNSAFE_METHODS and response.status_code < 400:
+                self.cache.invalidate(key, response.headers)
+        return self._result(input, response.status_code, response.headers, body, truncated, cap, cache_status)
+
+    def _result(
+        self,
+        input: ApiCallerInput,
+        status: int,
+        headers: httpx.Headers,
+        body: bytes,
+        truncated: bool,
+        cap: int,
+        cache_status: str,
+    ) -> tuple[int, dict, dict]:
+        if len(body) > cap:  # a cached body may be larger than this call allows
+            body, truncated = body[:cap], True
+        content_type = headers.get("content-type", "")
+        media_type = content_type.split(";")[0].strip().lower()
+        is_json = media_type == "application/json" or media_type.endswith("+json")
+        if input.fields and not is_json:
+            raise ValueError(f"fields need a JSON response, got {media_type or 'no content type'}")
+        if is_json and body:
+            if truncated:
+                raise ValueError(f"JSON response is larger than {cap} bytes; request less or raise max_bytes")
+            content = orjson.loads(body)
+            if input.fields:
+                content = project(content, input.fields)
+        else:
+            content = body.decode(_charset(content_type) or "utf-8", errors="replace")
+        rendered = orjson.dumps(content).decode() if is_json and body else content
+        oversized = len(rendered) > self.max_result_chars
+        data = {
+            "status": status,
+            "content_type": content_type,
+            "body": preview(content, self.max_result_chars) if oversized else content,
+            "cache": cache_status,
+        }
+        if headers.get("location"):
+            data["location"] = headers["location"]
+        metadata = {"bytes": len(body), "truncated": truncated or oversized}
+        return status, data, metadata
+
+    def _client(self, url: httpx.URL) -> PooledHTTPClient:
+        origin = f"{url.scheme}://{url.netloc.decode()}"
+        client = self._clients.get(origin)
+        if client is None:
+            client = self._clients[origin] = PooledHTTPClient(origin, self.pool_config)
+        return client
+
+    def _check_host(self, url: httpx.URL) -> None:
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme '{url.scheme}'")
+        if self.allowed_hosts is None:
+            return
+        host = url.host
+        for allowed in self.allowed_hosts:
+            if host == allowed or (allowed.startswith(".") and host.endswith(allowed)):
+                return
+        raise ValueError(f"Host '{host}' is not in allowed_hosts")
+
+
+def project(data: Any, fields: list[str]) -> dict[str, Any]:
+    """Values at dotted paths, e.g. {"items.*.id": [1, 2], "total": 2}. Missing paths give None."""
+    return {field: _select(data, field.split(".")) for field in fields}
+
+
+def _select(data: Any, parts: list[str]) -> Any:
+    for i, part in enumerate(parts):
+        if part == "*":
+            if not isinstance(data, list):
+                return None
+            return [_select(item, parts[i + 1:]) for item in data]
+        if isinstance(data, list):
+            try:
+                data = data[int(part)]
+            except (ValueError, IndexError):
+                return None
+        elif isinstance(data, dict):
+            data = data.get(part)
+        else:
+            return None
+    return data
+
+
+async def _read_capped(response: httpx.Response, cap: int) -> tuple[bytes, bool]:
+    """Body (decompressed) up to `cap` bytes, and whether there was more."""
+    chunks, size = [], 0
+    async for chunk in response.aiter_bytes():
+        if size + len(chunk) > cap:
+            chunks.append(chunk[:cap - size])
+            return b"".join(chunks), True  # leaving the stream closes the connection
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks), False
+
+
+def _cache_control(value: str | None) -> dict[str, str | None]:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _charset(content_type: str) -> str | None:
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.strip().partition("=")
+        if name.lower() == "charset" and value:
+            return value.strip('"')
+    return None
@@ -1,3 +1,8 @@
+import asyncio
+import time
+from collections import OrderedDict
+from itertools import zip_longest
+from urllib.parse import urlsplit, urlunsplit
 from ddgs import DDGS
 from datetime import datetime
 from pydantic import BaseModel
@@ -5,27 +10,148 @@ from core.base_tool import BaseTool
 from core.schemas import ToolResult, ExecutionContext
 
 class DuckSearchInput(BaseModel):
-    search_key: str
-    max_results: int = 5
+    search_key: str | list[str]  # several keys are searched concurrently, results merged by URL
+    max_results: int = 5  # per key
 
 class DuckDuckGoSearchTool(BaseTool):
+    """DuckDuckGo text search, run in worker threads so the event loop never waits on it.
+
+    Results are cached for `cache_ttl` seconds per (normalized key, max_results), and
+    identical searches already in flight are shared instead of sent twice.
+    """
+
     name = "duckduckgo_web_search"
-    description = "Searches the web using DuckDuckGo"
+    description = "Searches the web using DuckDuckGo. Pass a list of keys to run several searches at once."
     input_model = DuckSearchInput
 
+    def __init__(self, cache_ttl: float = 600.0, max_cache_entries: int = 512, max_parallel_searches: int = 4):
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self.max_parallel_searches = max_parallel_searches  # upstream calls at once, across all sessions
+        self.cache_hits = 0
+        self.searches = 0  # sent to DuckDuckGo
+        self._cache: OrderedDict[tuple[str, int], tuple[float, list[dict]]] = OrderedDict()
+        self._in_flight: dict[tuple[str, int], asyncio.Task] = {}
+        self._slots: asyncio.Semaphore | None = None
+
     async def execute(self, input: DuckSearchInput, context: ExecutionContext) -> ToolResult:
-        try:
-            results = DDGS().text(input.search_key, max_results=input.max_results)
+        keys = [input.search_key] if isinstance(input.search_key, str) else input.search_key
+        keys = list(dict.fromkeys(key for key in keys if key.strip()))
+        if not keys:
             return ToolResult(
-                success=True,
+                success=False,
                 tool_name=self.name,
                 input=input.model_dump(),
-                data={"results": results},
+                error="No search key given",
             )
-        except Exception as e:
+
+        outcomes = await asyncio.gather(
+            *(self.search(key, input.max_results) for key in keys),
+            return_exceptions=True,
+        )
+        errors = {key: str(outcome) for key, outcome in zip(keys, outcomes) if isinstance(outcome, BaseException)}
+        if len(errors) == len(keys):
             return ToolResult(
                 success=False,
                 tool_name=self.name,
                 input=input.model_dump(),
-                error=str(e),
-            )
\ No newline at end of file
+                error="; ".join(errors.values()),
+            )
+
+        ranked = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+        data = {"results": ranked[0] if len(keys) == 1 else _merge(ranked)}
+        if errors:
+            data["errors"] = errors
+        return ToolResult(
+            success=True,
+            tool_name=self.name,
+            input=input.model_dump(),
+            data=data,
+            metadata={"searched_at": datetime.now().isoformat()},
+        )
+
+    async def search(self, search_key: str, max_results: int = 5) -> list[dict]:
+        """Results for one key: from the cache, a search in flight, or a new search."""
+        key = (_normalize_query(search_key), max_results)
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, results = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return [dict(result) for result in results]
+            del self._cache[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.cache_hits += 1
+        else:
+            # Detached, so a caller being cancelled never cancels it for the others waiting
+            task = asyncio.ensure_future(self._fetch(key, search_key, max_results))
+            task.add_done_callback(_mark_retrieved)
+            self._in_flight[key] = task
+        return [dict(result) for result in await asyncio.shield(task)]
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    async def _fetch(self, key: tuple[str, int], search_key: str, max_results: int) -> list[dict]:
+        try:
+            results = await self._search_upstream(search_key, max_results)
+            self._remember(key, results)
+            return results
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _search_upstream(self, search_key: str, max_results: int) -> list[dict]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_parallel_searches)
+        async with self._slots:
+            self.searches += 1
+            # DDGS is synchronous: run it in a thread, one client per call
+            results = await asyncio.to_thread(_ddgs_text, search_key, max_results)
+        return list(results or [])
+
+    def _remember(self, key: tuple[str, int], results: list[dict]) -> None:
+        if self.cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+
+def _ddgs_text(search_key: str, max_results: int) -> list[dict]:
+    return DDGS().text(search_key, max_results=max_results)
+
+
+def _mark_retrieved(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()  # no warning when every caller was cancelled before it failed
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def _merge(ranked: list[list[dict]]) -> list[dict]:
+    """Interleave result lists rank by rank, keeping the first result for each URL."""
+    seen = set()
+    merged = []
+    for rank in zip_longest(*ranked):
+        for result in rank:
+            if result is None:
+                continue
+            url = result.get("href") or result.get("url")
+            key = _normalize_url(url) if url else None
+            if key is not None and key in seen:
+                continue
+            if key is not None:
+                seen.add(key)
+            merged.append(result)
+    return merged
@@ -0,0 +1,46 @@
+# tools/infrastructure/fetch_tool_result.py
+
+from pydantic import BaseModel
+from core.base_tool import BaseTool
+from core.schemas import ToolResult, ExecutionContext
+from memory.result_store import ToolResultStore, slice_data, preview
+
+
+class FetchToolResultInput(BaseModel):
+    handle: str
+    path: str | None = None  # e.g. "results.3" or "results.3.body"
+    offset: int = 0  # first list item / character to return
+    limit: int | None = 10  # list items or characters; None = all (still size-capped)
+
+
+class FetchToolResultTool(BaseTool):
+    name = "fetch_tool_result"
+    description = (
+        "Reads part of a large tool result that was stored out of the conversation. "
+        "Pass the handle from the result message, an optional dotted path, and offset/limit."
+    )
+    input_model = FetchToolResultInput
+
+    def __init__(self, store: ToolResultStore, max_chars: int | None = None):
+        self.store = store
+        self.max_chars = max_chars or store.inline_limit
+
+    async def execute(self, input: FetchToolResultInput, context: ExecutionContext) -> ToolResult:
+        try:
+            data = slice_data(self.store.get(input.handle), input.path, input.offset, input.limit)
+            text = str(data)
+            return ToolResult(
+                success=True,
+                tool_name=self.name,
+                input=input.model_dump(),
+                # Never returns more than max_chars, whatever the slice asked for
+                data=data if len(text) <= self.max_chars else preview(data, self.max_chars),
+                metadata={"chars": len(text), "truncated": len(text) > self.max_chars},
+            )
+        except (KeyError, IndexError, ValueError) as e:
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                error=f"Cannot read {input.handle} at '{input.path or ''}': {e}",
+            )
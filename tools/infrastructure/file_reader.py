@@ -0,0 +1,369 @@
+# tools/infrastructure/file_reader.py
+
+import codecs
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+import numpy as np
+from pydantic import BaseModel
+from core.base_tool import SyncTool
+from core.schemas import ToolResult, ExecutionContext
+from typing import Iterator, Literal
+
+CHECKPOINT_EVERY = 1024  # lines between entries of the sparse line index
+SCAN_CHUNK = 32 << 20  # bytes per vectorized newline scan
+SAMPLE_BYTES = 64 << 10  # read for encoding detection
+MAX_CACHED_INDEXES = 64
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),  # before UTF-16: its BOM starts the same way
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+class FileReaderInput(BaseModel):
+    path: str
+    mode: Literal["info", "lines", "bytes", "tail", "search"] = "lines"
+    start: int = 1  # first line (1-based) for "lines", byte offset for "bytes"
+    count: int = 100  # lines for "lines"/"tail", bytes for "bytes"
+    pattern: str | None = None  # regular expression for "search", matched per line
+    ignore_case: bool = False
+    max_matches: int = 50
+    encoding: str | None = None  # None = detected from a sample of the file
+
+
+class _LineIndex:
+    """Byte offset of every CHECKPOINT_EVERY-th line start, extended only as far as needed.
+
+    A 10 GB log with 100M lines needs ~100k offsets (under 1 MB), and reading near the
+    top never scans the rest of the file.
+    """
+
+    def __init__(self, mtime_ns: int, size: int):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checkpoints = [0]  # offset of line k * CHECKPOINT_EVERY (0-based)
+        self.scanned_to = 0
+        self.newlines = 0  # seen before scanned_to
+        self.complete = False
+        self.lock = threading.Lock()
+
+    def extend(self, mm: mmap.mmap, until_line: int | None = None) -> None:
+        """Scan until line `until_line` (0-based) is covered, or to the end of the file."""
+        while not self.complete and (until_line is None or self.newlines < until_line):
+            end = min(self.scanned_to + SCAN_CHUNK, self.size)
+            chunk = np.frombuffer(mm, dtype=np.uint8, count=end - self.scanned_to, offset=self.scanned_to)
+            positions = np.flatnonzero(chunk == 10)
+            del chunk  # release the buffer export, or the mmap can't be closed
+            # The line after newline j (0-based in this chunk) is line newlines + j + 1
+            first = -(self.newlines + 1) % CHECKPOINT_EVERY
+            self.checkpoints.extend((positions[first::CHECKPOINT_EVERY] + self.scanned_to + 1).tolist())
+            self.newlines += len(positions)
+            self.scanned_to = end
+            self.complete = end == self.size
+
+    def total_lines(self, mm: mmap.mmap) -> int:
+        self.extend(mm)
+        return self.newlines + (1 if self.size and mm[self.size - 1] != 10 else 0)
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int | None:
+        """Offset of 0-based `line`, or None past the end."""
+        self.extend(mm, until_line=line)
+        if line > self.newlines:
+            return None
+        position = self.checkpoints[line // CHECKPOINT_EVERY]
+        for _ in range(line % CHECKPOINT_EVERY):
+            position = mm.find(b"\n", position) + 1
+        return position if position < self.size else None
+
+
+class FileReaderTool(SyncTool):
+    """Reads slices of files of any size through mmap; nothing is loaded whole.
+
+    Modes: "info" (size, encoding, line count), "lines" (line range), "bytes" (byte range),
+    "tail" (last lines) and "search" (regex, grep-style, stops at max_matches). Line
+    ranges use a sparse line-offset index built lazily and cached per file until its
+    mtime or size changes.
+
+    Output is bounded: lines are cut at `max_line_chars` and a call returns at most
+    `max_output_chars`, with `next_start`/`next_offset` to continue from.
+    """
+
+    name = "file_reader"
+    description = (
+        "Reads part of a (possibly huge) text file: mode 'info', 'lines' (start line, count), "
+        "'bytes' (start offset, count), 'tail' (last count lines) or 'search' (regex pattern). "
+        "Output is size-limited; use next_start/next_offset to continue."
+    )
+    input_model = FileReaderInput
+    execution = "blocking_io"
+
+    def __init__(self, root: str | None = None, max_output_chars: int = 16_000, max_line_chars: int = 1_000):
+        self.root = os.path.realpath(root) if root else None  # None = any readable path
+        self.max_output_chars = max_output_chars
+        self.max_line_chars = max_line_chars
+        self._indexes: OrderedDict[str, _LineIndex] = OrderedDict()
+        self._indexes_lock = threading.Lock()
+
+    def run(self, input: FileReaderInput, context: ExecutionContext) -> ToolResult:
+        try:
+            path = self._resolve(input.path)
+            data = self.read(path, input)
+            return ToolResult(
+                success=True,
+                tool_name=self.name,
+                input=input.model_dump(),
+                data=data,
+            )
+        except (OSError, ValueError, re.error, LookupError) as e:
+            return ToolResult(
+                success=False,
+                tool_name=self.name,
+                input=input.model_dump(),
+                error=str(e),
+            )
+
+    def read(self, path: str, input: FileReaderInput) -> dict:
+        stat = os.stat(path)
+        with open(path, "rb") as file:
+            if stat.st_size == 0:
+                return {"path": path, "size": 0, "encoding": input.encoding or "utf-8", "content": "", "total_lines": 0}
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoding, binary = (input.encoding, False) if input.encoding else detect_encoding(mm[:SAMPLE_BYTES])
+                codecs.lookup(encoding)
+                data = {"path": path, "size": stat.st_size, "encoding": encoding}
+                if binary:
+                    data["binary"] = True
+                if not _ascii_compatible(encoding):
+                    # Newlines aren't single 0x0A bytes: stream decoded text instead of using the index
+                    data.update(self._read_text(path, input, encoding))
+                    return data
+                index = self._index(path, stat)
+                with index.lock:
+                    if input.mode == "info":
+                        data["total_lines"] = index.total_lines(mm)
+                    elif input.mode == "lines":
+                        data.update(self._lines(mm, index, input.start, input.count, encoding))
+                    elif input.mode == "bytes":
+                        data.update(self._bytes(mm, input.start, input.count, encoding))
+                    elif input.mode == "tail":
+                        data.update(self._tail(mm, index, input.count, encoding))
+                    elif input.mode == "search":
+                        data.update(self._search(mm, input, encoding))
+                return data
+
+    def iter_matches(
+        self, path: str, pattern: str, ignore_case: bool = False, encoding: str | None = None
+    ) -> Iterator[tuple[int, str]]:
+        """(line number, line) for every line matching `pattern`, lazily, without a size cap."""
+        path = self._resolve(path)
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoding = encoding or detect_encoding(mm[:SAMPLE_BYTES])[0]
+                if not _ascii_compatible(encoding):
+                    yield from _iter_text_matches(path, pattern, ignore_case, encoding)
+                    return
+                yield from self._iter_mmap_matches(mm, pattern, ignore_case, encoding)
+
+    # Modes
+
+    def _lines(self, mm: mmap.mmap, index: _LineIndex, start: int, count: int, encoding: str) -> dict:
+        position = index.line_start(mm, max(start, 1) - 1)
+        lines, line, used = [], max(start, 1), 0
+        while position is not None and position < index.size and len(lines) < count:
+            end = mm.find(b"\n", position)
+            end = index.size if end == -1 else end
+            text = self._decode_line(mm, position, end, encoding)
+            cost = self._cost(line, text)
+            if lines and used + cost > self.max_output_chars:
+                break  # the caller continues from next_start
+            lines.append((line, text))
+            used += cost
+            position, line = end + 1, line + 1
+        content, _ = self._render(lines)
+        more = position is not None and position < index.size
+        data = {"content": content, "next_start": line if more else None}
+        if index.complete:
+            data["total_lines"] = index.total_lines(mm)
+        return data
+
+    def _bytes(self, mm: mmap.mmap, start: int, count: int, encoding: str) -> dict:
+        start = max(0, min(start, len(mm)))
+        if encoding.replace("_", "-").lower().startswith("utf-8"):
+            while start < len(mm) and mm[start] & 0xC0 == 0x80:  # don't start mid-character
+                start += 1
+        end = min(start + count, len(mm), start + self.max_output_chars * 4)
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        text = decoder.decode(mm[start:end], final=end == len(mm))
+        end -= len(decoder.getstate()[0])  # an incomplete trailing character is left for the next call
+        if len(text) > self.max_output_chars:
+            text = text[:self.max_output_chars]
+            end = start + len(text.encode(encoding, errors="replace"))
+        return {"content": text, "start": start, "next_offset": end if end < len(mm) else None}
+
+    def _tail(self, mm: mmap.mmap, index: _LineIndex, count: int, encoding: str) -> dict:
+        # Line numbers only when the index already knows them; counting would read the whole file
+        total = index.total_lines(mm) if index.complete else None
+        end = len(mm) - 1 if mm[len(mm) - 1] == 10 else len(mm)
+        lines, used = [], 0
+        while len(lines) < count and end >= 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            number = total - len(lines) if total is not None else None
+            text = self._decode_line(mm, start, end, encoding)
+            cost = self._cost(number, text)
+            if lines and used + cost > self.max_output_chars:
+                break  # keep the end of the file when over budget
+            lines.append((number, text))
+            used += cost
+            if start == 0:
+                break
+            end = start - 1
+        content, shown = self._render(lines[::-1])
+        return {"content": content, "lines": shown}
+
+    def _search(self, mm: mmap.mmap, input: FileReaderInput, encoding: str) -> dict:
+        if not input.pattern:
+            raise ValueError("search needs a pattern")
+        matches = list(islice(self._iter_mmap_matches(mm, input.pattern, input.ignore_case, encoding), input.max_matches + 1))
+        limited = len(matches) > input.max_matches
+        content, shown = self._render(matches[:input.max_matches], separator=":")
+        return {
+            "content": content,
+            "matches": shown,
+            "more_matches": limited or shown < min(len(matches), input.max_matches),
+        }
+
+    def _read_text(self, path: str, input: FileReaderInput, encoding: str) -> dict:
+        """Line modes for encodings like UTF-16, by streaming decoded text."""
+        if input.mode == "search":
+            if not input.pattern:
+                raise ValueError("search needs a pattern")
+            matches = list(islice(_iter_text_matches(path, input.pattern, input.ignore_case, encoding), input.max_matches))
+            content, shown = self._render(matches, separator=":")
+            return {"content": content, "matches": shown}
+        with open(path, encoding=encoding, errors="replace", newline="") as file:
+            numbered = enumerate((self._clip(line.rstrip("\r\n")) for line in file), start=1)
+            if input.mode == "tail":
+                lines = list(deque(numbered, maxlen=input.count))
+            elif input.mode == "lines":
+                lines = list(islice(numbered, max(input.start, 1) - 1, max(input.start, 1) - 1 + input.count))
+            elif input.mode == "info":
+                return {"total_lines": sum(1 for _ in numbered)}
+            else:
+                raise ValueError(f"mode '{input.mode}' needs an ASCII-compatible encoding, not {encoding}")
+        content, _ = self._render(lines)
+        return {"content": content}
+
+    # Helpers
+
+    def _iter_mmap_matches(self, mm: mmap.mmap, pattern: str, ignore_case: bool, encoding: str) -> Iterator[tuple[int, str]]:
+        regex = re.compile(pattern.encode(encoding), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        position, line, counted_to = 0, 1, 0
+        while position <= len(mm):
+            match = regex.search(mm, position)
+            if match is None:
+                return
+            start = mm.rfind(b"\n", 0, match.start()) + 1
+            end = mm.find(b"\n", match.start())
+            end = len(mm) if end == -1 else end
+            line += _count_newlines(mm, counted_to, start)
+            counted_to = start
+            yield line, self._decode_line(mm, start, end, encoding)
+            position = end + 1  # one hit per line, like grep
+
+    def _decode_line(self, mm: mmap.mmap, start: int, end: int, encoding: str) -> str:
+        # Never copy more than a line's worth of output, even from a multi-GB single line
+        limit = self.max_line_chars * 4
+        raw = mm[start:min(end, start + limit)]
+        text = raw.decode(encoding, errors="replace").rstrip("\r")
+        return self._clip(text, cut=end - start > limit)
+
+    def _clip(self, text: str, cut: bool = False) -> str:
+        if len(text) > self.max_line_chars or cut:
+            return text[:self.max_line_chars] + " [line truncated]"
+        return text
+
+    def _render(self, lines: list[tuple[int | None, str]], separator: str = "\t") -> tuple[str, int]:
+        """Numbered lines within max_output_chars. Returns (text, lines shown)."""
+        parts, used = [], 0
+        for number, text in lines:
+            cost = self._cost(number, text, separator)
+            if parts and used + cost > self.max_output_chars:
+                break
+            parts.append(_numbered(number, text, separator)[:self.max_output_chars])
+            used += cost
+        return "\n".join(parts), len(parts)
+
+    def _cost(self, number: int | None, text: str, separator: str = "\t") -> int:
+        """Characters a line takes in _render's output, newline included."""
+        return len(_numbered(number, text, separator)) + 1
+
+    def _index(self, path: str, stat: os.stat_result) -> _LineIndex:
+        with self._indexes_lock:
+            index = self._indexes.get(path)
+            if index is None or index.mtime_ns != stat.st_mtime_ns or index.size != stat.st_size:
+                index = _LineIndex(stat.st_mtime_ns, stat.st_size)
+                self._indexes[path] = index
+            self._indexes.move_to_end(path)
+            while len(self._indexes) > MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+            return index
+
+    def _resolve(self, path: str) -> str:
+        resolved = os.path.realpath(path if self.root is None else os.path.join(self.root, path))
+        if self.root is not None and os.path.commonpath([resolved, self.root]) != self.root:
+            raise ValueError(f"{path} is outside {self.root}")
+        return resolved
+
+
+def detect_encoding(sample: bytes) -> tuple[str, bool]:
+    """(encoding, looks binary) from the first bytes of a file: BOM, then UTF-8, then cp1252."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, False
+    if b"\x00" in sample:
+        even, odd = sample[0::2].count(0), sample[1::2].count(0)
+        half = len(sample) / 2
+        if odd > 0.3 * half and even < 0.05 * half:
+            return "utf-16-le", False
+        if even > 0.3 * half and odd < 0.05 * half:
+            return "utf-16-be", False
+        return "latin-1", True
+    try:
+        sample.decode("utf-8")
+        return "utf-8", False
+    except UnicodeDecodeError as e:
+        if e.start >= len(sample) - 3 and len(sample) == SAMPLE_BYTES:  # sample cut mid-character
+            return "utf-8", False
+        return "cp1252", False
+
+
+def _numbered(number: int | None, text: str, separator: str) -> str:
+    return f"{number}{separator}{text}" if number is not None else text
+
+
+def _ascii_compatible(encoding: str) -> bool:
+    return "\n".encode(encoding) == b"\n" and "a".encode(encoding) == b"a"
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for chunk_start in range(start, end, SCAN_CHUNK):
+        count += mm[chunk_start:min(chunk_start + SCAN_CHUNK, end)].count(b"\n")
+    return count
+
+
+def _iter_text_matches(path: str, pattern: str, ignore_case: bool, encoding: str) -> Iterator[tuple[int, str]]:
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    with open(path, encoding=encoding, errors="replace", newline="") as file:
+        for number, line in enumerate(file, start=1):
+            line = line.rstrip("\r\n")
+            if regex.search(line):
+                yield number, line